@@ -3,10 +3,12 @@
 # Filename : formula_test.py
 
 
-from formula import *
-from simple_log import *
-from generic import *
+from snakerlib.formula import *
+from snakerlib.simple_log import *
+from snakerlib.generic import *
 import traceback
+import threading
+import concurrent.futures
 
 __MoudleName__ = 'formula_test'
 __MoudleDesc__ = ''
@@ -49,6 +51,184 @@ def test_formula_1():
     _logger.info(str(FormulaTool.match_result_to_sorted_list(_match_result_1)))
     _logger.info(str(FormulaTool.match_result_to_sorted_list(_match_result_2)))
 
+
+def test_formula_search():
+    _source_str = 'select * From test where t.name \tlike \'%fromxxx\' order by name order'
+    _split_common = ('\\^', '\r', '\n', ' ', '\t', '\\$')
+    _match_list = {
+        'select': (_split_common, _split_common),
+        'from': (_split_common, _split_common),
+        'order': (_split_common, _split_common),
+        'name': (tuple(), tuple()),
+        'na': (tuple(), tuple()),
+        'ß': (['\\*'], list())
+    }
+
+    # 区分大小写，'From'不匹配
+    _result = FormulaTool.search(source_str=_source_str + ' SS ß', match_list=_match_list, ignore_case=False,
+                                 result_type=EnumFormulaSearchResultType.List)
+    assert _result == [
+        ['select', 'select', 0, 6, '\\^', ' '], ['na', 'na', 27, 29, '', ''], ['name', 'name', 27, 31, '', ''],
+        ['order', 'order', 49, 54, ' ', ' '], ['na', 'na', 58, 60, '', ''], ['name', 'name', 58, 62, '', ''],
+        ['order', 'order', 63, 68, ' ', ' '], ['ß', 'ß', 72, 73, '\\*', '']
+    ]
+
+    # 忽略大小写，'ß'转大写为'SS'但不能匹配两个字符
+    _result = FormulaTool.search(source_str=_source_str + ' SS ß', match_list=_match_list, ignore_case=True)
+    assert list(_result.keys()) == ['select', 'from', 'na', 'name', 'order', 'ß']
+    assert _result['from'][9].source_str == 'From'
+    assert list(_result['order'].keys()) == [49, 63]
+
+    # 不允许多重匹配，保留最大匹配，匹配结尾
+    _result = FormulaTool.search(source_str=_source_str, match_list=_match_list, ignore_case=True,
+                                 multiple_match=False, sort_oder=EnumFormulaSearchSortOrder.MatchBig,
+                                 result_type=EnumFormulaSearchResultType.List)
+    assert _result == [
+        ['select', 'select', 0, 6, '\\^', ' '], ['from', 'From', 9, 13, ' ', ' '], ['name', 'name', 27, 31, '', ''],
+        ['order', 'order', 49, 54, ' ', ' '], ['name', 'name', 58, 62, '', ''], ['order', 'order', 63, 68, ' ', '\\$']
+    ]
+
+
+def test_formula_compile():
+    _source_str = 'select * From test where t.name \tlike \'%fromxxx\' order by name order'
+    _split_common = ('\\^', '\r', '\n', ' ', '\t', '\\$')
+    _match_list = {
+        'select': [list(_split_common), list(_split_common)],
+        'from': (_split_common, _split_common),
+        'order': (_split_common, _split_common),
+        'name': (tuple(), tuple())
+    }
+    _matcher = FormulaTool.compile(match_list=_match_list, ignore_case=True)
+
+    # 修改原匹配清单不影响编译后的对象，编译后的对象不允许修改
+    _match_list['select'][0].clear()
+    _match_list['by'] = (_split_common, _split_common)
+    assert list(_matcher.match_list.keys()) == ['select', 'from', 'order', 'name']
+    assert '\\^' in _matcher.match_list['select'][0]
+    try:
+        _matcher.ignore_case = False
+        assert False
+    except AttributeError:
+        pass
+
+    # 与FormulaTool.search结果一致，多线程共享使用
+    del _match_list['by']
+    _match_list['select'][0].extend(_split_common)
+    _expect = FormulaTool.search(source_str=_source_str, match_list=_match_list, ignore_case=True,
+                                 multiple_match=False, sort_oder=EnumFormulaSearchSortOrder.ListDesc,
+                                 result_type=EnumFormulaSearchResultType.List)
+    assert [_item[0] for _item in _expect] == ['select', 'from', 'name', 'order', 'name', 'order']
+    _results = list()
+    _threads = list()
+    for _i in range(4):
+        _thread = threading.Thread(target=lambda: _results.append(_matcher.search(
+            _source_str, multiple_match=False, sort_oder=EnumFormulaSearchSortOrder.ListDesc,
+            result_type=EnumFormulaSearchResultType.List)))
+        _thread.start()
+        _threads.append(_thread)
+    for _thread in _threads:
+        _thread.join()
+    assert _results == [_expect] * 4
+
+    # 实例保存编译后的匹配对象
+    _formula_obj = FormulaTool(keywords={'PY': [['{$PY=', list(), list()], ['$}', list(), list()],
+                                                StructFormulaKeywordPara()]})
+    assert isinstance(_formula_obj._match_list, FormulaMatcher)
+    assert list(_formula_obj._match_list.match_list.keys()) == ['{$PY=', '$}']
+    _formula_obj.clear_keywords()
+    assert len(_formula_obj._match_list.match_list) == 0
+
+
+def test_formula_regex():
+    _split_common = ('\\^', '\r', '\n', ' ', '\t', '\\$')
+    _source_list = [
+        '',
+        'select * From test where t.name \tlike \'%fromxxx\' order by name order',
+        'SELECT\nname,na FROM(t) ORDER BY na\tname ß SS order',
+        'orderorder order  Order\r\nfrom'
+    ]
+    # [匹配字符清单, 是否可以使用正则表达式]
+    _match_list_matrix = [
+        [{'select': (_split_common, _split_common), 'from': (_split_common, _split_common),
+          'order': (_split_common, _split_common), 'by': (_split_common, _split_common)}, True],
+        [{'name': (tuple(), tuple()), 'na': (tuple(), tuple()), 'ß': (tuple(), tuple())}, True],
+        [{'from': (['\\*', ' '], ['(', ' ']), 'order': (['\\^', 'r'], ['\\$']), 'na': ([','], ['\\*', 'm']),
+          'ORDER': (['r', ' '], ['\\*'])}, True],
+        [{'name': (['\\^', ' ', '\\*'], [',', '\\$']), '': ([' ', ','], tuple()), 'na': (['\\$'], tuple())}, True],
+        # 前置字符不是单个字符
+        [{'from': (['ss', ' '], [' ']), 'order': (_split_common, _split_common)}, False],
+        # 分组数量过多
+        [{'select': ([' '], [' ']), 'from': (['('], [' ']), 'order': (['\t'], [' ']), 'by': ([','], [' ']),
+          'name': (['\n'], [' '])}, False]
+    ]
+
+    def _to_list(match_result):
+        return [(_key, [(_pos, _item.start_pos, _item.end_pos, _item.source_str, _item.front_char, _item.end_char)
+                        for _pos, _item in match_result[_key].items()]) for _key in match_result.keys()]
+
+    for _match_list, _is_regex in _match_list_matrix:
+        for _ignore_case in (False, True):
+            _regex_matcher = FormulaTool.compile(match_list=_match_list, ignore_case=_ignore_case, use_regex=True)
+            _automaton_matcher = FormulaTool.compile(match_list=_match_list, ignore_case=_ignore_case,
+                                                     use_regex=False)
+            assert _regex_matcher.is_regex == _is_regex
+            assert not _automaton_matcher.is_regex
+            # 正则表达式检索需显式指定
+            assert not FormulaTool.compile(match_list=_match_list, ignore_case=_ignore_case).is_regex
+            for _source_str in _source_list:
+                assert _to_list(_regex_matcher.search(_source_str)) == _to_list(
+                    _automaton_matcher.search(_source_str))
+                for _sort_order in EnumFormulaSearchSortOrder:
+                    assert _regex_matcher.search(
+                        _source_str, multiple_match=False, sort_oder=_sort_order,
+                        result_type=EnumFormulaSearchResultType.List
+                    ) == _automaton_matcher.search(
+                        _source_str, multiple_match=False, sort_oder=_sort_order,
+                        result_type=EnumFormulaSearchResultType.List
+                    )
+
+
+def test_formula_parallel():
+    _split_common = ('\\^', '\r', '\n', ' ', '\t', '\\$')
+    _source_str = 'select * From test where t.name \tlike \'%fromxxx\' order by name order\r\n' \
+                  'SELECT\nname,na FROM(t) ORDER BY na\tname ß SS order orderorder Order from'
+    _match_list_matrix = [
+        {'select': (_split_common, _split_common), 'from': (_split_common, _split_common),
+         'order': (_split_common, _split_common), 'by': (_split_common, _split_common)},
+        {'from': (['\\*', ' '], ['(', ' ']), 'order': (['\\^', 'r'], ['\\$']), 'na': ([','], ['\\*', 'm']),
+         'ORDER': (['r', ' '], ['\\*']), 'ß': (tuple(), tuple())},
+        {'name': (['\\^', ' ', '\\*'], [',', '\\$']), '': ([' ', ','], tuple()), 'na': (['\\$'], tuple())},
+        {'from': (['ss', ' '], [' ']), 'order': (_split_common, _split_common), 'sel': (['\\^'], ['e'])}
+    ]
+
+    def _to_list(match_result):
+        return [(_key, [(_pos, _item.start_pos, _item.end_pos, _item.source_str, _item.front_char, _item.end_char)
+                        for _pos, _item in match_result[_key].items()]) for _key in match_result.keys()]
+
+    # 字符串段很小时边界处的匹配最多，检查合并后的结果与不拆分检索完全一致
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as _executor:
+        for _match_list in _match_list_matrix:
+            for _ignore_case in (False, True):
+                for _use_regex in (True, False):
+                    _matcher = FormulaTool.compile(match_list=_match_list, ignore_case=_ignore_case,
+                                                   use_regex=_use_regex)
+                    _expect = _to_list(_matcher.search(_source_str))
+                    _expect_list = _matcher.search(_source_str, multiple_match=False,
+                                                   result_type=EnumFormulaSearchResultType.List)
+                    for _chunk_size in (1, 2, 3, 7, 50):
+                        assert _to_list(_matcher.search(_source_str, chunk_size=_chunk_size,
+                                                        executor=_executor)) == _expect
+                        assert _matcher.search(
+                            _source_str, multiple_match=False, result_type=EnumFormulaSearchResultType.List,
+                            chunk_size=_chunk_size, executor=_executor
+                        ) == _expect_list
+
+    # 使用临时进程池检索
+    _match_list = _match_list_matrix[1]
+    assert _to_list(FormulaTool.search(_source_str, _match_list, ignore_case=True, chunk_size=20, pool_size=2)) == \
+        _to_list(FormulaTool.search(_source_str, _match_list, ignore_case=True))
+
+
 def test_formula_2():
     _source_str = 'select {$PY=xxxx{$begin=xx{$PY=eeeee$}x$} from {$end=abc {$abc="kkkaf{$PY=not formula$}dfdf,\\",""haha"$} PY=eeffff bad'
     _string_para = StructFormulaKeywordPara()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Filename : parallel_benchmark.py
+
+import os
+import json
+import time
+import platform
+import argparse
+import concurrent.futures
+from datetime import datetime
+from snakerlib.parallel import *
+
+__MoudleName__ = 'parallel_benchmark'
+__MoudleDesc__ = '并行任务派发开销的基准测试，输出JSON结果用于不同版本之间对比'
+__Version__ = ''
+__Author__ = 'snaker'
+__Time__ = '2018/3/1'
+
+
+# 支持的测试模式
+BENCHMARK_MODES = ('ParallelTaskPool.Threading', 'Parallel.Threading', 'Parallel.MultiProcessing')
+
+
+def benchmark_task(put_ns, task_seconds, is_spin=False):
+    """
+    @fun 基准测试的任务函数
+    @funName benchmark_task
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription time.monotonic_ns在同一台机器的进程间共用同一个时钟，因此多进程模式也可以计算排队时间
+
+    @funParam {int} put_ns 放入任务时的time.monotonic_ns
+    @funParam {float} task_seconds 任务执行时长，单位为秒，0代表空任务
+    @funParam {bool} is_spin 是否以CPU空转方式消耗执行时长，否则使用sleep
+
+    @funReturn {int} 从放入任务到开始执行的排队时间，单位为纳秒
+
+    """
+    _start_ns = time.monotonic_ns()
+    if task_seconds > 0:
+        if is_spin:
+            _end_ns = _start_ns + int(task_seconds * 1000000000)
+            while time.monotonic_ns() < _end_ns:
+                pass
+        else:
+            time.sleep(task_seconds)
+    return _start_ns - put_ns
+
+
+def percentile(sorted_list, percent):
+    """
+    @fun 按最近排名法计算百分位数
+    @funName percentile
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 功能描述
+
+    @funParam {list} sorted_list 已排序的数值清单
+    @funParam {float} percent 百分位，例如99
+
+    @funReturn {float} 百分位数，清单为空返回0
+
+    """
+    if len(sorted_list) == 0:
+        return 0
+    _index = max(0, min(len(sorted_list) - 1, int(len(sorted_list) * percent / 100.0 + 0.5) - 1))
+    return sorted_list[_index]
+
+
+def run_task_pool(pool_size, task_count, task_seconds, is_spin=False):
+    """
+    @fun 测试ParallelTaskPool多线程模式
+    @funName run_task_pool
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 先执行pool_size个任务预热（创建工作线程），再计时执行
+
+    @funReturn {(float, list)} 执行时长（秒），排队时间清单（纳秒）
+
+    """
+    _latencies = list()
+    _callback = lambda res, args, kwargs, name: _latencies.append(res)
+    _pool = ParallelTaskPool(parallel_type=EnumParallelType.Threading, pool_size=pool_size, task_sleep_time=0.5)
+    try:
+        for _i in range(pool_size):
+            _pool.put_task(target=benchmark_task, args=(time.monotonic_ns(), 0))
+        _pool.pause_task_pool(wait_finish=True)
+        _pool.resume_task_pool()
+
+        _start = time.perf_counter()
+        for _i in range(task_count):
+            _pool.put_task(target=benchmark_task, args=(time.monotonic_ns(), task_seconds, is_spin),
+                           callback=_callback)
+        _pool.stop_task_pool(wait_finish=True)
+        return time.perf_counter() - _start, _latencies
+    finally:
+        _pool.stop_task_pool(wait_finish=False)
+
+
+def run_simple_task(parallel_type, pool_size, task_count, task_seconds, is_spin=False):
+    """
+    @fun 测试Parallel简单任务共享池
+    @funName run_simple_task
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 先执行pool_size个任务预热（创建工作线程/进程），再计时执行
+
+    @funReturn {(float, list)} 执行时长（秒），排队时间清单（纳秒）
+
+    """
+    Parallel.init_simple_task_pool(parallel_type=parallel_type, pool_size=pool_size)
+    try:
+        concurrent.futures.wait([
+            Parallel.create_simple_task(target=benchmark_task, args=(time.monotonic_ns(), 0),
+                                        parallel_type=parallel_type, is_asyn=True)
+            for _i in range(pool_size)
+        ])
+
+        _start = time.perf_counter()
+        _futures = [
+            Parallel.create_simple_task(target=benchmark_task, args=(time.monotonic_ns(), task_seconds, is_spin),
+                                        parallel_type=parallel_type, is_asyn=True)
+            for _i in range(task_count)
+        ]
+        concurrent.futures.wait(_futures)
+        _elapsed = time.perf_counter() - _start
+        return _elapsed, [_future.result() for _future in _futures]
+    finally:
+        Parallel.shutdown_simple_task_pool()
+
+
+def run_benchmark(modes=BENCHMARK_MODES, pool_sizes=(1, 4, 16), task_seconds_list=(0, 0.001, 0.01),
+                  task_count=1000, is_spin=False):
+    """
+    @fun 执行基准测试
+    @funName run_benchmark
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 按模式、池大小、任务粒度组合执行，统计每秒任务数及排队时间（放入任务到开始执行）的p50/p99
+
+    @funParam {tuple} modes 测试模式，见BENCHMARK_MODES
+    @funParam {tuple} pool_sizes 池大小清单
+    @funParam {tuple} task_seconds_list 任务执行时长清单，单位为秒，0代表空任务
+    @funParam {int} task_count 每个组合执行的任务数
+    @funParam {bool} is_spin 任务是否以CPU空转方式消耗执行时长
+
+    @funReturn {dict} 测试结果，可直接输出为JSON
+
+    """
+    _results = list()
+    for _mode in modes:
+        for _pool_size in pool_sizes:
+            for _task_seconds in task_seconds_list:
+                if _mode == 'ParallelTaskPool.Threading':
+                    _elapsed, _latencies = run_task_pool(_pool_size, task_count, _task_seconds, is_spin)
+                elif _mode == 'Parallel.Threading':
+                    _elapsed, _latencies = run_simple_task(EnumParallelType.Threading, _pool_size, task_count,
+                                                           _task_seconds, is_spin)
+                elif _mode == 'Parallel.MultiProcessing':
+                    _elapsed, _latencies = run_simple_task(EnumParallelType.MultiProcessing, _pool_size, task_count,
+                                                           _task_seconds, is_spin)
+                else:
+                    raise ValueError('unsupport benchmark mode: %s' % _mode)
+                _latencies.sort()
+                _results.append({
+                    'mode': _mode,
+                    'pool_size': _pool_size,
+                    'task_seconds': _task_seconds,
+                    'task_count': len(_latencies),
+                    'elapsed_seconds': round(_elapsed, 6),
+                    'tasks_per_second': round(len(_latencies) / _elapsed, 1) if _elapsed > 0 else 0,
+                    'latency_p50_us': round(percentile(_latencies, 50) / 1000.0, 1),
+                    'latency_p99_us': round(percentile(_latencies, 99) / 1000.0, 1)
+                })
+    return {
+        'meta': {
+            'time': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'task_count': task_count,
+            'is_spin': is_spin
+        },
+        'results': _results
+    }
+
+
+if __name__ == "__main__":
+    """
+    # 当程序自己独立运行时执行的操作
+    例如：python parallel_benchmark.py --pool-sizes 1 4 16 --task-seconds 0 0.001 0.01 --output result.json
+    """
+    _parser = argparse.ArgumentParser(description=__MoudleDesc__)
+    _parser.add_argument('--modes', nargs='+', default=list(BENCHMARK_MODES), choices=BENCHMARK_MODES)
+    _parser.add_argument('--pool-sizes', nargs='+', type=int, default=[1, 4, 16])
+    _parser.add_argument('--task-seconds', nargs='+', type=float, default=[0, 0.001, 0.01])
+    _parser.add_argument('--task-count', type=int, default=1000)
+    _parser.add_argument('--spin', action='store_true', help='任务以CPU空转方式消耗执行时长（默认sleep）')
+    _parser.add_argument('--output', default='', help='结果输出文件，不指定则输出到标准输出')
+    _args = _parser.parse_args()
+
+    _report = run_benchmark(modes=_args.modes, pool_sizes=_args.pool_sizes, task_seconds_list=_args.task_seconds,
+                            task_count=_args.task_count, is_spin=_args.spin)
+    _json = json.dumps(_report, indent=2, sort_keys=True)
+    if _args.output == '':
+        print(_json)
+    else:
+        with open(_args.output, 'w', encoding='utf-8') as _file:
+            _file.write(_json)
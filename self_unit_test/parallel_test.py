@@ -2,9 +2,14 @@
 # -*- coding: UTF-8 -*-
 # Filename : parallel_test.py
 
+import os
+import signal
+import socket
+import threading
+import multiprocessing
 import asyncio
 import time
-from parallel import *
+from snakerlib.parallel import *
 import gevent
 from gevent import pool
 
@@ -52,6 +57,44 @@ def coroutine_task_asyn_2(para1='a', para2=2):
     return 'coroutine_task_asyn_2 callback res'
 
 
+@Parallel.simple_task_decorator(parallel_type=EnumParallelType.Threading, is_asyn=False)
+def threading_simple_task(para1=1, para2=2):
+    # IO密集型的函数，放入共享线程池执行
+    time.sleep(0.1)
+    return para1 + para2
+
+
+def barrier_simple_task(barrier, para1=1, para2=2):
+    # 所有任务都到达屏障后才返回，没有并行执行时等待超时抛出BrokenBarrierError
+    barrier.wait(timeout=5)
+    return para1 + para2
+
+
+@Parallel.simple_task_decorator(parallel_type=EnumParallelType.MultiProcessing, is_asyn=True)
+def process_simple_task(n=10):
+    # CPU密集型的函数，放入共享进程池执行
+    _sum = 0
+    for _i in range(n):
+        _sum += _i * _i
+    return _sum
+
+
+_Process_Callback_Res = list()
+
+
+@Parallel.simple_task_decorator(parallel_type=EnumParallelType.MultiProcessing, callback=_Process_Callback_Res.append)
+def process_callback_task(n=10):
+    return sum([_i * _i for _i in range(n)])
+
+
+def simple_task_pow(x, y):
+    return x ** y
+
+
+def simple_task_thread_name():
+    return threading.current_thread().name
+
+
 def test_coroutine_1():
     print('非马上执行，同步等待完成状态，开始：')
     print("装载 p1")
@@ -126,6 +169,537 @@ def test_coroutine_4():
         _i += 1
 
 
+def test_simple_task_threading():
+    print('简单任务-线程池模式，同步执行：')
+    assert threading_simple_task(para1=3, para2=4) == 7
+
+    print('简单任务-线程池模式，异步执行：')
+    _barrier = threading.Barrier(4)
+    _futures = [Parallel.create_simple_task(target=barrier_simple_task, args=(_barrier, _i, 1),
+                                            parallel_type=EnumParallelType.Threading, is_asyn=True)
+                for _i in range(4)]
+    assert [_future.result() for _future in _futures] == [1, 2, 3, 4]  # 并行执行才能同时通过屏障
+
+    print('简单任务-线程池模式，指定线程名：')
+    assert Parallel.create_simple_task(target=simple_task_thread_name, name='MySimpleTask',
+                                       parallel_type=EnumParallelType.Threading) == 'MySimpleTask'
+    assert Parallel.create_simple_task(target=simple_task_thread_name,
+                                       parallel_type=EnumParallelType.Threading) != 'MySimpleTask'
+    print('执行完成')
+
+
+def test_simple_task_multiprocessing():
+    print('简单任务-进程池模式，异步执行：')
+    _futures = [process_simple_task(n=_i) for _i in range(1, 5)]
+    assert [_future.result() for _future in _futures] == [0, 1, 5, 14]
+
+    print('简单任务-进程池模式，同步执行：')
+    assert Parallel.create_simple_task(target=simple_task_pow, args=(2, 10),
+                                       parallel_type=EnumParallelType.MultiProcessing) == 1024
+    assert Parallel.create_simple_task(target=simple_task_thread_name, name='MySimpleTask',
+                                       parallel_type=EnumParallelType.MultiProcessing) == 'MySimpleTask'
+
+    print('简单任务-进程池模式，回调函数在主进程执行：')
+    process_callback_task(n=3)
+    _i = 0
+    while len(_Process_Callback_Res) == 0 and _i < 20:
+        time.sleep(0.05)
+        _i += 1
+    assert _Process_Callback_Res == [5]
+    Parallel.shutdown_simple_task_pool(wait=True)
+    print('执行完成')
+
+
+def dag_step_fun(value, delay=0.1, run_times=None, upstream_results=None):
+    # DAG任务函数，返回自身值加上所有上游结果，run_times登记以value为key的(开始时间, 结束时间)
+    _start = time.time()
+    time.sleep(delay)
+    if run_times is not None:
+        run_times[value] = (_start, time.time())
+    if upstream_results is None:
+        return value
+    return value + sum(upstream_results.values())
+
+
+def dag_failed_fun(upstream_results=None):
+    raise RuntimeError('dag task failed')
+
+
+def test_task_dag():
+    print('DAG任务-正常执行：')
+    _pool = ParallelTaskPool(parallel_type=EnumParallelType.Threading, pool_size=4, task_sleep_time=0.01)
+    _dag = ParallelTaskDAG(task_pool=_pool)
+    _run_times = dict()
+    _dag.add_task('a', dag_step_fun, args=(1,), kwargs={'run_times': _run_times})
+    _dag.add_task('b', dag_step_fun, args=(2,), kwargs={'delay': 0.3, 'run_times': _run_times}, depends=['a'])
+    _dag.add_task('c', dag_step_fun, args=(3,), kwargs={'run_times': _run_times}, depends=['a'])
+    _dag.add_task('d', dag_step_fun, args=(4,), kwargs={'run_times': _run_times}, depends=['b', 'c'])
+    assert _dag.run() == {'a': 1, 'b': 3, 'c': 4, 'd': 11}
+    # b、c并行执行：两者的执行时间段有重叠，且都在a结束后、d开始前执行
+    assert _run_times[2][0] < _run_times[3][1] and _run_times[3][0] < _run_times[2][1]
+    assert _run_times[1][1] <= min(_run_times[2][0], _run_times[3][0])
+    assert max(_run_times[2][1], _run_times[3][1]) <= _run_times[4][0]
+    _path, _duration = _dag.get_critical_path()
+    assert _path == ['a', 'b', 'd']
+    assert _duration >= 0.5
+
+    print('DAG任务-失败传递及取消：')
+    _dag = ParallelTaskDAG(task_pool=_pool, stop_on_failure=True)
+    _dag.add_task('a', dag_step_fun, args=(1,))
+    _dag.add_task('x', dag_failed_fun, depends=['a'])
+    _dag.add_task('y', dag_step_fun, args=(1,), depends=['x'])
+    _dag.add_task('z', dag_step_fun, args=(1,), kwargs={'delay': 0.3}, depends=['a'])
+    _dag.add_task('w', dag_step_fun, args=(1,), depends=['z'])
+    assert _dag.run() == {'a': 1, 'z': 2}
+    assert not _dag.is_success
+    assert _dag.get_task_status('x') == EnumDAGTaskStatus.Failed
+    assert _dag.get_task_status('y') == EnumDAGTaskStatus.UpstreamFailed
+    assert _dag.get_task_status('w') == EnumDAGTaskStatus.Cancelled
+    assert _dag.errors['x'][0][0] == RuntimeError
+
+    print('DAG任务-循环依赖：')
+    _dag = ParallelTaskDAG(task_pool=_pool)
+    _dag.add_task('a', dag_step_fun, args=(1,), depends=['b'])
+    _dag.add_task('b', dag_step_fun, args=(1,), depends=['a'])
+    try:
+        _dag.run()
+        assert False
+    except ParaValueError:
+        pass
+    _pool.stop_task_pool(wait_finish=False)
+
+    print('DAG任务-有界任务池（队列已满时阻塞或由调用线程执行）：')
+    for _reject_policy in (EnumTaskRejectPolicy.Block, EnumTaskRejectPolicy.CallerRuns):
+        _pool = ParallelTaskPool(parallel_type=EnumParallelType.Threading, pool_size=1, max_task_queue_size=1,
+                                 task_sleep_time=0.01, reject_policy=_reject_policy)
+        _dag = ParallelTaskDAG(task_pool=_pool)
+        _dag.add_task('root', dag_step_fun, args=(1,), kwargs={'delay': 0.01})
+        for _i in range(5):
+            _dag.add_task('d%d' % _i, dag_step_fun, args=(_i,), kwargs={'delay': 0.01}, depends=['root'])
+        assert _dag.run(overtime=10) == dict([('root', 1)] + [('d%d' % _i, _i + 1) for _i in range(5)])
+        _pool.stop_task_pool(wait_finish=False)
+    print('执行完成')
+
+
+def remote_task_fun(x, delay=0.2):
+    # 在远程节点执行的任务函数，返回计算结果及执行进程
+    time.sleep(delay)
+    return x * x, os.getpid()
+
+
+def remote_failed_fun():
+    raise KeyError('remote task failed')
+
+
+def _get_free_port():
+    _sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    _sock.bind(('127.0.0.1', 0))
+    _port = _sock.getsockname()[1]
+    _sock.close()
+    return _port
+
+
+def test_remote_task_pool():
+    print('远程任务池-启动3个本地节点进程：')
+    _ports = [_get_free_port() for _i in range(3)]
+    _procs = [multiprocessing.Process(target=ParallelRemoteWorker.run_worker_server, args=('127.0.0.1', _port),
+                                      daemon=True) for _port in _ports]
+    for _proc in _procs:
+        _proc.start()
+    time.sleep(1)
+
+    _results = dict()
+    _errors = list()
+    # 有界队列，节点失联时生产者正阻塞在put_task中，重新放回的任务不能被队列长度阻塞
+    _pool = ParallelTaskPool(parallel_type=EnumParallelType.RemoteProcessing,
+                             remote_workers=[('127.0.0.1', _port) for _port in _ports], max_task_queue_size=2,
+                             task_sleep_time=0.01, heartbeat_interval=0.2, heartbeat_overtime=1)
+
+    def _producer():
+        for _i in range(12):
+            _pool.put_task(target=remote_task_fun, args=(_i,),
+                           callback=lambda res, args, kwargs, name: _results.__setitem__(args[0], res))
+        _pool.put_task(target=remote_failed_fun,
+                       exception_callback=lambda error, trace_str, args, kwargs, name: _errors.append(error[1]))
+
+    _producer_thread = threading.Thread(target=_producer, daemon=True)
+    try:
+        _producer_thread.start()
+
+        print('远程任务池-节点1失去心跳，节点2进程退出，任务应重新分发到节点3：')
+        time.sleep(0.3)
+        os.kill(_procs[0].pid, signal.SIGSTOP)
+        _procs[1].terminate()
+        _start = time.time()
+        while (len(_results) < 12 or len(_errors) < 1) and time.time() - _start < 15:
+            time.sleep(0.1)
+        _producer_thread.join(timeout=5)
+        assert not _producer_thread.is_alive()
+        assert sorted(_results.keys()) == list(range(12))
+        assert [_results[_i][0] for _i in range(12)] == [_i * _i for _i in range(12)]
+        assert len(_errors) == 1 and isinstance(_errors[0], KeyError)
+        assert 'remote task failed' in _errors[0].remote_trace_str
+    finally:
+        _pool.stop_task_pool(wait_finish=False)
+        os.kill(_procs[0].pid, signal.SIGCONT)
+        for _proc in _procs:
+            _proc.terminate()
+
+    print('远程任务池-有界队列下所有节点同时失联，恢复后任务应继续执行：')
+    _ports = [_get_free_port() for _i in range(2)]
+    _procs = [multiprocessing.Process(target=ParallelRemoteWorker.run_worker_server, args=('127.0.0.1', _port),
+                                      daemon=True) for _port in _ports]
+    for _proc in _procs:
+        _proc.start()
+    time.sleep(1)
+    _results = dict()
+    _pool = ParallelTaskPool(parallel_type=EnumParallelType.RemoteProcessing,
+                             remote_workers=[('127.0.0.1', _port) for _port in _ports], max_task_queue_size=1,
+                             task_sleep_time=0.01, heartbeat_interval=0.2, heartbeat_overtime=1)
+
+    def _bounded_producer():
+        for _i in range(6):
+            _pool.put_task(target=remote_task_fun, args=(_i, 0.5),
+                           callback=lambda res, args, kwargs, name: _results.__setitem__(args[0], res))
+
+    _producer_thread = threading.Thread(target=_bounded_producer, daemon=True)
+    try:
+        _producer_thread.start()
+        time.sleep(0.2)
+        for _proc in _procs:
+            os.kill(_proc.pid, signal.SIGSTOP)
+        time.sleep(2)
+        for _proc in _procs:
+            os.kill(_proc.pid, signal.SIGCONT)
+        _start = time.time()
+        while len(_results) < 6 and time.time() - _start < 15:
+            time.sleep(0.1)
+        assert sorted(_results.keys()) == list(range(6))
+    finally:
+        _pool.stop_task_pool(wait_finish=False)
+        for _proc in _procs:
+            os.kill(_proc.pid, signal.SIGCONT)
+            _proc.terminate()
+
+    print('远程任务池-DropOldest策略下节点失联，重新放回的任务不能占用队列位置：')
+    _ports = [_get_free_port() for _i in range(2)]
+    _procs = [multiprocessing.Process(target=ParallelRemoteWorker.run_worker_server, args=('127.0.0.1', _port),
+                                      daemon=True) for _port in _ports]
+    for _proc in _procs:
+        _proc.start()
+    time.sleep(1)
+    _results = dict()
+    _errors = dict()
+    _pool = ParallelTaskPool(parallel_type=EnumParallelType.RemoteProcessing,
+                             remote_workers=[('127.0.0.1', _port) for _port in _ports], max_task_queue_size=2,
+                             reject_policy=EnumTaskRejectPolicy.DropOldest,
+                             task_sleep_time=0.01, heartbeat_interval=0.2, heartbeat_overtime=1)
+    try:
+        for _i in range(2):
+            _pool.put_task(target=remote_task_fun, args=(_i, 0.5),
+                           callback=lambda res, args, kwargs, name: _results.__setitem__(args[0], res),
+                           exception_callback=lambda error, trace_str, args, kwargs, name:
+                           _errors.__setitem__(args[0], error[0]))
+        time.sleep(0.2)
+        _procs[0].terminate()
+        time.sleep(0.3)
+        for _i in range(2, 8):
+            _pool.put_task(target=remote_task_fun, args=(_i, 0.05),
+                           callback=lambda res, args, kwargs, name: _results.__setitem__(args[0], res),
+                           exception_callback=lambda error, trace_str, args, kwargs, name:
+                           _errors.__setitem__(args[0], error[0]))
+        _start = time.time()
+        while len(_results) + len(_errors) < 8 and time.time() - _start < 15:
+            time.sleep(0.1)
+        assert sorted(list(_results.keys()) + list(_errors.keys())) == list(range(8))
+        assert set(_errors.values()) <= {TaskRejectedError}
+        assert 6 in _results and 7 in _results
+    finally:
+        _pool.stop_task_pool(wait_finish=False)
+        for _proc in _procs:
+            _proc.terminate()
+    print('执行完成')
+
+
+def test_task_reject_policy():
+    def _fill_pool(reject_policy, reject_block_timeout=None):
+        # 任务池只有1个线程，队列最多2个任务，第1个任务阻塞住线程
+        _event = threading.Event()
+        _results = list()
+        _errors = list()
+        _callback = lambda res, args, kwargs, name: _results.append(name)
+        _exception_callback = lambda error, trace_str, args, kwargs, name: _errors.append((name, error[0]))
+        _pool = ParallelTaskPool(pool_size=1, max_task_queue_size=2, task_sleep_time=0.01,
+                                 reject_policy=reject_policy, reject_block_timeout=reject_block_timeout)
+        _pool.put_task(target=_event.wait, name='running', callback=_callback, exception_callback=_exception_callback)
+        time.sleep(0.2)
+        for _name in ('queue1', 'queue2'):
+            _pool.put_task(target=str, name=_name, callback=_callback, exception_callback=_exception_callback)
+        return _pool, _event, _results, _errors
+
+    print('拒绝策略-Raise')
+    _pool, _event, _results, _errors = _fill_pool(EnumTaskRejectPolicy.Raise)
+    try:
+        _pool.put_task(target=str, name='rejected')
+        assert False, 'TaskRejectedError not raised'
+    except TaskRejectedError:
+        pass
+    assert _pool.rejected_task_count == 1
+    _event.set()
+    _pool.stop_task_pool(wait_finish=False)
+
+    print('拒绝策略-Block超时')
+    _pool, _event, _results, _errors = _fill_pool(EnumTaskRejectPolicy.Block, reject_block_timeout=0.2)
+    _start = time.time()
+    try:
+        _pool.put_task(target=str, name='rejected')
+        assert False, 'TaskRejectedError not raised'
+    except TaskRejectedError:
+        assert time.time() - _start >= 0.2
+    assert _pool.rejected_task_count == 1
+    _event.set()
+    _pool.stop_task_pool(wait_finish=False)
+
+    print('拒绝策略-CallerRuns')
+    _pool, _event, _results, _errors = _fill_pool(EnumTaskRejectPolicy.CallerRuns)
+    _pool.put_task(target=str, name='caller', callback=lambda res, args, kwargs, name: _results.append(name))
+    assert _results == ['caller'] and _pool.rejected_task_count == 1
+    _event.set()
+    _pool.stop_task_pool(wait_finish=False)
+
+    print('拒绝策略-DropOldest')
+    _pool, _event, _results, _errors = _fill_pool(EnumTaskRejectPolicy.DropOldest)
+    _pool.put_task(target=str, name='queue3', callback=lambda res, args, kwargs, name: _results.append(name))
+    assert _errors == [('queue1', TaskRejectedError)] and _pool.rejected_task_count == 1
+    _event.set()
+    _start = time.time()
+    while len(_results) < 3 and time.time() - _start < 5:
+        time.sleep(0.05)
+    _pool.stop_task_pool(wait_finish=False)
+    assert _results == ['running', 'queue2', 'queue3']
+    print('执行完成')
+
+
+def drain_task_fun(x, sleep=0):
+    time.sleep(sleep)
+    return x * x
+
+
+def test_task_pool_drain():
+    _results = list()
+    _errors = list()
+    _callback = lambda res, args, kwargs, name: _results.append(res)
+    _exception_callback = lambda error, trace_str, args, kwargs, name: _errors.append(error[0])
+
+    print('停止任务池-等待所有任务完成')
+    _pool = ParallelTaskPool(pool_size=50, task_sleep_time=0.5)
+    for _i in range(200):
+        _pool.put_task(target=drain_task_fun, args=(_i,), kwargs={'sleep': 0.01}, callback=_callback)
+    assert _pool.stop_task_pool(wait_finish=True)
+    assert sorted(_results) == [_i * _i for _i in range(200)]
+    _start = time.time()
+    while len(_pool._generate_workers) > 0 and time.time() - _start < 2:
+        time.sleep(0.01)
+    assert len(_pool._generate_workers) == 0, '工作线程未被唤醒退出'
+    try:
+        _pool.put_task(target=str)
+        assert False, 'TaskPoolStopedError not raised'
+    except TaskPoolStopedError:
+        pass
+
+    print('空闲线程退出时放入任务-任务不能因没有线程处理而滞留在队列中')
+    _pool = ParallelTaskPool(pool_size=1, task_sleep_time=0.002, free_task_keep_time=0.002)
+    for _i in range(1000):
+        _event = threading.Event()
+        _pool.put_task(target=_event.set)
+        assert _event.wait(5), '第%d个任务没有线程处理' % _i
+        # 放入间隔在空闲线程释放时间附近变化，覆盖线程正在退出时放入任务的情况
+        time.sleep(0.002 + (_i % 5) * 0.0005)
+    assert _pool.stop_task_pool(wait_finish=True, overtime=5)
+
+    print('停止任务池-超时后取消剩余任务')
+    _event = threading.Event()
+    _pool = ParallelTaskPool(pool_size=2, task_sleep_time=0.5)
+    for _i in range(6):
+        _pool.put_task(target=_event.wait, callback=_callback, exception_callback=_exception_callback)
+    _start = time.time()
+    assert not _pool.stop_task_pool(wait_finish=True, overtime=0.2)
+    assert time.time() - _start < 1
+    assert _errors == [TaskPoolStopedError] * 4
+    _event.set()
+
+    print('暂停及恢复任务池')
+    _pause_results = list()
+    _pool = ParallelTaskPool(pool_size=2, task_sleep_time=0.5)
+    _pool.pause_task_pool(wait_finish=True)
+    for _i in range(4):
+        _pool.put_task(target=drain_task_fun, args=(_i,),
+                       callback=lambda res, args, kwargs, name: _pause_results.append(res))
+    time.sleep(0.3)
+    assert _pause_results == []
+    _pool.resume_task_pool()
+    assert _pool.stop_task_pool(wait_finish=True, overtime=5)
+    assert sorted(_pause_results) == [0, 1, 4, 9]
+
+    print('暂停状态下停止任务池-恢复处理并等待任务完成')
+    _pause_results = list()
+    _pool = ParallelTaskPool(pool_size=2, task_sleep_time=0.5)
+    _pool.pause_task_pool(wait_finish=True)
+    for _i in range(4):
+        _pool.put_task(target=drain_task_fun, args=(_i,),
+                       callback=lambda res, args, kwargs, name: _pause_results.append(res))
+    assert _pool.stop_task_pool(wait_finish=True)
+    assert sorted(_pause_results) == [0, 1, 4, 9]
+    print('执行完成')
+
+
+def test_task_record():
+    _pool = ParallelTaskPool(pool_size=1, task_sleep_time=0.5)
+    _pool.pause_task_pool(wait_finish=True)
+    _ids = [_pool.put_task(target=str, args=(_i,)) for _i in range(3)]
+    assert _ids == [1, 2, 3]
+    _task = _pool._task_status[_ids[0]]
+    assert isinstance(_task, StructParallelTask) and not hasattr(_task, '__dict__')
+    assert _task.start_time is None and _task.put_time <= time.monotonic_ns()
+    _pool.resume_task_pool()
+    assert _pool.stop_task_pool(wait_finish=True, overtime=5)
+    assert len(_pool._task_status) == 0
+
+
+def channel_task_fun(x):
+    if x == 3:
+        raise KeyError('channel task failed')
+    time.sleep(0.05 * (10 - x))
+    return x
+
+
+def test_result_channel():
+    print('结果通道-同步迭代，按完成顺序输出，异常作为结果输出')
+    _pool = ParallelTaskPool(pool_size=10, task_sleep_time=0.5)
+    _channel = ParallelResultChannel(maxsize=2)
+    for _i in range(10):
+        _pool.put_task(target=channel_task_fun, args=(_i,), result_channel=_channel)
+    _channel.close()
+    time.sleep(0.3)
+    assert len(_channel) == 2, '通道满后工作线程应阻塞等待'
+    _results = list(_channel)
+    assert len(_results) == 10
+    _errors = [_result for _result in _results if not _result.is_success]
+    assert len(_errors) == 1 and _errors[0].args == (3,) and _errors[0].error[0] == KeyError
+    _values = [_result.result for _result in _results if _result.is_success]
+    assert sorted(_values) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    try:
+        _pool.put_task(target=channel_task_fun, args=(0,), result_channel=_channel)
+        assert False, 'ResultChannelClosedError not raised'
+    except ResultChannelClosedError:
+        pass
+
+    print('结果通道-异步迭代')
+    _channel = ParallelResultChannel()
+    for _i in range(5):
+        _pool.put_task(target=channel_task_fun, args=(_i + 5,), result_channel=_channel)
+    _channel.close()
+
+    async def _consume():
+        return [_result.result async for _result in _channel]
+
+    assert asyncio.run(_consume()) == [9, 8, 7, 6, 5]
+    _pool.stop_task_pool(wait_finish=True, overtime=5)
+
+    print('结果通道-异步迭代被取消后不再占用线程获取结果')
+    _channel = ParallelResultChannel()
+    _channel.attach_task()
+
+    async def _consume_first():
+        async for _result in _channel:
+            return _result
+
+    async def _cancel_consume():
+        try:
+            await asyncio.wait_for(_consume_first(), timeout=0.1)
+            assert False, 'asyncio.TimeoutError not raised'
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(_cancel_consume())
+    time.sleep(ParallelResultChannel._async_wait_time * 2)
+    _channel.put_result(StructParallelResult(1, 'task', (), {}, True, result=1))
+    time.sleep(0.1)
+    assert len(_channel) == 1, '被取消的异步迭代不应再取走结果'
+
+    print('结果通道-通道已满且无人消费时，停止任务池不应阻塞')
+    _pool = ParallelTaskPool(pool_size=2, task_sleep_time=0.5)
+    _pool.pause_task_pool(wait_finish=True)
+    _channel = ParallelResultChannel(maxsize=1)
+    for _i in range(3):
+        _pool.put_task(target=channel_task_fun, args=(_i,), result_channel=_channel)
+    _stop_thread = threading.Thread(target=_pool.stop_task_pool, kwargs={'wait_finish': False}, daemon=True)
+    _stop_thread.start()
+    _stop_thread.join(timeout=5)
+    assert not _stop_thread.is_alive(), '停止任务池被结果通道阻塞'
+    _channel.close()
+    _results = list(_channel)
+    assert len(_results) == 3 and all([_result.error[0] == TaskPoolStopedError for _result in _results])
+    print('执行完成')
+
+
+def worker_initializer(prefix):
+    # 模拟加载模型等耗时的初始化处理，返回工作线程/进程的状态数据
+    return {'prefix': prefix, 'pid': os.getpid(), 'thread': threading.get_ident()}
+
+
+def worker_state_task(x):
+    _state = ParallelTaskPool.get_worker_state()
+    # CPU绑定仅Linux支持，其他平台返回None
+    _cpus = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+    return '%s%s' % (_state['prefix'], str(x)), _state['pid'], _state['thread'], _cpus
+
+
+def failed_initializer():
+    raise ConnectionError('init failed')
+
+
+def test_worker_initializer():
+    print('任务池-工作线程初始化及CPU绑定')
+    _results = list()
+    _pool = ParallelTaskPool(pool_size=3, task_sleep_time=0.5, initializer=worker_initializer, initargs=('task_',),
+                             cpu_affinity=[{0}])
+    for _i in range(6):
+        _pool.put_task(target=worker_state_task, args=(_i,),
+                       callback=lambda res, args, kwargs, name: _results.append(res))
+    assert _pool.stop_task_pool(wait_finish=True, overtime=5)
+    assert sorted([_res[0] for _res in _results]) == ['task_%d' % _i for _i in range(6)]
+    assert all(_res[3] in ({0}, None) for _res in _results)
+
+    print('任务池-工作线程初始化失败')
+    _errors = list()
+    _pool = ParallelTaskPool(pool_size=1, task_sleep_time=0.5, initializer=failed_initializer)
+    _pool.put_task(target=str, exception_callback=lambda error, trace_str, args, kwargs, name: _errors.append(error[0]))
+    _start = time.time()
+    while len(_errors) == 0 and time.time() - _start < 5:
+        time.sleep(0.05)
+    assert _errors == [TaskPoolStopedError] and _pool.worker_init_error[0][0] == ConnectionError
+
+    print('简单任务-进程池初始化')
+    Parallel.init_simple_task_pool(parallel_type=EnumParallelType.MultiProcessing, pool_size=2,
+                                   initializer=worker_initializer, initargs=('process_',), cpu_affinity=[{0}])
+    try:
+        _res = Parallel.create_simple_task(target=worker_state_task, args=(1,),
+                                           parallel_type=EnumParallelType.MultiProcessing)
+        assert _res[0] == 'process_1' and _res[1] != os.getpid() and _res[3] in ({0}, None)
+    finally:
+        Parallel.shutdown_simple_task_pool()
+    print('执行完成')
+
+
+def test_parallel_benchmark():
+    from parallel_benchmark import run_benchmark, BENCHMARK_MODES
+    _report = run_benchmark(pool_sizes=(2,), task_seconds_list=(0,), task_count=50)
+    assert [_res['mode'] for _res in _report['results']] == list(BENCHMARK_MODES)
+    for _res in _report['results']:
+        assert _res['task_count'] == 50 and _res['tasks_per_second'] > 0
+        assert 0 <= _res['latency_p50_us'] <= _res['latency_p99_us']
+
 
 if __name__ == "__main__":
     """
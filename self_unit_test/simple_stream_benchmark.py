@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Filename : simple_stream_benchmark.py
+
+import os
+import json
+import time
+import platform
+import argparse
+import functools
+from datetime import datetime
+from snakerlib.simple_stream import *
+
+__MoudleName__ = 'simple_stream_benchmark'
+__MoudleDesc__ = '流处理逐个对象开销的基准测试，输出JSON结果用于不同版本之间对比'
+__Version__ = ''
+__Author__ = 'snaker'
+__Time__ = '2018/2/6'
+
+
+def benchmark_dealer(deal_obj, position, str_obj='', para1=None, para2=None):
+    """
+    @fun 基准测试的流处理函数（空处理）
+    @funName benchmark_dealer
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 功能描述
+
+    """
+    pass
+
+
+@StringStream.stream_decorator(is_sync=True)
+def benchmark_decorator_dealer(deal_obj, position, str_obj='', para1=None, para2=None):
+    pass
+
+
+def exec_dispatch(item_count, kwargs_dealer_fun):
+    """
+    @fun 原exec方式的逐个对象调用
+    @funName exec_dispatch
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 与修改前_stream_deal_fun_decorator的调用方式一致，用于对比
+
+    @funReturn {float} 执行时长，单位为秒
+
+    """
+    dealer_fun = benchmark_dealer
+    _exec_fun_str = 'dealer_fun(_get_obj, _pos'
+    for _key in kwargs_dealer_fun.keys():
+        _exec_fun_str = '%s, %s=%s' % (_exec_fun_str, _key, 'kwargs_dealer_fun[\'' + _key + '\']')
+    _exec_fun_str = _exec_fun_str + ')'
+    _get_obj = 'x'
+    _start = time.perf_counter()
+    for _pos in range(item_count):
+        exec(_exec_fun_str)
+    return time.perf_counter() - _start
+
+
+def partial_dispatch(item_count, kwargs_dealer_fun):
+    """
+    @fun functools.partial预绑定参数的逐个对象调用
+    @funName partial_dispatch
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 与当前_stream_deal_fun_decorator的调用方式一致
+
+    @funReturn {float} 执行时长，单位为秒
+
+    """
+    _dealer = functools.partial(benchmark_dealer, **kwargs_dealer_fun)
+    _get_obj = 'x'
+    _start = time.perf_counter()
+    for _pos in range(item_count):
+        _dealer(_get_obj, _pos)
+    return time.perf_counter() - _start
+
+
+def decorator_stream(item_count, kwargs_dealer_fun):
+    """
+    @fun 修饰符方式完整流处理
+    @funName decorator_stream
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 包含取流对象、异常处理等框架开销
+
+    @funReturn {float} 执行时长，单位为秒
+
+    """
+    _start = time.perf_counter()
+    benchmark_decorator_dealer(None, 0, str_obj='x' * item_count, **kwargs_dealer_fun)
+    return time.perf_counter() - _start
+
+
+def stats_stream(item_count, kwargs_dealer_fun, stats_sample_rate=0):
+    """
+    @fun 开启处理统计的完整流处理
+    @funName stats_stream
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 与stats_sample_rate为0（不统计）的结果对比，得到处理统计的性能影响
+
+    @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计
+
+    @funReturn {float} 执行时长，单位为秒
+
+    """
+    _stream = StringStream(stats_sample_rate=stats_sample_rate)
+    _stream.clear_dealer()
+    _stream.add_dealer(functools.partial(benchmark_dealer, **kwargs_dealer_fun))
+    try:
+        _start = time.perf_counter()
+        _stream.start_stream(stream_tag='benchmark_stats', is_sync=True, str_obj='x' * item_count)
+        return time.perf_counter() - _start
+    finally:
+        _stream.clear_dealer()
+
+
+def run_benchmark(item_count=100000, repeat=3):
+    """
+    @fun 执行基准测试
+    @funName run_benchmark
+    @funGroup 所属分组
+    @funVersion 版本
+    @funDescription 每个测试项执行repeat次取最快的一次，统计每个流对象的平均耗时；
+        处理统计的测试项同时输出相对于不统计时的耗时增加百分比（overhead_percent）
+
+    @funParam {int} item_count 每次处理的流对象数量
+    @funParam {int} repeat 重复执行次数
+
+    @funReturn {dict} 测试结果，可直接输出为JSON
+
+    """
+    _kwargs = {'para1': 1, 'para2': 'abc'}
+    _results = list()
+    for _name, _fun in (('exec_dispatch', exec_dispatch), ('partial_dispatch', partial_dispatch),
+                        ('decorator_stream', decorator_stream)):
+        _elapsed = min([_fun(item_count, _kwargs) for _i in range(repeat)])
+        _results.append({
+            'name': _name,
+            'item_count': item_count,
+            'elapsed_seconds': round(_elapsed, 6),
+            'ns_per_item': round(_elapsed * 1000000000 / item_count, 1)
+        })
+    # 各采样间隔交替执行，减少机器负载波动对对比结果的影响
+    _rates = (0, 10000, 100, 10)
+    _stats_elapsed = dict([(_rate, list()) for _rate in _rates])
+    for _i in range(repeat):
+        for _rate in _rates:
+            _stats_elapsed[_rate].append(stats_stream(item_count, _kwargs, stats_sample_rate=_rate))
+    _base_elapsed = min(_stats_elapsed[0])
+    for _rate in _rates:
+        _elapsed = min(_stats_elapsed[_rate])
+        _results.append({
+            'name': 'stats_stream_%d' % _rate,
+            'item_count': item_count,
+            'elapsed_seconds': round(_elapsed, 6),
+            'ns_per_item': round(_elapsed * 1000000000 / item_count, 1),
+            'overhead_percent': round((_elapsed / _base_elapsed - 1) * 100, 2)
+        })
+    return {
+        'meta': {
+            'time': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat
+        },
+        'results': _results
+    }
+
+
+if __name__ == "__main__":
+    """
+    # 当程序自己独立运行时执行的操作
+    例如：python simple_stream_benchmark.py --item-count 100000 --output result.json
+    """
+    _parser = argparse.ArgumentParser(description=__MoudleDesc__)
+    _parser.add_argument('--item-count', type=int, default=100000)
+    _parser.add_argument('--repeat', type=int, default=3)
+    _parser.add_argument('--output', default='', help='结果输出文件，不指定则输出到标准输出')
+    _args = _parser.parse_args()
+
+    _report = run_benchmark(item_count=_args.item_count, repeat=_args.repeat)
+    _json = json.dumps(_report, indent=2, sort_keys=True)
+    if _args.output == '':
+        print(_json)
+    else:
+        with open(_args.output, 'w', encoding='utf-8') as _file:
+            _file.write(_json)
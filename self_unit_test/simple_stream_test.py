@@ -2,10 +2,18 @@
 # -*- coding: UTF-8 -*-
 # Filename : simple_stream_test.py
 
-
-from simple_stream import *
-from simple_log import *
-from generic import *
+import os
+import array
+import queue
+import asyncio
+import itertools
+import json
+import socket
+import tempfile
+import threading
+from snakerlib.simple_stream import *
+from snakerlib.simple_log import *
+from snakerlib.generic import *
 
 
 __MoudleName__ = 'simple_stream_test'
@@ -192,6 +200,661 @@ def test_string_stream_3():
     time.sleep(5)
 
 
+def test_string_stream_speed():
+    _logger.info('非修饰符方式-同步-无逐个休眠的处理速度')
+    _count = [0]
+
+    def _count_dealer(deal_obj, position):
+        _count[0] += 1
+
+    _stream = StringStream(stop_by_excepiton=False, logger=_logger)
+    _stream.clear_dealer()
+    _stream.add_dealer(_count_dealer)
+    _start = time.time()
+    _stream.start_stream(stream_tag='string_speed', is_sync=True, str_obj='x' * 100000)
+    _logger.info('100KB字符串处理耗时：%s' % str(time.time() - _start))
+    # 原来每个对象休眠0.01秒需要1000秒，限制时间足够宽松，不受测试机器负载影响
+    assert _count[0] == 100000 and time.time() - _start < 60
+
+    _logger.info('非修饰符方式-同步-限流')
+    _count[0] = 0
+    _stream = StringStream(stop_by_excepiton=False, logger=_logger, throttle_time=0.05)
+    _start = time.time()
+    _stream.start_stream(stream_tag='string_throttle', is_sync=True, str_obj='abcde')
+    assert _count[0] == 5 and time.time() - _start >= 0.25
+
+    _logger.info('非修饰符方式-异步-暂停及恢复')
+    _count[0] = 0
+    _closed_event = threading.Event()
+    _stream = StringStream(stop_by_excepiton=False, logger=_logger, throttle_time=0.01,
+                           stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                           _closed_event.set())
+    _stream.start_stream(stream_tag='string_pause', is_sync=False, is_pause=True, str_obj='x' * 20)
+    time.sleep(0.2)
+    assert _count[0] == 0
+    _stream.resume_stream('string_pause')
+    assert _closed_event.wait(10)
+    assert _count[0] == 20
+    _stream.clear_dealer()
+
+
+def test_stream_decorator_dispatch():
+    from simple_stream_benchmark import run_benchmark
+    _results = {_res['name']: _res for _res in run_benchmark(item_count=2000, repeat=1)['results']}
+    _logger.info('逐个对象调用耗时(ns)：exec %s, partial %s, decorator %s' % (
+        _results['exec_dispatch']['ns_per_item'], _results['partial_dispatch']['ns_per_item'],
+        _results['decorator_stream']['ns_per_item']))
+    assert _results['partial_dispatch']['ns_per_item'] * 10 < _results['exec_dispatch']['ns_per_item']
+    assert _results['decorator_stream']['ns_per_item'] < _results['exec_dispatch']['ns_per_item']
+
+
+@StringStream.stream_decorator(is_sync=True, batch_size=4)
+def string_stream_batch_dealer(deal_obj=None, position=0, str_obj='', blocks=None):
+    blocks.append((deal_obj, position))
+
+
+def test_string_stream_batch():
+    _logger.info('非修饰符方式-同步-按块处理')
+    _blocks = list()
+    _items = list()
+    _stream = StringStream(stop_by_excepiton=False, logger=_logger, batch_size=1000)
+    _stream.clear_dealer()
+    _stream.add_dealer(lambda deal_obj, position: _blocks.append((len(deal_obj), position)), is_batch=True)
+    _stream.add_dealer(lambda deal_obj, position: _items.append(position))
+    _start = time.time()
+    _stream.start_stream(stream_tag='string_batch', is_sync=True, str_obj='x' * 100500)
+    _logger.info('100KB字符串按块处理耗时：%s' % str(time.time() - _start))
+    assert _blocks == [(1000, _i * 1000) for _i in range(100)] + [(500, 100000)]
+    assert _items == list(range(100500))
+    _stream.clear_dealer()
+
+    _logger.info('修饰符方式-同步-按块处理')
+    _blocks = list()
+    string_stream_batch_dealer(None, 0, str_obj='abcdefghij', blocks=_blocks)
+    assert _blocks == [('abcd', 0), ('efgh', 4), ('ij', 8)]
+
+
+def test_file_stream():
+    _data = bytes(range(256)) * 400 + b'tail'
+    _fd, _file_path = tempfile.mkstemp()
+    _empty_fd, _empty_path = tempfile.mkstemp()
+    os.close(_empty_fd)
+    try:
+        with os.fdopen(_fd, 'wb') as _file:
+            _file.write(_data)
+
+        for _stream_class in (FileStream, MmapStream):
+            _logger.info('%s-同步-按块处理' % _stream_class.__name__)
+            _blocks = list()
+            _stream = _stream_class(logger=_logger, batch_size=4096)
+            _stream.clear_dealer()
+            _stream.add_dealer(lambda deal_obj, position: _blocks.append((deal_obj, position)), is_batch=True)
+            _stream.start_stream(stream_tag='file_batch', is_sync=True, file_path=_file_path)
+            assert b''.join([_block[0] for _block in _blocks]) == _data
+            assert [_block[1] for _block in _blocks] == list(range(0, len(_data), 4096))
+            _stream.clear_dealer()
+
+            _logger.info('%s-同步-逐个处理-指定开始位置' % _stream_class.__name__)
+            _items = list()
+            _stream = _stream_class(logger=_logger)
+            _stream.add_dealer(lambda deal_obj, position: _items.append((deal_obj, position)))
+            _stream.start_stream(stream_tag='file_item', is_sync=True, seek_position=len(_data) - 6,
+                                 file_path=_file_path)
+            assert _items == [(b'\xfe', 102398), (b'\xff', 102399), (b't', 102400), (b'a', 102401),
+                              (b'i', 102402), (b'l', 102403)]
+
+            _logger.info('%s-移动到结尾' % _stream_class.__name__)
+            _items = list()
+            _stream.start_stream(stream_tag='file_end', is_sync=True, seek_position=len(_data),
+                                 file_path=_file_path)
+            assert _items == []
+
+            _logger.info('%s-位置超出范围' % _stream_class.__name__)
+            try:
+                _stream.start_stream(stream_tag='file_eof', is_sync=True, seek_position=len(_data) + 1,
+                                     file_path=_file_path)
+                assert False
+            except EOFError:
+                pass
+            _stream.clear_dealer()
+
+            _logger.info('%s-空文件' % _stream_class.__name__)
+            _items = list()
+            _stream.add_dealer(lambda deal_obj, position: _items.append(position))
+            _stream.start_stream(stream_tag='file_empty', is_sync=True, file_path=_empty_path)
+            assert _items == list()
+            _stream.clear_dealer()
+    finally:
+        os.remove(_file_path)
+        os.remove(_empty_path)
+
+
+def test_live_stream():
+    _logger.info('QueueStream-异步-阻塞等待数据')
+    _queue = queue.Queue()
+    _items = list()
+    _got_event = threading.Event()
+    _closed_list = list()
+    _closed_event = threading.Event()
+    _stream = QueueStream(logger=_logger, stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status: (
+        _closed_list.append((position, closed_status)), _closed_event.set()))
+    _stream.clear_dealer()
+    _stream.add_dealer(lambda deal_obj, position: (_items.append((deal_obj, position)), _got_event.set()))
+    _stream.start_stream(stream_tag='queue_live', is_sync=False, queue_obj=_queue, wait_time=5)
+    # 阻塞在队列上，数据到达即处理
+    _queue.put('a')
+    assert _got_event.wait(10)
+    _queue.put('b')
+    _queue.put(QueueStream.END_TAG)
+    assert _closed_event.wait(10)
+    assert _items == [('a', 0), ('b', 1)]
+    assert _closed_list == [(2, EnumStreamClosedStatus.RunOver)]
+
+    _logger.info('QueueStream-异步-按块处理-stop_stream')
+    _blocks = list()
+    _got_event.clear()
+    _stream = QueueStream(logger=_logger, batch_size=10)
+    _stream.clear_dealer()
+    _stream.add_dealer(lambda deal_obj, position: (_blocks.append((deal_obj, position)),
+                                                   _got_event.set() if position == 10 else None), is_batch=True)
+    for _i in range(15):
+        _queue.put(_i)
+    _stream.start_stream(stream_tag='queue_batch', is_sync=False, queue_obj=_queue, wait_time=0.05)
+    assert _got_event.wait(10)
+    _stream.stop_stream(stream_tag='queue_batch', is_wait=True)
+    assert _blocks == [(list(range(10)), 0), (list(range(10, 15)), 10)]
+    _stream.clear_dealer()
+
+    _logger.info('SocketStream-异步-对端关闭连接结束')
+    _sock_1, _sock_2 = socket.socketpair()
+    _chunks = list()
+    _closed_event.clear()
+    _stream = SocketStream(logger=_logger, batch_size=1024,
+                           stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status: _closed_event.set())
+    _stream.add_dealer(lambda deal_obj, position: _chunks.append(deal_obj), is_batch=True)
+    _stream.start_stream(stream_tag='socket_live', is_sync=False, socket_obj=_sock_2, wait_time=5)
+    _sock_1.sendall(b'x' * 5000)
+    _sock_1.sendall(b'end')
+    _sock_1.close()
+    assert _closed_event.wait(10)
+    assert b''.join(_chunks) == b'x' * 5000 + b'end'
+    assert max([len(_chunk) for _chunk in _chunks]) <= 1024
+    _stream.clear_dealer()
+
+    _logger.info('SocketStream-同步-逐个处理')
+    _sock_1, _sock_2 = socket.socketpair()
+    _items = list()
+    _stream = SocketStream(logger=_logger, keep_wait_data=False)
+    _stream.add_dealer(lambda deal_obj, position: _items.append((deal_obj, position)))
+    _sock_1.sendall(b'abc')
+    _sock_1.close()
+    _stream.start_stream(stream_tag='socket_item', is_sync=True, socket_obj=_sock_2)
+    assert _items == [(b'a', 0), (b'b', 1), (b'c', 2)]
+    _stream.clear_dealer()
+
+
+def test_stream_fan_out():
+    _logger.info('并行分发-慢处理函数不阻塞其他处理函数')
+    _fast_list = list()
+    _fast_event = threading.Event()
+    _slow_list = list()
+    _slow_count_at_fast_end = list()
+    _closed_event = threading.Event()
+
+    def _fast_dealer(deal_obj, position):
+        _fast_list.append(position)
+        if position == 49:
+            # 快处理函数处理完所有对象时，慢处理函数还在等待
+            _slow_count_at_fast_end.append(len(_slow_list))
+            _fast_event.set()
+
+    _stream = StringStream(logger=_logger, fan_out_queue_size=100,
+                           stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                           _closed_event.set())
+    _stream.clear_dealer()
+    _stream.add_dealer(_fast_dealer)
+    # 慢处理函数等快处理函数处理完才开始处理
+    _stream.add_dealer(lambda deal_obj, position: (_fast_event.wait(10), _slow_list.append(position)))
+    _stream.start_stream(stream_tag='fan_out', is_sync=False, str_obj='x' * 50)
+    assert _fast_event.wait(10)
+    assert _slow_count_at_fast_end == [0]
+    assert _closed_event.wait(10)
+    assert _fast_list == list(range(50))
+    assert _slow_list == list(range(50))
+    _stream.clear_dealer()
+
+    _logger.info('并行分发-队列满时反压')
+    _read_list = list()
+    _slow_list = list()
+    _max_ahead = [0]
+    _stream = StringStream(logger=_logger, fan_out_queue_size=2, batch_size=1)
+    _stream._next_batch = lambda stream_obj, size: (_read_list.append(stream_obj.pos),
+                                                    StringStream._next_batch(stream_obj, size))[1]
+    _stream.add_dealer(lambda deal_obj, position: (time.sleep(0.005), _slow_list.append(position),
+                                                   _max_ahead.append(len(_read_list) - len(_slow_list))))
+    _stream.start_stream(stream_tag='fan_out_block', is_sync=True, str_obj='x' * 30)
+    assert _slow_list == list(range(30))
+    # 读取最多领先处理：队列中2个 + 处理中1个 + 已读取等待放入队列1个
+    assert max(_max_ahead) <= 4
+    _stream.clear_dealer()
+
+    _logger.info('并行分发-异常中止')
+    _closed_list = list()
+    _stream = StringStream(logger=_logger, stop_by_excepiton=True, fan_out_queue_size=2,
+                           stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                           _closed_list.append(closed_status))
+    _stream.add_dealer(lambda deal_obj, position: 1 / (position - 3))
+    _stream.start_stream(stream_tag='fan_out_exception', is_sync=True, str_obj='x' * 100)
+    assert _closed_list == [EnumStreamClosedStatus.ExceptionExit]
+    _stream.clear_dealer()
+
+
+def test_iter_stream():
+    _logger.info('生成器方式获取流对象')
+    _closed_list = list()
+    _stream = StringStream(stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                           _closed_list.append((stream_tag, position, closed_status)))
+    assert list(_stream.iter_stream(stream_tag='iter_all', str_obj='abc')) == [('a', 0), ('b', 1), ('c', 2)]
+    assert _closed_list == [('iter_all', 3, EnumStreamClosedStatus.RunOver)]
+
+    _logger.info('生成器方式-与迭代工具组合、移动位置、关闭')
+    _iter = _stream.iter_stream(stream_tag='iter_seek', str_obj='abcdefghij', seek_position=1)
+    assert list(itertools.islice(_iter, 2)) == [('b', 1), ('c', 2)]
+    _stream.seek(position=7, stream_tag='iter_seek')
+    assert next(_iter) == ('h', 7)
+    _iter.close()
+    assert _closed_list[-1] == ('iter_seek', 7, EnumStreamClosedStatus.CallStop)
+    assert 'iter_seek' not in _stream._stream_list.keys()
+
+    _logger.info('生成器方式-按块获取')
+    _stream = StringStream(batch_size=4)
+    assert [_block for _block in _stream.iter_stream(stream_tag='iter_batch', str_obj='abcdefghij')] == [
+        ('abcd', 0), ('efgh', 4), ('ij', 8)]
+
+    _logger.info('异步生成器方式获取流对象')
+    _queue = queue.Queue()
+    for _i in range(3):
+        _queue.put(_i)
+    _queue.put(QueueStream.END_TAG)
+
+    async def _async_iter():
+        _result = [_item async for _item in StringStream().aiter_stream(stream_tag='aiter_str', str_obj='xyz',
+                                                                         move_next_step=1)]
+        _result.extend([_item async for _item in QueueStream().aiter_stream(stream_tag='aiter_queue',
+                                                                             queue_obj=_queue)])
+        return _result
+
+    assert asyncio.run(_async_iter()) == [('y', 1), ('z', 2), (0, 0), (1, 1), (2, 2)]
+
+    _logger.info('生成器方式-获取过程中调用stop_stream（不等待流关闭）')
+    _closed_list = list()
+    _queue = queue.Queue()
+    for _i in range(5):
+        _queue.put(_i)
+    _stream = QueueStream(stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                          _closed_list.append((stream_tag, closed_status)))
+    _items = list()
+    for _obj, _pos in _stream.iter_stream(stream_tag='iter_stop', queue_obj=_queue):
+        _items.append(_obj)
+        if _obj == 1:
+            _stream.stop_stream(stream_tag='iter_stop')
+    assert _items == [0, 1]
+    assert _closed_list == [('iter_stop', EnumStreamClosedStatus.CallStop)]
+
+    async def _async_stop():
+        _result = list()
+        async for _obj, _pos in _stream.aiter_stream(stream_tag='aiter_stop', queue_obj=_queue):
+            _result.append(_obj)
+            _stream.stop_stream(stream_tag='aiter_stop')
+        return _result
+
+    assert asyncio.run(_async_stop()) == [2]
+    assert _closed_list[-1] == ('aiter_stop', EnumStreamClosedStatus.CallStop)
+
+
+def test_stream_pipeline():
+    _logger.info('流处理管道-map/filter/window/batch/take/tee')
+    _source_str = 'abcdefghij'
+    _result = StreamPipeline(StringStream()).map(str.upper).filter(lambda obj: obj not in 'AE').run(
+        stream_tag='pipeline', str_obj=_source_str)
+    assert list(_result) == ['B', 'C', 'D', 'F', 'G', 'H', 'I', 'J']
+    assert list(StreamPipeline(StringStream()).window(3, 2).run(stream_tag='pipeline', str_obj=_source_str)) == [
+        ('a', 'b', 'c'), ('c', 'd', 'e'), ('e', 'f', 'g'), ('g', 'h', 'i')]
+    assert list(StreamPipeline(StringStream()).batch(4).run(stream_tag='pipeline', str_obj=_source_str)) == [
+        ['a', 'b', 'c', 'd'], ['e', 'f', 'g', 'h'], ['i', 'j']]
+    assert list(StreamPipeline(StringStream()).take(5).batch(2).run(stream_tag='pipeline',
+                                                                     str_obj=_source_str)) == [
+        ['a', 'b'], ['c', 'd'], ['e']]
+    _tee_list = list()
+    _result = StreamPipeline(StringStream()).tee(_tee_list.append).filter(lambda obj: obj < 'c').run(
+        stream_tag='pipeline', str_obj=_source_str)
+    assert list(_result) == ['a', 'b']
+    assert _tee_list == list(_source_str)
+
+    _logger.info('流处理管道-take结束后不再读取流')
+    _closed_list = list()
+    _stream = StringStream(stream_closed_fun=lambda stream_tag, stream_obj, position, closed_status:
+                           _closed_list.append((position, closed_status)))
+    assert list(StreamPipeline(_stream).take(3).run(stream_tag='pipeline', str_obj='x' * 1000)) == ['x'] * 3
+    assert _closed_list == [(2, EnumStreamClosedStatus.CallStop)]
+
+    _logger.info('流处理管道-并行步骤')
+    _result = StreamPipeline(StringStream()).parallel_map(ord, pool_size=3).batch(4).run(
+        stream_tag='pipeline', str_obj=_source_str)
+    assert list(_result) == [[97, 98, 99, 100], [101, 102, 103, 104], [105, 106]]
+    _result = StreamPipeline(StringStream()).parallel_map(ord, pool_size=2, is_process=True).take(3).run(
+        stream_tag='pipeline', str_obj=_source_str)
+    assert list(_result) == [97, 98, 99]
+
+    _logger.info('流处理管道-执行中调用stop_stream')
+    _queue = queue.Queue()
+    for _i in range(5):
+        _queue.put(_i)
+    _stream = QueueStream()
+    _result = list()
+    for _obj in StreamPipeline(_stream).map(lambda obj: obj * 10).run(stream_tag='pipeline_stop', queue_obj=_queue):
+        _result.append(_obj)
+        _stream.stop_stream(stream_tag='pipeline_stop')
+    assert _result == [0]
+
+
+def test_stream_checkpoint():
+    _data = b'0123456789' * 3
+    _fd, _file_path = tempfile.mkstemp()
+    _checkpoint_file = _file_path + '.checkpoint'
+    try:
+        with os.fdopen(_fd, 'wb') as _file:
+            _file.write(_data)
+
+        _logger.info('检查点-异常中止后从异常位置继续')
+        _items = list()
+
+        def _fail_dealer(deal_obj, position):
+            if position == 5:
+                raise ValueError('fail at 5')
+            _items.append(position)
+
+        _stream = FileStream(logger=_logger, stop_by_excepiton=True, checkpoint_file=_checkpoint_file)
+        _stream.clear_dealer()
+        _stream.add_dealer(_fail_dealer)
+        _stream.start_stream(stream_tag='checkpoint', is_sync=True, resume=True, file_path=_file_path)
+        assert _items == list(range(5))
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {'checkpoint': 5}
+        _stream.clear_dealer()
+
+        _stream = FileStream(logger=_logger, checkpoint_file=_checkpoint_file)
+        _stream.add_dealer(lambda deal_obj, position: _items.append(position))
+        _stream.start_stream(stream_tag='checkpoint', is_sync=True, resume=True, file_path=_file_path)
+        assert _items == list(range(5)) + list(range(5, 30))
+        # 正常结束删除检查点
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {}
+        _stream.clear_dealer()
+
+        _logger.info('检查点-并行分发时异常中止后从异常位置继续')
+        _items = list()
+        _other_items = list()
+        _stream = FileStream(logger=_logger, stop_by_excepiton=True, checkpoint_file=_checkpoint_file,
+                             fan_out_queue_size=8)
+        _stream.clear_dealer()
+        _stream.add_dealer(_fail_dealer)
+        _stream.add_dealer(lambda deal_obj, position: _other_items.append(position))
+        _stream.start_stream(stream_tag='fan_out', is_sync=True, file_path=_file_path)
+        assert _items == list(range(5))
+        assert len(_other_items) >= 5 and _other_items == list(range(len(_other_items)))
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {'fan_out': 5}
+        _stream.clear_dealer()
+
+        _items = list()
+        _stream = FileStream(logger=_logger, checkpoint_file=_checkpoint_file, fan_out_queue_size=8)
+        _stream.add_dealer(lambda deal_obj, position: _items.append(position))
+        _stream.start_stream(stream_tag='fan_out', is_sync=True, resume=True, file_path=_file_path)
+        assert _items == list(range(5, 30))
+        _stream.clear_dealer()
+
+        _logger.info('检查点-定时保存及停止后继续')
+        _items = list()
+        _reached_event = threading.Event()
+        _gate_event = threading.Event()
+
+        def _gate_dealer(deal_obj, position):
+            time.sleep(0.005)
+            _items.append(position)
+            if position == 10:
+                _reached_event.set()
+                _gate_event.wait(10)
+
+        _stream = FileStream(logger=_logger, keep_wait_data=True, checkpoint_file=_checkpoint_file,
+                             checkpoint_interval=0.001)
+        _stream.add_dealer(_gate_dealer)
+        _stream.start_stream(stream_tag='checkpoint', is_sync=False, file_path=_file_path)
+        assert _reached_event.wait(10)
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert 0 < json.load(_file)['checkpoint'] <= len(_items) + 1
+        _stream.stop_stream(stream_tag='checkpoint', is_wait=False)
+        _gate_event.set()
+        try:
+            # 等待流关闭，流已关闭时抛出KeyError
+            _stream.stop_stream(stream_tag='checkpoint', is_wait=True)
+        except KeyError:
+            pass
+        _stop_count = len(_items)
+        assert _stop_count == 11
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {'checkpoint': _stop_count}
+        _stream.clear_dealer()
+
+        _stream = FileStream(logger=_logger, checkpoint_file=_checkpoint_file)
+        _stream.add_dealer(lambda deal_obj, position: _items.append(position))
+        _stream.start_stream(stream_tag='checkpoint', is_sync=True, resume=True, file_path=_file_path)
+        assert _items == list(range(30))
+        _stream.clear_dealer()
+
+        _logger.info('检查点-读完全部数据后停止，继续时等待新数据')
+        _items = list()
+        _item_events = dict([(_pos, threading.Event()) for _pos in (29, 31)])
+
+        def _tail_dealer(deal_obj, position):
+            _items.append(position)
+            if position in _item_events.keys():
+                _item_events[position].set()
+
+        _stream = FileStream(logger=_logger, keep_wait_data=True, checkpoint_file=_checkpoint_file)
+        _stream.add_dealer(_tail_dealer)
+        _stream.start_stream(stream_tag='tail', is_sync=False, file_path=_file_path)
+        assert _item_events[29].wait(10)
+        _stream.stop_stream(stream_tag='tail', is_wait=True)
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {'tail': 30}
+        _stream.start_stream(stream_tag='tail', is_sync=False, resume=True, file_path=_file_path)
+        with open(_file_path, 'ab') as _file:
+            _file.write(b'ab')
+        assert _item_events[31].wait(10)
+        _stream.stop_stream(stream_tag='tail', is_wait=True)
+        assert _items == list(range(32))
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert json.load(_file) == {'tail': 32}
+        _stream.clear_dealer()
+
+        _logger.info('检查点-多个流对象共用检查点文件')
+        os.remove(_checkpoint_file)
+        _streams = [FileStream(logger=_logger, keep_wait_data=True, checkpoint_file=_checkpoint_file,
+                               checkpoint_interval=0.001) for _i in range(4)]
+        for _i in range(4):
+            _streams[_i].start_stream(stream_tag='shared_%d' % _i, is_sync=False, file_path=_file_path)
+        for _i in range(4):
+            _streams[_i].stop_stream(stream_tag='shared_%d' % _i, is_wait=True)
+        with open(_checkpoint_file, 'r', encoding='utf-8') as _file:
+            assert sorted(json.load(_file).keys()) == ['shared_%d' % _i for _i in range(4)]
+        assert [_name for _name in os.listdir(os.path.dirname(_checkpoint_file))
+                if _name.startswith(os.path.basename(_checkpoint_file) + '.')] == []
+    finally:
+        os.remove(_file_path)
+        if os.path.exists(_checkpoint_file):
+            os.remove(_checkpoint_file)
+
+
+def test_bytes_stream():
+    _logger.info('BytesStream-逐个处理为字节值')
+    _items = list()
+    _stream = BytesStream(logger=_logger)
+    _stream.clear_dealer()
+    _stream.add_dealer(lambda deal_obj, position: _items.append((deal_obj, position)))
+    _stream.start_stream(stream_tag='bytes', is_sync=True, seek_position=1, bytes_obj=bytearray(b'\x01\x02\xff'))
+    assert _items == [(2, 1), (255, 2)]
+    _stream.clear_dealer()
+
+    _logger.info('BytesStream-按块处理为原数据的窗口')
+    _payload = b'0123456789'
+    _windows = list()
+    _stream = BytesStream(logger=_logger, batch_size=4)
+    _stream.add_dealer(lambda deal_obj, position: _windows.append((deal_obj, position)), is_batch=True)
+    _stream.start_stream(stream_tag='bytes', is_sync=True, bytes_obj=_payload)
+    assert [(bytes(_window), _pos) for _window, _pos in _windows] == [(b'0123', 0), (b'4567', 4), (b'89', 8)]
+    for _window, _pos in _windows:
+        # 窗口不复制数据，直接引用原数据
+        assert isinstance(_window, memoryview) and _window.obj is _payload
+    _stream.clear_dealer()
+
+    _logger.info('BytesStream-非单字节格式数据按字节处理')
+    _items = list()
+    _stream.add_dealer(lambda deal_obj, position: _items.append(deal_obj))
+    _stream.start_stream(stream_tag='bytes', is_sync=True, bytes_obj=memoryview(array.array('H', [1, 2])))
+    assert len(_items) == 4 and sum(_items) == 3
+    _stream.clear_dealer()
+
+
+def test_stream_scheduler():
+    _logger.info('调度器-多个流共用固定线程轮流处理')
+    _items = list()
+    _thread_count = threading.active_count()
+    _max_thread_count = [0]
+
+    def _dealer(deal_obj, position):
+        _items.append((deal_obj, position))
+        _max_thread_count[0] = max(_max_thread_count[0], threading.active_count())
+
+    _scheduler = StreamScheduler(pool_size=2, batch_count=10)
+    _stream = StringStream(logger=_logger)
+    _stream.clear_dealer()
+    _stream.add_dealer(_dealer)
+    for _i in range(200):
+        _stream.start_stream(stream_tag='scheduler_%d' % _i, is_sync=False, scheduler=_scheduler,
+                             str_obj=chr(0x4e00 + _i) * 50)
+    _scheduler.shutdown(is_wait=True)
+    assert len(_items) == 200 * 50
+    assert _max_thread_count[0] <= _thread_count + 2
+    for _i in range(200):
+        assert [_item[1] for _item in _items if _item[0] == chr(0x4e00 + _i)] == list(range(50))
+    # 轮询处理：最后一个流开始处理时第一个流尚未处理完成
+    _first_end = max([_index for _index, _item in enumerate(_items) if _item[0] == chr(0x4e00)])
+    _last_begin = min([_index for _index, _item in enumerate(_items) if _item[0] == chr(0x4e00 + 199)])
+    assert _last_begin < _first_end
+    _stream.clear_dealer()
+
+    _logger.info('调度器-暂停、恢复、移动位置、停止')
+    _fd, _file_path = tempfile.mkstemp()
+    try:
+        with os.fdopen(_fd, 'wb') as _file:
+            _file.write(b'0123456789')
+        _items = list()
+        _end_event = threading.Event()
+        _scheduler = StreamScheduler(pool_size=1, batch_count=3)
+        _stream = FileStream(logger=_logger, keep_wait_data=True)
+        _stream.add_dealer(lambda deal_obj, position: (_items.append(position),
+                                                       _end_event.set() if position == 9 else None))
+        _stream.start_stream(stream_tag='scheduler_pause', is_sync=False, is_pause=True, scheduler=_scheduler,
+                             file_path=_file_path)
+        time.sleep(0.05)
+        assert _items == []
+        _stream.seek(position=6, stream_tag='scheduler_pause')
+        _stream.resume_stream(stream_tag='scheduler_pause')
+        assert _end_event.wait(10)
+        assert _items == [6, 7, 8, 9]
+        # 没有数据时延迟等待，停止后立即结束
+        _stream.stop_stream(stream_tag='scheduler_pause', is_wait=True)
+        _scheduler.shutdown(is_wait=True)
+        assert _scheduler.stream_count == 0
+        _stream.clear_dealer()
+    finally:
+        os.remove(_file_path)
+
+
+def test_stream_stats():
+    _logger.info('处理统计-数量、采样执行时间、异常及结束通知')
+    _closed_stats = dict()
+
+    def _closed_fun(stream_tag='', stream_obj=None, position=None, closed_status=None, stats=None):
+        _closed_stats[stream_tag] = stats
+
+    def _ok_dealer(deal_obj, position):
+        pass
+
+    def _error_dealer(deal_obj, position):
+        if position % 10 == 0:
+            raise ValueError('error dealer')
+
+    _stream = StringStream(stream_closed_fun=_closed_fun, stats_sample_rate=5)
+    _stream.clear_dealer()
+    _stream.add_dealer(_ok_dealer, _error_dealer)
+    _stream.start_stream(stream_tag='stats_serial', is_sync=True, str_obj='x' * 100)
+    _stats = _closed_stats['stats_serial']
+    assert _stats['item_count'] == 100
+    assert _stats['sample_rate'] == 5
+    assert _stats['exception_count'] == 10
+    assert len(_stats['dealers']) == 2
+    for _dealer_stats in _stats['dealers']:
+        assert _dealer_stats['sample_count'] == 20
+        assert _dealer_stats['p99_us'] >= _dealer_stats['avg_us'] * 0.5
+        if _dealer_stats['dealer'] == _error_dealer:
+            assert _dealer_stats['exception_count'] == 10
+        else:
+            assert _dealer_stats['name'] == '_ok_dealer'
+            assert _dealer_stats['exception_count'] == 0
+    # 流结束后清除统计信息
+    try:
+        _stream.stats('stats_serial')
+        assert False
+    except KeyError:
+        pass
+
+    # 按块获取及并行分发
+    _stream = StringStream(stream_closed_fun=_closed_fun, stats_sample_rate=2, batch_size=8,
+                           fan_out_queue_size=4)
+    _stream.clear_dealer()
+    _stream.add_dealer(_ok_dealer, is_batch=True)
+    _stream.start_stream(stream_tag='stats_fan_out', is_sync=True, str_obj='x' * 100)
+    _stats = _closed_stats['stats_fan_out']
+    assert _stats['item_count'] == 100
+    assert _stats['dealers'][0]['sample_count'] == 6
+    assert _stats['exception_count'] == 0
+    _stream.clear_dealer()
+
+    # 流处理过程中获取统计信息，不统计时不传入stats参数
+    _queue = queue.Queue()
+    _stream = QueueStream(stream_closed_fun=_closed_fun, stats_sample_rate=1)
+    _stream.add_dealer(_ok_dealer)
+    _stream.start_stream(stream_tag='stats_running', is_sync=False, queue_obj=_queue)
+    for _i in range(10):
+        _queue.put(_i)
+    _deadline = time.monotonic() + 10
+    _stats = _stream.stats('stats_running')
+    while (_stats['item_count'] < 10 or len(_stats['dealers']) == 0 or
+           _stats['dealers'][0]['sample_count'] < 10) and time.monotonic() < _deadline:
+        time.sleep(0.01)
+        _stats = _stream.stats('stats_running')
+    assert _stats['item_count'] == 10
+    assert _stats['items_per_second'] > 0
+    assert _stats['dealers'][0]['sample_count'] == 10
+    _stream.stop_stream(stream_tag='stats_running', is_wait=True)
+    assert _closed_stats['stats_running']['item_count'] == 10
+    _stream = StringStream(stream_closed_fun=_closed_fun)
+    _stream.start_stream(stream_tag='stats_none', is_sync=True, str_obj='x' * 10)
+    assert _closed_stats['stats_none'] is None
+    _stream.clear_dealer()
+
 
 if __name__ == "__main__":
     """
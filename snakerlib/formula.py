@@ -3,11 +3,15 @@
 # Filename : formula.py
 
 
+import re
+import sys
 import copy
 import datetime
+import collections
+import types
 from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from .simple_stream import StringStream
 from .generic import NullObj, DebugTools, StringTools
 
 
@@ -85,6 +89,114 @@ class StructFormula(object):
     content_end_pos = 0  # 公式内容结束位置
 
 
+class FormulaMatcher(object):
+    """
+    @class 编译后的字符匹配对象
+    @className FormulaMatcher
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 由FormulaTool.compile生成，保存匹配字符清单的快照及预先生成的匹配自动机（含大小写转换、
+        前置/后置字符对照），可重复用于多次检索；对象生成后不允许修改，可在多线程间共享使用
+
+    @classExample {Python} 示例名:
+        _matcher = FormulaTool.compile(match_list={'from': ([' '], [' '])}, ignore_case=True)
+        _result = _matcher.search('select * FROM t')
+
+    """
+
+    #############################
+    # 属性
+    #############################
+    @property
+    def match_list(self):
+        """
+        @property {get} 匹配字符清单（只读）
+        @propertyName match_list
+        @propertyDescription key为匹配字符串，value为(前置字符tuple, 后置字符tuple)
+
+        """
+        return self._match_list
+
+    @property
+    def ignore_case(self):
+        """
+        @property {get} 是否忽略大小写
+        @propertyName ignore_case
+
+        """
+        return self._ignore_case
+
+    @property
+    def is_regex(self):
+        """
+        @property {get} 是否使用正则表达式检索
+        @propertyName is_regex
+
+        """
+        return self._automaton.regex is not None
+
+    #############################
+    # 公共函数
+    #############################
+    def __init__(self, match_list, ignore_case, automaton):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 应通过FormulaTool.compile生成，不建议直接创建
+
+        @funParam {dict} match_list 要检索的匹配字符清单字典
+        @funParam {bool} ignore_case 是否忽略大小写
+        @funParam {object} automaton 匹配自动机
+
+        """
+        _match_list = dict()
+        for _key in match_list.keys():
+            _match_list[_key] = (tuple(match_list[_key][0]), tuple(match_list[_key][1]))
+        object.__setattr__(self, '_match_list', types.MappingProxyType(_match_list))
+        object.__setattr__(self, '_ignore_case', ignore_case)
+        object.__setattr__(self, '_automaton', automaton)
+
+    def __setattr__(self, name, value):
+        """
+        @fun 禁止修改对象属性
+        @funName __setattr__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+        @funExcepiton:
+            AttributeError 修改属性时抛出该异常
+
+        """
+        raise AttributeError(u'编译后的匹配对象不允许修改')
+
+    def search(self, source_str, multiple_match=True, sort_oder=EnumFormulaSearchSortOrder.MatchAsc,
+               result_type=EnumFormulaSearchResultType.Dict, chunk_size=0, pool_size=0, executor=None):
+        """
+        @fun 从字符串中检索匹配字符清单
+        @funName search
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 参数及返回值参考FormulaTool.search
+
+        @funParam {string} source_str 需要检索的字符串
+        @funParam {bool} multiple_match 是否支持多重匹配（即同一段字符可以被多个匹配字符所匹配上）
+        @funParam {EnumFormulaSearchSortOrder} sort_oder 匹配结果获取顺序，在不支持多重匹配的情况下按该顺序保留结果
+        @funParam {EnumFormulaSearchResultType} result_type 匹配结果类型
+        @funParam {int} chunk_size 并行检索时每个字符串段的字符数，0代表不拆分；字符串长度超过该值时拆分为
+            多个字符串段在进程池中检索，结果与不拆分检索完全一致
+        @funParam {int} pool_size 并行检索的进程池大小，0代表使用CPU核数
+        @funParam {concurrent.futures.Executor} executor 并行检索的执行器，None代表每次检索创建临时的进程池
+
+        @funReturn {dict/list} 匹配结果，返回格式与result_type参数有关
+
+        """
+        return FormulaTool.search(source_str=source_str, match_list=self, multiple_match=multiple_match,
+                                  sort_oder=sort_oder, result_type=result_type, chunk_size=chunk_size,
+                                  pool_size=pool_size, executor=executor)
+
+
 class FormulaTool(object):
     """
     @class 公式解析处理工具
@@ -98,254 +210,557 @@ class FormulaTool(object):
 
     """
 
+    #############################
+    # 内部变量
+    #############################
+
+    # 转大写后变为多个字符的特殊字符（例如'ß'）的转换参数，首次使用时生成：
+    # (str.translate的转换字典, 大写字符串与代表字符的对照字典)
+    _multi_upper_para = None
+
+    # 使用正则表达式检索时，正则表达式中按前置/后置字符分组的最大组数，超过该数量时正则表达式的效率低于自动机
+    _regex_max_group = 4
+
     #############################
     # 内部函数
     #############################
 
-    # TODO(lhj): 可将字符串拆分为多个字符串段进行比较，然后合并比较结果，以支持多线程方式处理，利用CPU性能提高匹配速度
     @staticmethod
-    def __search_all(source_str, match_list, ignore_case=False):
+    def __get_multi_upper_para():
         """
-        @fun 内部函数，从字符串中检索匹配字符清单，并返回所有结果
-        @funName __search_all
+        @fun 获取转大写后变为多个字符的特殊字符的转换参数
+        @funName __get_multi_upper_para
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 从字符串中检索匹配字符清单，并返回所有结果，算法：
-            1、总体算法思路是建立待匹配堆栈，只是登记匹配字符和已匹配到的位置；堆栈保持不动，将检索字符串逐个字符流转入
-                堆栈中比对，匹配上则更新堆栈位置信息和增加部分匹配清单；完全匹配情况插入结果信息；
-            2、待匹配堆栈内容如下：
-                （1）固定匹配清单，在堆栈中固定保留，每次匹配都只匹配第一个字符
-                （2）部分匹配清单，当固定匹配清单匹配上的时候新增待匹配清单，后续匹配中发现不匹配的时候移出清单；
-                    每次匹配字符如果通过登记匹配字符位置，不通过移出清单，完全通过登记结果并移出清单。
+        @funDescription 将转大写后结果相同的特殊字符对应到同一个私有区代表字符（按大写字符串排序分配，多进程间保持一致），
+            使忽略大小写时字符串转换后长度不变，位置一一对应
 
-        @funParam {string} source_str 需要检索的字符串
-        @funParam {dict} match_list 要检索的匹配字符清单字典，格式为：
-            key - string, 要匹配的字符串
-            value - (string[], string[]) 前置字符列表，后置字符列表（可以一次设置多个前置字符匹配）:
-                注意：前置字符和后置字符都只支持1个字符，当有两个字符时必须满足一下转义的定义：
-                    \^ : 匹配字符串开头
-                    \$ : 匹配字符串结尾
-                    \* : 匹配任意字符（也可以是前面无字符）
+        @funReturn {tuple} (str.translate的转换字典, 大写字符串与代表字符的对照字典)
+
+        """
+        if FormulaTool._multi_upper_para is None:
+            _upper_dict = dict()
+            for _block in range(0, sys.maxunicode + 1, 256):
+                _block_str = ''.join(map(chr, range(_block, min(_block + 256, sys.maxunicode + 1))))
+                if len(_block_str.upper()) == len(_block_str):
+                    # 整块都没有特殊字符，跳过
+                    continue
+                for _char in _block_str:
+                    _upper = _char.upper()
+                    if len(_upper) > 1:
+                        _upper_dict.setdefault(_upper, list()).append(ord(_char))
+            _symbol_dict = dict()
+            _table = dict()
+            for _index, _upper in enumerate(sorted(_upper_dict.keys())):
+                _symbol_dict[_upper] = chr(0xF0000 + _index)
+                for _code in _upper_dict[_upper]:
+                    _table[_code] = _symbol_dict[_upper]
+            FormulaTool._multi_upper_para = (_table, _symbol_dict)
+        return FormulaTool._multi_upper_para
+
+    @staticmethod
+    def __fold_str(source_str, ignore_case=False):
+        """
+        @fun 获取用于比较的字符串
+        @funName __fold_str
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 忽略大小写时转换为大写，两个字符比较相等等同于原比较方式的 a.upper() == b.upper()
+
+        @funParam {string} source_str 要转换的字符串
         @funParam {bool} ignore_case 是否忽略大小写
 
-        @funReturn {dict} 匹配结果字典，格式为:
-            key - string, 匹配上的字符串（match_list的key）
-            value - dict, 匹配到的结果字典，key为start_pos,value为一个object:
-                object.source_str : string 匹配到的原文字符串
-                object.start_pos : int 匹配结果开始位置（不含前置字符）
-                object.end_pos : int 匹配结果结束位置（不含后置字符）
-                object.front_char : string 匹配到的前置字符
-                object.end_char : string 匹配到的后置字符
+        @funReturn {string} 转换后的字符串，长度与原字符串一致
 
         """
-        _match_result = dict()  # 最终的匹配结果
-        # 初始化匹配堆栈，匹配\^的情况
-        _compare_stack = dict()
-        for _key in match_list.keys():
-            if '\\^' in match_list[_key][0]:
-                # 有匹配开头，添加进去
-                FormulaTool.__add_compare_stack(compare_stack=_compare_stack, match_str=_key,
-                                                start_pos=0, front_char='\\^', match_pos=0)
-
-        # 执行流处理
-        # DebugTools.debug_print(_compare_stack=_compare_stack)
-        FormulaTool.__match_stream_dealer(deal_obj=None, position=0, str_obj=source_str, match_list=match_list,
-                                          compare_stack=_compare_stack, match_result=_match_result,
-                                          ignore_case=ignore_case)
-
-        # 完成流处理，根据待匹配堆栈，匹配转义的结束字符\$
-        _end_pos = len(source_str)
-        for _match_str in _compare_stack.keys():
-            for _key in _compare_stack[_match_str].keys():
-                _match_info = _compare_stack[_match_str][_key]
-                if _match_info.match_pos == len(_match_str):
-                    # 前面都匹配上，只需要判断后置字符
-                    _end_char = ''
-                    _match_flag = False
-                    if len(match_list[_match_str][1]) == 0:
-                        _match_flag = True
-                    elif '\\$' in match_list[_match_str][1]:
-                        _match_flag = True
-                        _end_char = '\\$'
-                    elif '\\*' in match_list[_match_str][1]:
-                        _match_flag = True
-                        _end_char = '\\*'
-                    # 处理匹配上的
-                    if _match_flag:
-                        _match_info.end_char = _end_char
-                        _match_info.end_pos = _end_pos
-                        FormulaTool.__add_match_result(match_result=_match_result, source_str=source_str,
-                                                       match_str=_match_str, match_info=_match_info)
+        if not ignore_case:
+            return source_str
+        _upper_str = source_str.upper()
+        if len(_upper_str) != len(source_str):
+            # 存在转大写后变为多个字符的特殊字符，先转换为代表字符
+            _upper_str = source_str.translate(FormulaTool.__get_multi_upper_para()[0]).upper()
+        return _upper_str
 
-        return _match_result
+    @staticmethod
+    def __fold_char(match_char, ignore_case=False):
+        """
+        @fun 获取前置/后置字符用于比较的字符
+        @funName __fold_char
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 与__fold_str转换后的单个字符进行比较
+
+        @funParam {string} match_char 前置/后置字符
+        @funParam {bool} ignore_case 是否忽略大小写
+
+        @funReturn {string} 用于比较的字符，如果不可能与任何单个字符匹配（例如转义字符）返回None
+
+        """
+        if not ignore_case:
+            return match_char if len(match_char) == 1 else None
+        _upper = match_char.upper()
+        if len(_upper) == 1:
+            return _upper
+        if _upper == _upper.lower():
+            # 不含字母（例如转义字符），不可能是特殊字符转大写的结果
+            return None
+        return FormulaTool.__get_multi_upper_para()[1].get(_upper, None)
 
     @staticmethod
-    def __add_compare_stack(compare_stack, match_str, start_pos, front_char, match_pos):
+    def __build_automaton(match_list, ignore_case=False, use_regex=False):
         """
-        @fun 将新匹配到第1个字符的对象放入待匹配堆栈
-        @funName __add_compare_stack
+        @fun 根据匹配字符清单生成Aho–Corasick多模式匹配自动机
+        @funName __build_automaton
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 匹配字符串（忽略大小写时转换为大写）生成字典树及失败跳转，前置/后置字符转换为检索后的过滤条件
+
+        @funParam {dict} match_list 要检索的匹配字符清单字典，格式参考search
+        @funParam {bool} ignore_case 是否忽略大小写
+        @funParam {bool} use_regex 匹配参数允许时是否生成检索用的正则表达式，参考__build_regex
+
+        @funReturn {object} 自动机对象，属性如下：
+            ignore_case : bool 是否忽略大小写
+            goto : tuple 每个节点的跳转字典，key为字符，value为下一节点序号
+            fail : tuple 每个节点的失败跳转节点序号
+            output : tuple 每个节点匹配完成的匹配字符串序号，tuple
+            patterns : tuple 按match_list顺序的匹配字符串参数，每项为tuple:
+                (match_str, 长度, 转换后的匹配字符串, 任意前置字符时的前置字符（None代表需判断前置字符）,
+                前置字符对照字典, 是否匹配开头, 任意后置字符时的后置字符（None代表需判断后置字符）,
+                后置字符对照字典, 到字符串结尾时的后置字符（None代表不匹配结尾）)
+            empty_patterns : tuple 空匹配字符串的序号
+            max_len : int 最长匹配字符串的长度
+            regex : re.Pattern 检索匹配位置的正则表达式，None代表使用自动机检索
+            first_char_patterns : dict 正则表达式检索时使用，key为转换后的第一个字符，value为匹配字符串序号tuple
 
         """
-        if match_str not in compare_stack.keys():
-            # 构建新的堆栈key
-            compare_stack[match_str] = dict()
-        # 添加匹配上的信息，以front_char+pos为key
-        _match_info = NullObj()
-        _match_info.front_char = front_char
-        _match_info.start_pos = start_pos
-        _match_info.match_pos = match_pos
-        _match_info.end_char = ''
-        _match_info.end_pos = -1
-        compare_stack[match_str][front_char+str(start_pos)] = _match_info
+        _automaton = NullObj()
+        _automaton.ignore_case = ignore_case
+        _automaton.goto = [dict()]
+        _automaton.fail = [0]
+        _output = [list()]
+        _automaton.patterns = list()
+        _automaton.empty_patterns = list()
+        for _index, _match_str in enumerate(match_list.keys()):
+            _front_chars = match_list[_match_str][0]
+            _end_chars = match_list[_match_str][1]
+
+            # 前置字符，对照字典只保留第一个匹配上的字符
+            _front_any = None
+            if len(_front_chars) == 0:
+                _front_any = ''
+            elif '\\*' in _front_chars:
+                _front_any = '\\*'
+            _front_dict = dict()
+            for _char in _front_chars:
+                _fold_char = FormulaTool.__fold_char(_char, ignore_case=ignore_case)
+                if _fold_char is not None and _fold_char not in _front_dict.keys():
+                    _front_dict[_fold_char] = _char
+
+            # 后置字符
+            _end_any = None
+            _end_eof = None
+            if len(_end_chars) == 0:
+                _end_any = ''
+                _end_eof = ''
+            else:
+                if '\\*' in _end_chars:
+                    _end_any = '\\*'
+                    _end_eof = '\\*'
+                if '\\$' in _end_chars:
+                    _end_eof = '\\$'
+            _end_dict = dict()
+            for _char in _end_chars:
+                _fold_char = FormulaTool.__fold_char(_char, ignore_case=ignore_case)
+                if _fold_char is not None and _fold_char not in _end_dict.keys():
+                    _end_dict[_fold_char] = _char
+
+            _fold_match_str = FormulaTool.__fold_str(_match_str, ignore_case=ignore_case)
+            _automaton.patterns.append((
+                _match_str, len(_match_str), _fold_match_str, _front_any, _front_dict, '\\^' in _front_chars,
+                _end_any, _end_dict, _end_eof
+            ))
+            if len(_match_str) == 0:
+                _automaton.empty_patterns.append(_index)
+                continue
+
+            # 加入字典树
+            _node = 0
+            for _char in _fold_match_str:
+                _next = _automaton.goto[_node].get(_char, None)
+                if _next is None:
+                    _next = len(_automaton.goto)
+                    _automaton.goto[_node][_char] = _next
+                    _automaton.goto.append(dict())
+                    _automaton.fail.append(0)
+                    _output.append(list())
+                _node = _next
+            _output[_node].append(_index)
+
+        # 按广度优先生成失败跳转，并合并失败跳转节点的匹配结果
+        _node_queue = collections.deque(_automaton.goto[0].values())
+        while len(_node_queue) > 0:
+            _node = _node_queue.popleft()
+            for _char, _next in _automaton.goto[_node].items():
+                _fail = _automaton.fail[_node]
+                while _fail > 0 and _char not in _automaton.goto[_fail].keys():
+                    _fail = _automaton.fail[_fail]
+                _automaton.fail[_next] = _automaton.goto[_fail].get(_char, 0)
+                _output[_next].extend(_output[_automaton.fail[_next]])
+                _node_queue.append(_next)
+        _automaton.goto = tuple(_automaton.goto)
+        _automaton.fail = tuple(_automaton.fail)
+        _automaton.output = tuple([tuple(_item) for _item in _output])
+        _automaton.patterns = tuple(_automaton.patterns)
+        _automaton.empty_patterns = tuple(_automaton.empty_patterns)
+        _automaton.max_len = max([_pattern[1] for _pattern in _automaton.patterns] + [0])
+        _automaton.regex = None
+        _automaton.first_char_patterns = dict()
+        if use_regex:
+            FormulaTool.__build_regex(automaton=_automaton, match_list=match_list)
+        return _automaton
 
     @staticmethod
-    def __del_compare_stack(compare_stack, match_str, start_pos, front_char):
+    def __build_regex(automaton, match_list):
         """
-        @fun 删除待匹配堆栈的匹配记录
-        @funName __del_compare_stack
+        @fun 生成检索匹配位置的正则表达式
+        @funName __build_regex
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 前置/后置字符都是单个字符或转义字符时，将匹配字符串按前置/后置字符分组，生成一个零宽度
+            的多选正则表达式（前置字符为后向断言，后置字符为前向断言），由re.finditer找出可能的匹配开始位置，
+            再按位置检查各匹配字符串；前置/后置字符不满足要求，或分组数超过_regex_max_group时不生成，使用自动机检索
+
+        @funParam {object} automaton 自动机对象，生成结果更新到regex和first_char_patterns属性
+        @funParam {dict} match_list 要检索的匹配字符清单字典
+
+        """
+        for _match_str in match_list.keys():
+            for _char in list(match_list[_match_str][0]) + list(match_list[_match_str][1]):
+                if len(_char) != 1 and _char not in ('\\^', '\\$', '\\*'):
+                    # 不是简单的字符
+                    return
+
+        # 按前置/后置字符分组
+        _groups = dict()
+        _first_char_patterns = dict()
+        for _index, _pattern in enumerate(automaton.patterns):
+            if _pattern[1] == 0:
+                continue
+            _front_str = ''
+            if _pattern[3] is None:
+                _front_list = list()
+                if _pattern[5]:
+                    _front_list.append('^')
+                if len(_pattern[4]) > 0:
+                    _front_list.append('(?<=[%s])' % ''.join([re.escape(_char) for _char in _pattern[4].keys()]))
+                if len(_front_list) == 0:
+                    # 不可能匹配上
+                    continue
+                _front_str = '(?:%s)' % '|'.join(_front_list)
+            _end_str = ''
+            if _pattern[6] is None:
+                _end_list = list()
+                if len(_pattern[7]) > 0:
+                    _end_list.append('(?=[%s])' % ''.join([re.escape(_char) for _char in _pattern[7].keys()]))
+                if _pattern[8] is not None:
+                    _end_list.append('\\Z')
+                if len(_end_list) == 0:
+                    continue
+                _end_str = '(?:%s)' % '|'.join(_end_list)
+            _group = _groups.setdefault((_front_str, _end_str), list())
+            if _pattern[2] not in _group:
+                _group.append(_pattern[2])
+            _first_char_patterns.setdefault(_pattern[2][0], list()).append(_index)
+
+        if len(_groups) == 0 or len(_groups) > FormulaTool._regex_max_group:
+            return
+        _regex_list = list()
+        for (_front_str, _end_str), _group in _groups.items():
+            _regex_list.append('%s(?:%s)%s' % (_front_str, '|'.join([re.escape(_str) for _str in _group]), _end_str))
+        automaton.regex = re.compile('(?=%s)' % '|'.join(_regex_list))
+        for _char in _first_char_patterns.keys():
+            automaton.first_char_patterns[_char] = tuple(_first_char_patterns[_char])
+
+    @staticmethod
+    def __check_match(pattern, fold_str, start_pos, end_pos):
+        """
+        @fun 检查匹配字符串的前置及后置字符
+        @funName __check_match
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 前置字符与后置字符都匹配上才算匹配
+
+        @funParam {tuple} pattern 自动机的匹配字符串参数
+        @funParam {string} fold_str 转换后的检索字符串
+        @funParam {int} start_pos 匹配字符串开始位置
+        @funParam {int} end_pos 匹配字符串结束位置
+
+        @funReturn {tuple} (前置字符, 后置字符)，没有匹配上返回None
 
         """
-        if match_str in compare_stack.keys():
-            _key = front_char+str(start_pos)
-            if _key in compare_stack[match_str].keys():
-                del compare_stack[match_str][_key]
+        # 前置字符，有任意前置字符时优先
+        if pattern[3] is not None and pattern[1] > 0:
+            _front_char = pattern[3]
+        elif start_pos == 0:
+            if not pattern[5]:
+                return None
+            _front_char = '\\^'
+        else:
+            _front_char = pattern[4].get(fold_str[start_pos - 1], None)
+            if _front_char is None:
+                return None
+
+        # 后置字符
+        if end_pos == len(fold_str):
+            _end_char = pattern[8]
+        elif pattern[6] is not None:
+            _end_char = pattern[6]
+        else:
+            _end_char = pattern[7].get(fold_str[end_pos], None)
+        if _end_char is None:
+            return None
+        return _front_char, _end_char
 
     @staticmethod
-    def __add_match_result(match_result, source_str, match_str, match_info):
+    def _search_chunk(automaton, chunk_str, offset=0, begin_pos=0, end_pos=None):
         """
-        @fun 将匹配信息放入匹配结果
-        @funName __add_match_result
+        @fun 检索字符串段中的匹配位置
+        @funName _search_chunk
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 检索字符串段，只返回开始位置在[begin_pos, end_pos)范围内的匹配结果；
+            字符串段需包含开始位置前1个字符（判断前置字符）及最长匹配字符串后1个字符（判断后置字符），
+            除非已到整个字符串的开头或结尾；该函数需要提交到进程池执行，因此不使用双下划线命名
+
+        @funParam {object} automaton 匹配自动机
+        @funParam {string} chunk_str 要检索的字符串段（未转换大小写）
+        @funParam {int} offset 字符串段在整个字符串中的开始位置
+        @funParam {int} begin_pos 匹配结果的开始位置范围（含），为在整个字符串中的位置
+        @funParam {int} end_pos 匹配结果的开始位置范围（不含），为在整个字符串中的位置，None代表不限制
+
+        @funReturn {dict} 各匹配字符串的匹配结果，key为匹配字符串序号，value为按开始位置排序的清单，
+            每项为(start_pos, end_pos, front_char, end_char)，位置为在整个字符串中的位置
+
+        """
+        _fold_str = FormulaTool.__fold_str(chunk_str, ignore_case=automaton.ignore_case)
+        _patterns = automaton.patterns
+        _results = dict()  # 各匹配字符串的匹配结果清单，key为匹配字符串序号
+        _begin_pos = begin_pos - offset
+        _stop_pos = len(_fold_str) + 1 if end_pos is None else end_pos - offset
+
+        if automaton.regex is not None:
+            # 通过正则表达式找出可能的开始位置，再检查该位置开始的匹配字符串
+            _first_char_patterns = automaton.first_char_patterns
+            for _match in automaton.regex.finditer(_fold_str, _begin_pos):
+                _start_pos = _match.start()
+                if _start_pos >= _stop_pos:
+                    break
+                for _index in _first_char_patterns[_fold_str[_start_pos]]:
+                    _pattern = _patterns[_index]
+                    if _fold_str.startswith(_pattern[2], _start_pos):
+                        _end_pos = _start_pos + _pattern[1]
+                        _check = FormulaTool.__check_match(_pattern, _fold_str, _start_pos, _end_pos)
+                        if _check is not None:
+                            _results.setdefault(_index, list()).append(
+                                (_start_pos + offset, _end_pos + offset, _check[0], _check[1]))
+        else:
+            # 在自动机中逐个字符跳转，找出所有出现位置
+            _goto = automaton.goto
+            _fail = automaton.fail
+            _output = automaton.output
+            _node = 0
+            _end_pos = 0
+            for _char in _fold_str:
+                _end_pos += 1
+                _next = _goto[_node].get(_char, None)
+                while _next is None and _node > 0:
+                    _node = _fail[_node]
+                    _next = _goto[_node].get(_char, None)
+                _node = 0 if _next is None else _next
+                if _output[_node]:
+                    for _index in _output[_node]:
+                        _pattern = _patterns[_index]
+                        _start_pos = _end_pos - _pattern[1]
+                        if _start_pos < _begin_pos or _start_pos >= _stop_pos:
+                            continue
+                        _check = FormulaTool.__check_match(_pattern, _fold_str, _start_pos, _end_pos)
+                        if _check is not None:
+                            _results.setdefault(_index, list()).append(
+                                (_start_pos + offset, _end_pos + offset, _check[0], _check[1]))
+
+        # 空匹配字符串，只能通过前置字符匹配
+        for _index in automaton.empty_patterns:
+            _pattern = _patterns[_index]
+            for _pos in range(max(0, _begin_pos), min(len(_fold_str) + 1, _stop_pos)):
+                if _pos == 0 and not _pattern[5]:
+                    continue
+                if _pos > 0 and _fold_str[_pos - 1] not in _pattern[4].keys():
+                    continue
+                _check = FormulaTool.__check_match(_pattern, _fold_str, _pos, _pos)
+                if _check is not None:
+                    _results.setdefault(_index, list()).append((_pos + offset, _pos + offset, _check[0], _check[1]))
+
+        return _results
+
+    @staticmethod
+    def __search_parallel(automaton, source_str, chunk_size, pool_size=0, executor=None):
+        """
+        @fun 将字符串拆分为多个字符串段并行检索
+        @funName __search_parallel
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 每个字符串段负责开始位置在[begin_pos, begin_pos + chunk_size)范围内的匹配结果，
+            实际检索的字符串段向前多取1个字符、向后多取最长匹配字符串长度个字符（相邻字符串段重叠
+            最长匹配字符串长度+1个字符），保证前置/后置字符的判断与整体检索一致；各字符串段按开始位置
+            划分结果，合并时不会重复，结果与不拆分检索完全一致
+
+        @funParam {object} automaton 匹配自动机
+        @funParam {string} source_str 需要检索的字符串
+        @funParam {int} chunk_size 每个字符串段负责的字符数
+        @funParam {int} pool_size 进程池大小，0代表使用CPU核数（executor不为None时忽略）
+        @funParam {concurrent.futures.Executor} executor 执行检索的执行器，None代表创建临时的进程池
+
+        @funReturn {dict} 各匹配字符串的匹配结果，格式与_search_chunk一致
 
         """
-        if match_str not in match_result.keys():
-            match_result[match_str] = dict()
-        _result_info = NullObj()
-        _result_info.start_pos = match_info.start_pos  # 匹配结果开始位置（不含前置字符）
-        _result_info.end_pos = match_info.end_pos  # 匹配结果结束位置（不含后置字符）
-        # 匹配到的原文字符串
-        _result_info.source_str = source_str[_result_info.start_pos: _result_info.end_pos]
-        _result_info.front_char = match_info.front_char  # 匹配到的前置字符
-        _result_info.end_char = match_info.end_char  # 匹配到的后置字符
-        match_result[match_str][_result_info.start_pos] = _result_info
+        _len = len(source_str)
+        _futures = list()
+        _executor = executor
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=(pool_size if pool_size > 0 else None))
+        try:
+            for _begin_pos in range(0, _len + 1, chunk_size):
+                # 最后一个字符串段负责到字符串结尾位置（空匹配字符串可匹配结尾位置）
+                _end_pos = _begin_pos + chunk_size
+                if _end_pos >= _len:
+                    _end_pos = _len + 1
+                _offset = max(0, _begin_pos - 1)
+                _futures.append(_executor.submit(
+                    FormulaTool._search_chunk, automaton,
+                    source_str[_offset: min(_len, _end_pos + automaton.max_len)],
+                    _offset, _begin_pos, _end_pos
+                ))
+                if _end_pos > _len:
+                    break
+
+            # 按字符串段顺序合并结果
+            _results = dict()
+            for _future in _futures:
+                for _index, _result_list in _future.result().items():
+                    _results.setdefault(_index, list()).extend(_result_list)
+            return _results
+        finally:
+            if executor is None:
+                _executor.shutdown(wait=True)
 
     @staticmethod
-    def __compare_char(deal_char='', match_char_list=list(), ignore_case=False):
+    def __search_all(source_str, match_list, ignore_case=False, automaton=None, chunk_size=0, pool_size=0,
+                     executor=None):
         """
-        @fun 字符比较内部函数
-        @funName __compare_char
+        @fun 内部函数，从字符串中检索匹配字符清单，并返回所有结果
+        @funName __search_all
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 封装公共的字符比较函数
+        @funDescription 从字符串中检索匹配字符清单，并返回所有结果，算法：
+            1、将匹配字符清单生成Aho–Corasick自动机，检索字符串逐个字符在自动机中跳转，一次遍历即可找到所有
+                匹配字符串的出现位置，处理时间与检索字符串长度成线性关系（与匹配字符清单的数量无关）；
+                编译时指定use_regex且前置/后置字符允许生成正则表达式时，改为通过re.finditer找出匹配位置
+                （参考__build_regex）；
+            2、对找到的位置检查前置字符及后置字符，两者都匹配上的登记为结果；
+            3、字符串长度超过chunk_size时，拆分为多个字符串段在进程池中并行检索（参考__search_parallel）；
+            4、结果字典按匹配字符串第一个结果的结束位置排序（与逐个字符比较的处理顺序保持一致）。
 
-        @funParam {char} deal_char 传入的待比较字符
-        @funParam {list} match_char_list 需要比较的字符数组
+        @funParam {string} source_str 需要检索的字符串
+        @funParam {dict} match_list 要检索的匹配字符清单字典，格式为：
+            key - string, 要匹配的字符串
+            value - (string[], string[]) 前置字符列表，后置字符列表（可以一次设置多个前置字符匹配）:
+                注意：前置字符和后置字符都只支持1个字符，当有两个字符时必须满足一下转义的定义：
+                    \^ : 匹配字符串开头
+                    \$ : 匹配字符串结尾
+                    \* : 匹配任意字符（也可以是前面无字符）
         @funParam {bool} ignore_case 是否忽略大小写
+        @funParam {object} automaton 已生成的匹配自动机，None代表根据match_list生成
+        @funParam {int} chunk_size 并行检索时每个字符串段的字符数，0代表不拆分
+        @funParam {int} pool_size 并行检索的进程池大小，0代表使用CPU核数
+        @funParam {concurrent.futures.Executor} executor 并行检索的执行器，None代表创建临时的进程池
 
-        @funReturn {string} 匹配到的字符
+        @funReturn {dict} 匹配结果字典，格式为:
+            key - string, 匹配上的字符串（match_list的key）
+            value - dict, 匹配到的结果字典，key为start_pos,value为一个object:
+                object.source_str : string 匹配到的原文字符串
+                object.start_pos : int 匹配结果开始位置（不含前置字符）
+                object.end_pos : int 匹配结果结束位置（不含后置字符）
+                object.front_char : string 匹配到的前置字符
+                object.end_char : string 匹配到的后置字符
 
         """
-        for _char in match_char_list:
-            if not ignore_case and deal_char == _char:
-                return _char
-            elif ignore_case and deal_char.upper() == _char.upper():
-                return _char
+        if automaton is None:
+            automaton = FormulaTool.__build_automaton(match_list=match_list, ignore_case=ignore_case)
+        _patterns = automaton.patterns
+        if chunk_size > 0 and len(source_str) > chunk_size:
+            _results = FormulaTool.__search_parallel(automaton=automaton, source_str=source_str,
+                                                     chunk_size=chunk_size, pool_size=pool_size, executor=executor)
+        else:
+            _results = FormulaTool._search_chunk(automaton=automaton, chunk_str=source_str)
+
+        # 按第一个结果的结束位置、开始比较的先后顺序形成结果字典，开始比较的位置不会超过第一个结果的开始位置
+        _fold_str = ''
+        if len(_results) > 0:
+            _fold_str = FormulaTool.__fold_str(
+                source_str[0: max([_result_list[0][0] for _result_list in _results.values()]) + 1],
+                ignore_case=automaton.ignore_case
+            )
+        _order_list = list()
+        for _index, _result_list in _results.items():
+            _order_list.append((
+                _result_list[0][1],
+                FormulaTool.__get_first_compare_pos(_patterns[_index], _fold_str, _result_list[0][0]),
+                _index
+            ))
+        _order_list.sort()
+        _match_result = dict()
+        for _first_end_pos, _compare_pos, _index in _order_list:
+            _match_dict = dict()
+            for _start_pos, _end_pos, _front_char, _end_char in _results[_index]:
+                _result_info = NullObj()
+                _result_info.start_pos = _start_pos  # 匹配结果开始位置（不含前置字符）
+                _result_info.end_pos = _end_pos  # 匹配结果结束位置（不含后置字符）
+                _result_info.source_str = source_str[_start_pos: _end_pos]  # 匹配到的原文字符串
+                _result_info.front_char = _front_char  # 匹配到的前置字符
+                _result_info.end_char = _end_char  # 匹配到的后置字符
+                _match_dict[_start_pos] = _result_info
+            _match_result[_patterns[_index][0]] = _match_dict
 
-        # 没有一个匹配上
-        return ''
+        return _match_result
 
     @staticmethod
-    @StringStream.stream_decorator(is_sync=True)
-    def __match_stream_dealer(deal_obj=None, position=0, str_obj='', match_list=dict(), compare_stack=dict(),
-                              match_result=dict(), ignore_case=False):
+    def __get_first_compare_pos(pattern, fold_str, first_start_pos):
         """
-        @fun 逐个字符匹配处理的流函数定义
-        @funName __match_stream_dealer
+        @fun 获取匹配字符串第一次开始比较的位置
+        @funName __get_first_compare_pos
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 即第一次匹配上前置字符或第一个字符的位置，用于保持结果字典的顺序
+
+        @funParam {tuple} pattern 自动机的匹配字符串参数
+        @funParam {string} fold_str 转换后的检索字符串
+        @funParam {int} first_start_pos 第一个匹配结果的开始位置
+
+        @funReturn {int} 开始比较的位置，匹配开头的返回-1
 
         """
-        # 先遍历堆栈中的待匹配字符，如果匹配不上则删除对应的记录
-        for _match_str in compare_stack.keys():
-            _compare_stack_keys = list(compare_stack[_match_str].keys())  # 复制key列表便于直接删除对象
-            for _key in _compare_stack_keys:
-                # 进入堆栈的都是前置字符已经通过的，可以直接进行按照match_pos的位置匹配处理
-                _match_info = compare_stack[_match_str][_key]
-                # DebugTools.debug_print(_match_info=_match_info)
-                if _match_info.match_pos >= len(_match_str):
-                    # 已经匹配到字符结尾（看是否有后置字符的比较）
-                    _end_char = ''
-                    _match_flag = False
-                    if len(match_list[_match_str][1]) == 0:
-                        _match_flag = True
-                    elif '\\*' in match_list[_match_str][1]:
-                        _end_char = '\\*'
-                        _match_flag = True
-                    else:
-                        _end_char = FormulaTool.__compare_char(
-                            deal_char=deal_obj, match_char_list=match_list[_match_str][1],
-                            ignore_case=ignore_case)
-                        if len(_end_char) > 0:
-                            _match_flag = True
-
-                    # 处理匹配结果
-                    if _match_flag:
-                        _match_info.end_char = _end_char
-                        _match_info.end_pos = position
-                        # 添加到匹配结果
-                        FormulaTool.__add_match_result(match_result=match_result, source_str=str_obj,
-                                                       match_str=_match_str, match_info=_match_info)
-
-                    # 无论是否匹配上，都从待匹配清单删除
-                    compare_stack[_match_str].pop(_key)
-                else:
-                    # 正常的匹配
-                    _match_char = _match_str[_match_info.match_pos: _match_info.match_pos + 1]
-                    _match_info.match_pos = _match_info.match_pos + 1  # 向下一个位置移动
-                    if len(FormulaTool.__compare_char(
-                            deal_char=deal_obj, match_char_list=[_match_char],
-                            ignore_case=ignore_case)) == 0:
-                        # 匹配不上，从堆栈中删除
-                        compare_stack[_match_str].pop(_key)
-
-        # 检索匹配清单，看是否要加入新的待匹配堆栈
-        for _match_str in match_list.keys():
-            _front_char = ''
-            _start_pos = position
-            _match_pos = 0
-            _match_flag = False
-            if '\\*' in match_list[_match_str][0]:
-                # 前置字符匹配任意字符都可以
-                _front_char = '\\*'
-            if ((len(match_list[_match_str][0]) == 0 or '\\*' in match_list[_match_str][0])
-                and len(FormulaTool.__compare_char(
-                    deal_char=deal_obj, match_char_list=[_match_str[0: 1]],
-                    ignore_case=ignore_case)) > 0):
-                # 没有前置字符,或前置字符为通用匹配符，进行第1个字符的匹配且匹配上
-                _match_pos = 1  # 因为已经匹配了第1个字符，因此位置要加1
-                _match_flag = True
-            elif len(match_list[_match_str][0]) > 0:
-                _front_char = FormulaTool.__compare_char(deal_char=deal_obj,
-                                                         match_char_list=match_list[_match_str][0],
-                                                         ignore_case=ignore_case)
-                if len(_front_char) > 0:
-                    # 匹配上前置字符
-                    _start_pos = position + 1  # 因为只是匹配前置，因此开始位置要加1
-                    _match_flag = True
-
-            # 添加待匹配堆栈
-            if _match_flag:
-                FormulaTool.__add_compare_stack(compare_stack=compare_stack, match_str=_match_str,
-                                                start_pos=_start_pos, front_char=_front_char, match_pos=_match_pos)
+        if pattern[5]:
+            return -1
+        _compare_pos = first_start_pos
+        _chars = list(pattern[4].keys())
+        if pattern[3] is not None and pattern[1] > 0:
+            _chars.append(pattern[2][0])
+        for _char in _chars:
+            _pos = fold_str.find(_char, 0, _compare_pos)
+            if _pos >= 0:
+                _compare_pos = _pos
+        return _compare_pos
 
     @staticmethod
     def __sorted_by_match_info(match_info_x, match_info_y, match_list, sort_oder=EnumFormulaSearchSortOrder.ListAsc):
@@ -861,10 +1276,36 @@ class FormulaTool(object):
     # 静态工具
     #############################
 
+    @staticmethod
+    def compile(match_list, ignore_case=False, use_regex=False):
+        """
+        @fun 编译匹配字符清单
+        @funName compile
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 预先生成大小写转换、匹配自动机及前置/后置字符对照，返回可重复使用的匹配对象，
+            避免每次检索都重新生成；匹配对象不可修改，可在多线程间共享
+
+        @funParam {dict} match_list 要检索的匹配字符清单字典，格式参考search
+        @funParam {bool} ignore_case 是否忽略大小写
+        @funParam {bool} use_regex 前置/后置字符都是单个字符或转义字符时，是否使用正则表达式检索，默认不使用；
+            正则表达式在C实现的正则引擎中查找可能的匹配位置，但每个位置都需回到Python中检查，只适合匹配结果
+            稀疏的场景（例如在长文本中检索少量关键字），匹配密集时（例如SQL语句中的关键字）比自动机更慢，
+            使用前应按实际数据测试；匹配参数不满足要求时自动使用自动机检索，检索结果一致
+
+        @funReturn {FormulaMatcher} 编译后的匹配对象
+
+        """
+        return FormulaMatcher(
+            match_list=match_list, ignore_case=ignore_case,
+            automaton=FormulaTool.__build_automaton(match_list=match_list, ignore_case=ignore_case,
+                                                    use_regex=use_regex)
+        )
+
     @staticmethod
     def search(source_str, match_list, ignore_case=False,
                multiple_match=True, sort_oder=EnumFormulaSearchSortOrder.MatchAsc,
-               result_type=EnumFormulaSearchResultType.Dict):
+               result_type=EnumFormulaSearchResultType.Dict, chunk_size=0, pool_size=0, executor=None):
         """
         @fun 从字符串中检索匹配字符清单
         @funName search
@@ -873,15 +1314,19 @@ class FormulaTool(object):
         @funDescription 从字符串中检索匹配字符清单，获取匹配结果
 
         @funParam {string} source_str 需要检索的字符串
-        @funParam {dict} match_list 要检索的匹配字符清单字典，格式为：
+        @funParam {dict} match_list 要检索的匹配字符清单字典（也可以传入compile生成的FormulaMatcher），格式为：
             key - string, 要匹配的字符串
             value - (string[], string[]) 前置字符列表，后置字符列表（可以一次设置多个前置字符匹配）:
                 前置字符/后置字符可以支持以下3个转义：'\\^'匹配开始；'\\$'匹配开始；'\\*'匹配任意字符（也可以匹配0字符）
                 如果前置字符/后置字符列表长度为0，则代表不判断前置及后置字符，等同于'\\*'
-        @funParam {bool} ignore_case 是否忽略大小写
+        @funParam {bool} ignore_case 是否忽略大小写，match_list为FormulaMatcher时使用编译时的参数
         @funParam {bool} multiple_match 是否支持多重匹配（即同一段字符可以被多个匹配字符所匹配上）
         @funParam {EnumFormulaSearchSortOrder} sort_oder 匹配结果获取顺序，在不支持多重匹配的情况下按该顺序保留结果
         @funParam {EnumFormulaSearchResultType} result_type 匹配结果类型
+        @funParam {int} chunk_size 并行检索时每个字符串段的字符数，0代表不拆分；字符串长度超过该值时拆分为
+            多个字符串段在进程池中检索，结果与不拆分检索完全一致
+        @funParam {int} pool_size 并行检索的进程池大小，0代表使用CPU核数
+        @funParam {concurrent.futures.Executor} executor 并行检索的执行器，None代表每次检索创建临时的进程池
 
         @funReturn {dict/list} 匹配结果，返回格式与result_type参数有关:
             字典格式为:
@@ -900,8 +1345,12 @@ class FormulaTool(object):
             ]
 
         """
+        _matcher = match_list
+        if not isinstance(_matcher, FormulaMatcher):
+            _matcher = FormulaTool.compile(match_list=match_list, ignore_case=ignore_case)
         _match_result = FormulaTool.__search_all(
-            source_str=source_str, match_list=match_list, ignore_case=ignore_case)
+            source_str=source_str, match_list=_matcher.match_list, ignore_case=_matcher.ignore_case,
+            automaton=_matcher._automaton, chunk_size=chunk_size, pool_size=pool_size, executor=executor)
         if not multiple_match:
             # 不允许多重匹配，检查冲突并按排序规则删除列表
             _result_list = FormulaTool.match_result_to_sorted_list(match_result=_match_result)
@@ -915,7 +1364,8 @@ class FormulaTool(object):
                 # 检查有没有冲突
                 if ((_last_item[2] <= _item[2] < _last_item[3]) or (_last_item[2] < _item[3] <= _last_item[3])):
                     _compare_result = FormulaTool.__sorted_by_match_info(_last_item, _item,
-                                                                         match_list=match_list, sort_oder=sort_oder)
+                                                                         match_list=_matcher.match_list,
+                                                                         sort_oder=sort_oder)
                     if _compare_result <= 0:
                         # 删除后面一个
                         del _match_result[_item[0]][_item[2]]
@@ -1006,7 +1456,7 @@ class FormulaTool(object):
     #############################
 
     _keywords = dict()  # 公式关键字定义
-    _match_list = dict()  # 要检索的匹配字符清单字典(预先生成提高性能)
+    _match_list = None  # 编译后的匹配对象FormulaMatcher(预先生成提高性能)
     _ignore_case = False  # 是否忽略大小写
     _deal_fun_list = dict()  # 公式计算函数对照字典
     _default_deal_fun = None  # 默认的公式处理函数
@@ -1227,7 +1677,8 @@ class FormulaTool(object):
         else:
             self._default_deal_fun = default_deal_fun
         # 计算match_list
-        self._match_list = self.__keywords_to_match_list(self._keywords)
+        self._match_list = FormulaTool.compile(match_list=self.__keywords_to_match_list(self._keywords),
+                                               ignore_case=self._ignore_case)
 
     def clear_keywords(self, with_deal_fun=False):
         """
@@ -1241,7 +1692,7 @@ class FormulaTool(object):
 
         """
         self._keywords.clear()
-        self._match_list.clear()
+        self._match_list = FormulaTool.compile(match_list=dict(), ignore_case=self._ignore_case)
         if with_deal_fun:
             self._deal_fun_list.clear()
 
@@ -1261,7 +1712,8 @@ class FormulaTool(object):
         """
         del self._keywords[key]
         # 计算match_list
-        self._match_list = self.__keywords_to_match_list(self._keywords)
+        self._match_list = FormulaTool.compile(match_list=self.__keywords_to_match_list(self._keywords),
+                                               ignore_case=self._ignore_case)
         if with_deal_fun:
             if key in self._deal_fun_list.keys():
                 del self._deal_fun_list[key]
@@ -1302,7 +1754,8 @@ class FormulaTool(object):
             self._deal_fun_list[key] = deal_fun
 
         # 计算match_list
-        self._match_list = self.__keywords_to_match_list(self._keywords)
+        self._match_list = FormulaTool.compile(match_list=self.__keywords_to_match_list(self._keywords),
+                                               ignore_case=self._ignore_case)
 
     def run_formula(self, formula_str, **kwargs):
         """
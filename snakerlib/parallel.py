@@ -3,21 +3,32 @@
 # Filename : parallel.py
 
 
+import os
 import uuid
+import itertools
 import sys
+import socket
+import struct
+import pickle
 import traceback
 import copy
-from datetime import datetime
 import time
 import queue
 import threading
 import multiprocessing
 import inspect
 import ctypes
+import functools
+import asyncio
+import collections
+import importlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from enum import Enum
 # 通过gevent实现协程模式，pip install gevent
 import gevent
 import gevent.pool
+from .net_service.base_service_fw import EnumNetServerRunStatus
+from .net_service.tcpip_service import TcpIpService
 
 
 __MoudleName__ = 'parallel'
@@ -32,47 +43,37 @@ __Time__ = '2018/3/1'
 #############################
 class ParaValueError(ValueError):
     """ Inappropriate argument value (of correct type). """
-    def __init__(self, *args, **kwargs):  # real signature unknown
-        pass
-
-    @staticmethod  # known case of __new__
-    def __new__(*args, **kwargs):  # real signature unknown
-        """ Create and return a new object.  See help(type) for accurate signature. """
-        pass
+    pass
 
 
 class UnsupportError(ValueError):
-    """ Inappropriate argument value (of correct type). """
-    def __init__(self, *args, **kwargs):  # real signature unknown
-        pass
-
-    @staticmethod  # known case of __new__
-    def __new__(*args, **kwargs):  # real signature unknown
-        """ Create and return a new object.  See help(type) for accurate signature. """
-        pass
+    """ Unsupported parallel type or operation. """
+    pass
 
 
 class TaskPoolStopedError(ValueError):
-    """ Inappropriate argument value (of correct type). """
-    def __init__(self, *args, **kwargs):  # real signature unknown
-        pass
-
-    @staticmethod  # known case of __new__
-    def __new__(*args, **kwargs):  # real signature unknown
-        """ Create and return a new object.  See help(type) for accurate signature. """
-        pass
+    """ The task pool has been stopped. """
+    pass
 
 
 class OvertimeError(ValueError):
-    """ Inappropriate argument value (of correct type). """
-    def __init__(self, *args, **kwargs):  # real signature unknown
-        pass
+    """ The task was not finished in time. """
+    pass
+
+
+class TaskRejectedError(ValueError):
+    """ The task was rejected because the task queue is full. """
+    pass
 
-    @staticmethod  # known case of __new__
-    def __new__(*args, **kwargs):  # real signature unknown
-        """ Create and return a new object.  See help(type) for accurate signature. """
-        pass
 
+class ResultChannelClosedError(ValueError):
+    """ The result channel is closed and all attached results have been delivered. """
+    pass
+
+
+class RemoteNodeLostError(ConnectionError):
+    """ The remote worker node is unreachable or stopped answering heartbeats. """
+    pass
 
 
 class EnumParallelType(Enum):
@@ -88,6 +89,115 @@ class EnumParallelType(Enum):
     RemoteProcessing = 'RemoteProcessing'  # 远程进程模式
 
 
+class EnumTaskRejectPolicy(Enum):
+    """
+    @enum 任务队列满时的拒绝策略
+    @enumName EnumTaskRejectPolicy
+    @enumDescription 任务池设置了max_task_queue_size且队列已满时，对新放入任务的处理方式
+
+    """
+    Block = 'Block'  # 阻塞等待队列空间，超过reject_block_timeout仍无空间则抛出TaskRejectedError
+    CallerRuns = 'CallerRuns'  # 由调用put_task的线程直接执行该任务
+    DropOldest = 'DropOldest'  # 丢弃队列中最早的待处理任务（通过exception_callback通知），再放入新任务
+    Raise = 'Raise'  # 直接抛出TaskRejectedError
+
+
+class EnumDAGTaskStatus(Enum):
+    """
+    @enum DAG任务节点的执行状态
+    @enumName EnumDAGTaskStatus
+    @enumDescription DAG任务节点的执行状态
+
+    """
+    Waiting = 'Waiting'  # 等待上游任务完成
+    Running = 'Running'  # 已放入任务池执行
+    Success = 'Success'  # 执行成功
+    Failed = 'Failed'  # 执行出现异常
+    UpstreamFailed = 'UpstreamFailed'  # 上游任务失败，不再执行
+    Cancelled = 'Cancelled'  # 被取消，不再执行
+
+
+class StructParallelTask(object):
+    """
+    @class 并行任务池的任务记录结构
+    @className StructParallelTask
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 任务参数及执行状态，任务在进入队列时创建，使用__slots__减少内存及属性访问开销
+
+    """
+
+    __slots__ = ('task_id', 'target', 'args', 'kwargs', 'name', 'callback', 'exception_callback',
+                 'wait_finish', 'task_overtime', 'result_channel', 'put_time', 'start_time', 'worker_id')
+
+    def __init__(self, task_id, target, args, kwargs, name, callback, exception_callback, wait_finish, task_overtime,
+                 result_channel=None):
+        self.task_id = task_id  # 任务ID，任务池内递增的整数
+        self.target = target  # 目标函数
+        self.args = args  # 函数运行参数(顺序格式)
+        self.kwargs = kwargs  # 函数运行参数(kv格式)
+        self.name = name  # 任务名
+        self.callback = callback  # 结果回调函数
+        self.exception_callback = exception_callback  # 异常回调函数
+        self.wait_finish = wait_finish  # 是否等待目标函数执行完成才返回
+        self.task_overtime = task_overtime  # 任务执行的超时时间，单位为秒
+        self.result_channel = result_channel  # 任务结果输出通道（ParallelResultChannel）
+        self.put_time = time.monotonic_ns()  # 放入队列的时间（time.monotonic_ns）
+        self.start_time = None  # 开始执行的时间（time.monotonic_ns），未开始执行为None
+        self.worker_id = None  # 执行任务的工作线程id
+
+
+class StructParallelResult(object):
+    """
+    @class 结果通道输出的任务结果结构
+    @className StructParallelResult
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 任务执行成功及执行异常（含超时、被丢弃、被取消）的结果都通过该结构输出
+
+    """
+
+    __slots__ = ('task_id', 'name', 'args', 'kwargs', 'is_success', 'result', 'error', 'trace_str')
+
+    def __init__(self, task_id, name, args, kwargs, is_success, result=None, error=None, trace_str=''):
+        self.task_id = task_id  # 任务ID
+        self.name = name  # 任务名
+        self.args = args  # 函数运行参数(顺序格式)
+        self.kwargs = kwargs  # 函数运行参数(kv格式)
+        self.is_success = is_success  # 任务是否执行成功
+        self.result = result  # 任务的返回值
+        self.error = error  # 执行异常时的sys.exc_info()三元组对象(type, value, traceback)
+        self.trace_str = trace_str  # 执行异常时的错误追踪堆栈日志
+
+
+class ParallelTaskQueue(queue.Queue):
+    """
+    @class 任务池的待处理任务队列
+    @className ParallelTaskQueue
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 在queue.Queue的基础上支持将任务重新放回队列头部（远程节点失联时），
+        重新放回不受maxsize限制，并通过队列自身的条件唤醒等待中的工作线程
+
+    """
+
+    def put_front(self, item):
+        """
+        @fun 将对象放回队列头部
+        @funName put_front
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 不受maxsize限制，不会阻塞；放回的对象下一次get时优先获取
+
+        @funParam {object} item 要放回的对象
+
+        """
+        with self.not_empty:
+            self.queue.appendleft(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+
 class ParallelTaskPool(object):
     """
     @class 并行任务池（线程、进程池）
@@ -107,11 +217,14 @@ class ParallelTaskPool(object):
     _parallel_type = None
     _pool_size = 5
     _free_task_keep_time = 10  # 空闲任务保持时长（即长期空闲的任务将被删除），单位为秒
-    _task_sleep_time = 0.5  # 空闲任务的休眠时长（获取任务之间的间隔），单位为秒，0代表不休眠
+    _task_sleep_time = 0.5  # 空闲工作线程每次等待新任务的最长时间，单位为秒，0代表按free_task_keep_time等待
     _task_overtime = 0  # 任务执行超时时间
     _overtime_deamon_sleep_time = 5  # 任务执行超时监护进程每次检查休眠时间
     _wait_task_queue = None  # 等待处理的任务队列，根据线程或进程采取不同模式
     _max_task_queue_size = 0
+    _reject_policy = EnumTaskRejectPolicy.Block  # 任务队列满时的拒绝策略
+    _reject_block_timeout = None  # Block策略等待队列空间的超时时间，单位为秒，None代表一直等待
+    _rejected_task_count = 0  # 被拒绝（含被丢弃和由调用方执行）的任务数
     _wait_stop_flag = False  # 标识是否等待线程池停止
     _stop_flag = False  # 标识线程池是否已停止
     _pause_flag = False  # 标识线程池的处理是否暂停
@@ -122,14 +235,23 @@ class ParallelTaskPool(object):
     # 线程创建完成后放入字典，线程执行完成（正常完成或被强制中止）从字典移出
     _generate_workers = dict()
     # 任务执行状态
-    #   key为任务号（uuid）
-    #   value为二维数组，格式为[放入队列的datetime，开始执行的datetime, worker_id, task_obj-任务相关参数]
+    #   key为任务号（任务池内递增的整数）
+    #   value为任务记录StructParallelTask，包含放入队列时间、开始执行时间、worker_id及任务相关参数
     # 任务在进入队列（put）的时候就放入该字典，任务处理完成（成功、异常、超时）的时候从字典中删除
     _task_status = dict()
-    # 登记任务超时的清单，解决已超时但未开始执行的情况，key为任务的uuid，value为None
-    #
-    _task_overtime_list = dict()
     _task_status_lock = threading.RLock()  # 任务执行状态的更新锁
+    _task_id_seq = None  # 任务号生成器（itertools.count）
+    _worker_no_seq = None  # 工作线程序号生成器（itertools.count），用于匹配cpu_affinity
+    _initializer = None  # 工作线程启动时执行的初始化函数
+    _initargs = ()  # 初始化函数的参数
+    _cpu_affinity = None  # 工作线程绑定的CPU清单
+    _worker_init_error = None  # 工作线程初始化失败的异常信息(error, trace_str)
+    # 工作线程（进程）的本地数据，state为初始化函数的返回值
+    _worker_local = threading.local()
+    _task_status_cond = None  # 任务状态变化（任务完成、停止任务池）的通知条件，基于_task_status_lock
+    _running_task_count = 0  # 正在执行（已开始执行但未完成）的任务数
+    _stop_event = None  # 任务池停止的事件，用于唤醒等待中的守护线程
+    _resume_event = None  # 任务池未暂停的事件，暂停时工作线程等待该事件
 
     #############################
     # 私有函数
@@ -174,63 +296,58 @@ class ParallelTaskPool(object):
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
-        @funExcepiton:
-            异常类名 异常说明
+
+        @funParam {StructParallelTask} task_obj 任务对象
 
         """
         self._task_status_lock.acquire()
         try:
-            # task_job = [_id, target, args, kwargs, name, callback, exception_callback, wait_finish, task_overtime]
-            self._task_status[task_obj[0]] = [datetime.now(), None, None, task_obj]
-        except:
-            pass
+            self._task_status[task_obj.task_id] = task_obj
         finally:
             self._task_status_lock.release()
 
-
     def _del_task_status(self, task_id):
         """
-        @fun 添加任务状态记录
-        @funName _add_task_status
+        @fun 删除任务状态记录
+        @funName _del_task_status
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
         @funExcepiton:
             异常类名 异常说明
 
-        @funParam {uuid} task_id 任务ID
+        @funParam {int} task_id 任务ID
 
         """
         self._task_status_lock.acquire()
         try:
-            del self._task_status[task_id]
-        except:
-            pass
+            _status = self._task_status.pop(task_id, None)
+            if _status is not None and _status.start_time is not None:
+                self._running_task_count -= 1
+            self._task_status_cond.notify_all()
         finally:
             self._task_status_lock.release()
 
-    def _generate_worker(self):
+    def _generate_worker(self, remote_node=None):
         """
         @fun 创建新工作线程
         @funName _generate_worker
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
-        @funExcepiton:
-            异常类名 异常说明
-
-        @funParam {参数类型} 参数名 参数说明
-
-        @funReturn {返回值类型} 返回值说明
+        @funDescription 远程模式下工作线程负责将任务分发到指定的远程节点执行
 
-        @funExample {代码格式} 示例名:
-            函数使用参考示例
+        @funParam {(string, int)} remote_node 远程模式下工作线程对应的远程节点(ip, port)
 
         """
-        if self._parallel_type == EnumParallelType.Threading:
-            # 创建线程
-            _worker_obj = threading.Thread(target=self._worker_fun)
+        if self._parallel_type in (EnumParallelType.Threading, EnumParallelType.RemoteProcessing):
+            # 创建线程，先登记到工作线程清单再启动，避免并发放入任务时创建超过池大小的线程
+            _worker_id = uuid.uuid1()
+            if remote_node is not None:
+                self._remote_worker_nodes[_worker_id] = remote_node
+            _worker_obj = threading.Thread(target=self._worker_fun, args=(_worker_id, next(self._worker_no_seq)))
             _worker_obj.setDaemon(True)  # 线程结束自动结束
+            self._generate_workers[_worker_id] = _worker_obj
+            self._free_workers.append(_worker_id)
             _worker_obj.start()  # 启动线程
 
     def _kill_worker(self, worker_id, task_id):
@@ -244,7 +361,7 @@ class ParallelTaskPool(object):
             异常类名 异常说明
 
         @funParam {uuid} worker_id 任务处理线程id
-        @funParam {uuid} task_id 当前正在处理的任务对象ID
+        @funParam {int} task_id 当前正在处理的任务对象ID
 
         """
         # 先检查任务跟worker是否一致
@@ -253,8 +370,7 @@ class ParallelTaskPool(object):
             if task_id not in self._task_status.keys():
                 # 已经处理过，任务不在清单，不处理
                 return
-            _task_status = self._task_status[task_id]
-            if _task_status[1] != worker_id:
+            if self._task_status[task_id].worker_id != worker_id:
                 # 线程和任务不对应，不处理
                 return
             # 结束线程
@@ -283,399 +399,1860 @@ class ParallelTaskPool(object):
         @funName _put_task_to_queue
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 队列已满时按任务池的拒绝策略处理
         @funExcepiton:
-            异常类名 异常说明
+            TaskRejectedError 按Raise策略拒绝，或Block策略等待超时时抛出该异常
+
+        @funParam {StructParallelTask} task_obj 任务对象
 
         """
         self._add_task_status(task_obj=task_obj)
         # 放入待处理清单
         try:
-            if self._parallel_type == EnumParallelType.Threading:
-                self._wait_task_queue.put(task_obj)
+            if self._parallel_type in (EnumParallelType.Threading, EnumParallelType.RemoteProcessing):
+                if self._reject_policy == EnumTaskRejectPolicy.Block:
+                    self._wait_task_queue.put(task_obj, block=True, timeout=self._reject_block_timeout)
+                    return
+                while True:
+                    try:
+                        self._wait_task_queue.put(task_obj, block=False)
+                        return
+                    except queue.Full:
+                        if self._reject_policy != EnumTaskRejectPolicy.DropOldest:
+                            raise
+                        # 丢弃最早的任务后重试
+                        self._drop_oldest_task()
+        except queue.Full:
+            # 队列已满，从状态列表删除，按策略处理
+            self._del_task_status(task_id=task_obj.task_id)
+            self._add_rejected_count()
+            if self._reject_policy == EnumTaskRejectPolicy.CallerRuns:
+                self._run_task_in_caller(task_obj)
+            else:
+                raise TaskRejectedError('task queue is full: max_task_queue_size=%s' % str(self._max_task_queue_size))
         except:
-            # 可能有超过长度的异常，从状态列表删除
-            self._del_task_status(task_id=task_obj[0])
-            raise sys.exc_info()
+            self._del_task_status(task_id=task_obj.task_id)
+            raise
 
-
-    def _get_task_from_queue(self, worker_id):
+    def _add_rejected_count(self):
         """
-        @fun 从队列中获取任务
-        @funName _get_task_from_queue
+        @fun 登记被拒绝的任务数
+        @funName _add_rejected_count
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
 
-        @funParam {uuid} worker_id 任务处理线程id
-
-        @funReturn {object} 返回队列中的对象，如果获取不到返回None
-
         """
         self._task_status_lock.acquire()
         try:
-            if self._parallel_type == EnumParallelType.Threading:
-                # 线程模式的队列获取
-                try:
-                    _task_obj = None
-                    while True:
-                        _task_obj = self._wait_task_queue.get(block=False)  # 不阻塞，直接返回
-                        if _task_obj[0] in self._task_overtime_list.keys():
-                            # 在超时清单中，不再进行处理，继续获取下一个
-                            del self._task_overtime_list[_task_obj[0]]
-                            _task_obj = None
-                            continue
-                        else:
-                            # 不在超时清单中，登记任务状态，然后直接返回
-                            self._task_status[_task_obj[0]] = [datetime.now(), worker_id, _task_obj]  # 登记任务信息
-                            return _task_obj
-                except:
-                    # 有异常代表获取不到队列数据，清理掉超时处理清单，因为清单中的任务都已经处理完成
-                    self._task_overtime_list.clear()
-                    return None
+            self._rejected_task_count += 1
         finally:
             self._task_status_lock.release()
 
-    def _worker_fun(self):
+    def _drop_oldest_task(self):
         """
-        @fun 通用的任务获取及执行函数
-        @funName _worker_fun
+        @fun 丢弃队列中最早的待处理任务
+        @funName _drop_oldest_task
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 该函数为线程或进程执行函数，在应保持线程一直循环获取任务并执行
-        @funExcepiton:
-            异常类名 异常说明
+        @funDescription 被丢弃的任务通过exception_callback通知TaskRejectedError
 
-        @funParam {参数类型} 参数名 参数说明
+        """
+        try:
+            _task_obj = self._wait_task_queue.get(block=False)
+        except queue.Empty:
+            # 已被工作线程取走，直接返回重试放入
+            return
+        if _task_obj is None:
+            # 停止任务池时放入的唤醒标记，工作线程会通过停止标记退出，直接返回重试放入
+            return
+        self._del_task_status(_task_obj.task_id)
+        self._add_rejected_count()
+        try:
+            raise TaskRejectedError('task dropped by newer task: task queue is full')
+        except TaskRejectedError:
+            self._call_exception_callback(_task_obj, sys.exc_info(), traceback.format_exc(), block=False)
 
-        @funReturn {返回值类型} 返回值说明
+    def _run_task_in_caller(self, task_obj):
+        """
+        @fun 在调用方线程执行任务（CallerRuns策略）
+        @funName _run_task_in_caller
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 执行结果及异常与工作线程一样通过callback、exception_callback通知
 
-        @funExample {代码格式} 示例名:
-            函数使用参考示例
+        @funParam {StructParallelTask} task_obj 任务对象
 
         """
-        _worker_id = uuid.uuid1()
-        _worker_obj = None
-        if self._parallel_type == EnumParallelType.Threading:
-            _worker_obj = threading.current_thread()
-        # 将worker信息放入实例队列
-        self._generate_workers[_worker_id] == _worker_obj
-        self._free_workers.append(_worker_id)
-        _last_work_time = datetime.now()  # 上一次工作的时间
-        # 循环进行线程处理
         try:
-            while True:
-                self._free_workers.remove(_worker_id)  # 先认为要进入工作，标记线程在工作
-                try:
-                    if self._stop_flag:
-                        # 判断是否结束线程池，结束线程
-                        break
-                    if self._pause_flag:
-                        # 判断是否暂停线程池，不抓取任务处理
-                        continue
+            _res = task_obj.target(*task_obj.args, **task_obj.kwargs)
+        except:
+            self._call_exception_callback(task_obj, sys.exc_info(), traceback.format_exc())
+        else:
+            self._call_callback(task_obj, _res)
 
-                    # 从队列中获取任务
-                    _task_obj = self._get_task_from_queue(worker_id=_worker_id)
-                    if _task_obj is None:
-                        # 获取不到任务，检查是否满足释放线程的时间条件
-                        if (datetime.now() - _last_work_time).seconds > self._free_task_keep_time:
-                            # 超过释放时间
-                            break
-                        else:
-                            # 进入下一个循环
-                            continue
+    @staticmethod
+    def _call_callback(task_obj, res):
+        """
+        @fun 执行任务的结果回调函数
+        @funName _call_callback
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 回调函数的异常将被忽略；任务关联了结果通道时同时将结果放入通道
 
-                    # 执行函数
-                    try:
-                        _res = _task_obj[1](*_task_obj[2], **_task_obj[3])
-                        if _task_obj[5] is not None:
-                            # 处理callback
-                            try:
-                                # 参数顺序：res, args, kwargs, name
-                                _task_obj[5](
-                                    _res,
-                                    _task_obj[2],
-                                    _task_obj[3],
-                                    _task_obj[4]
-                                )
-                            except:
-                                pass
-                    except:
-                        # 执行出现异常，处理exception_callback
-                        if _task_obj[6] is not None:
-                            try:
-                                # 参数顺序：error, trace_str, args, kwargs, name
-                                _task_obj[6](
-                                    sys.exc_info(),
-                                    traceback.format_exc(),
-                                    _task_obj[2],
-                                    _task_obj[3],
-                                    _task_obj[4]
-                                )
-                            except:
-                                pass
-                    finally:
-                        # 处理完成，从队列中删除状态记录，代表已完成
-                        self._del_task_status(_task_obj[0])
-                        _last_work_time = datetime.now()  # 登记上一次工作的时间
-                finally:
-                    self._free_workers.append(_worker_id)  # 完成处理，标记为空闲状态
-                    if self._task_sleep_time > 0:
-                        time.sleep(self._task_sleep_time)  # 休眠，准备下一次处理
-        finally:
-            # 关闭线程，将自己从队列中删除
-            self._free_workers.remove(_worker_id)
-            del self._generate_workers[_worker_id]
+        @funParam {StructParallelTask} task_obj 任务对象
+        @funParam {object} res 任务的返回值
 
-    def _overtime_deamon_fun(self):
         """
-        @fun 监测是否存在任务超时的处理线程
-        @funName _overtime_deamon_fun
+        if task_obj.callback is not None:
+            try:
+                # 参数顺序：res, args, kwargs, name
+                task_obj.callback(res, task_obj.args, task_obj.kwargs, task_obj.name)
+            except:
+                pass
+        if task_obj.result_channel is not None:
+            task_obj.result_channel.put_result(StructParallelResult(
+                task_obj.task_id, task_obj.name, task_obj.args, task_obj.kwargs, True, result=res
+            ))
+
+    @staticmethod
+    def _call_exception_callback(task_obj, error, trace_str, block=True):
+        """
+        @fun 执行任务的异常回调函数
+        @funName _call_exception_callback
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
+        @funDescription 回调函数的异常将被忽略；任务关联了结果通道时同时将异常结果放入通道
+
+        @funParam {StructParallelTask} task_obj 任务对象
+        @funParam {tuple} error 发生异常时的sys.exc_info()三元组对象
+        @funParam {string} trace_str 错误追踪堆栈日志
+        @funParam {bool} block 结果通道已满时是否阻塞等待，取消、丢弃及超时的通知为False（不受通道最大长度限制），
+            避免停止任务池、放入任务及超时监护被通道消费方阻塞
 
         """
-        while True:
+        if task_obj.exception_callback is not None:
             try:
-                _task_id_list = copy.deepcopy(self._task_status.keys())  # 通过复制一份清单处理，避免长期锁对象
-                for _task_id in _task_id_list:
-                    # 锁住状态清单获取信息
-                    _start_time = None
-                    _work_id = None
-                    _task_overtime = None
-                    _task_obj = None
-                    self._task_status_lock.acquire()
-                    try:
-                        if _task_id not in self._task_status.keys():
-                            # 已经处理完成或被清除掉，继续处理下一个
-                            continue
-                        _start_time = self._task_status[_task_id][0]
-                        _task_overtime = self._task_status[_task_id][8]
-                        _task_obj = self._task_status[_task_id]
-                    finally:
-                        self._task_status_lock.release()
-
-                    # 判断是否超时
-                    if _task_overtime == 0:
-                        _task_overtime = self._task_overtime
-                    elif self._task_overtime > 0 and self._task_overtime < _task_overtime:
-                        _task_overtime = self._task_overtime
-                    if _task_overtime > 0 and (datetime.now() - _start_time).seconds > _task_overtime:
-                        # 该任务超时了，强制结束任务，并启动一条新的任务线程
-                        self._generate_workers()
+                # 参数顺序：error, trace_str, args, kwargs, name
+                task_obj.exception_callback(error, trace_str, task_obj.args, task_obj.kwargs, task_obj.name)
+            except:
+                pass
+        if task_obj.result_channel is not None:
+            task_obj.result_channel.put_result(StructParallelResult(
+                task_obj.task_id, task_obj.name, task_obj.args, task_obj.kwargs, False, error=error, trace_str=trace_str
+            ), block=block)
 
-                        # 强制删除工作线程
-                        self._kill_worker(worker_id=_work_id, task_id=_task_obj[0])
+    def _get_task_from_queue(self, worker_id):
+        """
+        @fun 从队列中获取任务
+        @funName _get_task_from_queue
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 阻塞等待队列中的任务，最长等待空闲检查间隔时间；
+            任务池暂停时已取出的任务等待恢复后再执行，任务池停止时取消该任务
 
+        @funParam {uuid} worker_id 任务处理线程id
 
+        @funReturn {object} 返回队列中的对象，如果获取不到返回None
 
+        """
+        if self._parallel_type in (EnumParallelType.Threading, EnumParallelType.RemoteProcessing):
+            # 线程模式（远程模式由本地线程分发）的队列获取
+            _wait_time = self._get_idle_wait_time()
+            while True:
+                try:
+                    _task_obj = self._wait_task_queue.get(block=True, timeout=_wait_time)
+                except queue.Empty:
+                    # 获取不到队列数据
+                    return None
+                if _task_obj is None:
+                    # 停止任务池时放入的唤醒标记
+                    return None
 
-                    _start_time = self._task_status[_work_id][0]
-                    _task_obj = self._task_status[_work_id][1]  # 先获取任务信息
+                while self._pause_flag and not self._stop_flag:
+                    # 暂停状态，等待恢复后再执行
+                    self._resume_event.wait(_wait_time)
+                if self._stop_flag:
+                    self._cancel_task(_task_obj)
+                    return None
 
-                    if _task_obj[8] > 0 and _task_obj[8] < _task_overtime:
-                        _task_overtime = _task_obj[8]
-                    if _task_overtime > 0 and _start_time is not None and (datetime.now() - _start_time).seconds > _task_overtime:
-                        # 该任务超时了，强制结束任务，并启动一条新的任务线程
-                        self._generate_workers()
-                        # 强制删除工作线程
-                        self._kill_worker(worker_id=_work_id, task_id=_task_obj[0])
+                self._task_status_lock.acquire()
+                try:
+                    if _task_obj.task_id not in self._task_status.keys():
+                        # 已被取消，继续获取下一个
+                        continue
+                    # 登记任务开始执行的时间和执行的线程，然后直接返回
+                    _task_obj.start_time = time.monotonic_ns()
+                    _task_obj.worker_id = worker_id
+                    self._running_task_count += 1
+                    return _task_obj
+                finally:
+                    self._task_status_lock.release()
 
-                        # 任务向外反馈超时异常
+    def _get_idle_wait_time(self):
+        """
+        @fun 获取空闲工作线程每次等待任务的最长时间
+        @funName _get_idle_wait_time
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
 
-            except:
-                pass
-            # 继续等待下一次处理，休眠一段时间
-            time.sleep(self._overtime_deamon_sleep_time)
+        @funReturn {float} 等待时间，单位为秒
 
-    #############################
-    # 公共函数
-    #############################
+        """
+        if self._task_sleep_time > 0:
+            return self._task_sleep_time
+        return self._free_task_keep_time
 
-    @staticmethod
-    def stop_thread(thread_ident, exctype):
+    def _cancel_task(self, task_obj):
         """
-        @fun 结束指定线程
-        @funName stop_thread
+        @fun 取消未执行的任务
+        @funName _cancel_task
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
-        @funExcepiton:
-            异常类名 异常说明
+        @funDescription 删除任务状态，并通过exception_callback通知TaskPoolStopedError
 
-        @funParam {int} thread_ident 线程的线程标识ident，例如t.ident
-        @funParam {class} exctype 异常的类名，例如SystemExit
+        @funParam {StructParallelTask} task_obj 任务对象
 
         """
+        self._task_status_lock.acquire()
         try:
-            ParallelTaskPool._async_thread_raise(thread_ident, exctype)
-        except:
-            pass
+            if task_obj.task_id not in self._task_status.keys():
+                # 已处理过，无需通知
+                return
+            self._del_task_status(task_obj.task_id)
+        finally:
+            self._task_status_lock.release()
+        try:
+            raise TaskPoolStopedError('task cancelled: task pool has stoped!')
+        except TaskPoolStopedError:
+            self._call_exception_callback(task_obj, sys.exc_info(), traceback.format_exc(), block=False)
 
-    def __init__(self, parallel_type=EnumParallelType.Threading, pool_size=5, max_task_queue_size=0,
-                 free_task_keep_time=5, task_sleep_time=0.5, task_overtime=0, overtime_deamon_sleep_time=5):
+    def _cancel_wait_tasks(self):
         """
-        @fun 构造函数
-        @funName __init__
+        @fun 取消队列中所有待处理的任务，并唤醒等待任务的工作线程
+        @funName _cancel_wait_tasks
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
-        @funExcepiton:
-            UnsupportError 当parallel_type类型不支持的时候抛出该异常
 
-        @funParam {EnumParallelType} parallel_type 任务池的任务类别
-        @funParam {int} pool_size 任务池大小（即允许的并发数），必须为>0的整数
-        @funParam {int} max_task_queue_size 任务缓存队列的最大数量（等待处理的任务数），0代表无限制
-        @funParam {float} free_task_keep_time 空闲任务保持时长（即长期空闲的任务将被删除），单位为秒
-        @funParam {float} task_sleep_time 空闲任务的休眠时长（获取任务之间的间隔），单位为秒，0代表不休眠
-        @funParam {float} task_overtime 任务执行的超时时间，如果发现超时则强制结束线程处理，并抛出异常:
-            单位为秒，0代表不监测超时
-        @funParam {float} overtime_deamon_sleep_time 任务执行超时监护进程每次检查休眠时间，单位为秒
+        """
+        while True:
+            try:
+                _task_obj = self._wait_task_queue.get(block=False)
+            except queue.Empty:
+                break
+            if _task_obj is not None:
+                self._cancel_task(_task_obj)
+
+        # 每个工作线程放入一个唤醒标记
+        for _i in range(len(self._generate_workers)):
+            try:
+                self._wait_task_queue.put(None, block=False)
+            except queue.Full:
+                break
 
-        @funReturn {返回值类型} 返回值说明
+    def _worker_fun(self, worker_id, worker_no=0):
+        """
+        @fun 通用的任务获取及执行函数
+        @funName _worker_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 该函数为线程或进程执行函数，在应保持线程一直循环获取任务并执行；
+            启动时先执行工作线程初始化，初始化失败将停止任务池
 
-        @funExample {代码格式} 示例名:
-            函数使用参考示例
-            https://www.cnblogs.com/hjc4025/p/6950157.html
+        @funParam {uuid} worker_id 工作线程id，线程信息已在创建时登记到实例队列
+        @funParam {int} worker_no 工作线程序号，用于匹配cpu_affinity
 
         """
-        self._parallel_type = parallel_type
-        self._pool_size = pool_size
-        self._max_task_queue_size = max_task_queue_size
-        self._free_task_keep_time = free_task_keep_time
-        self._task_sleep_time = task_sleep_time
-        self._task_overtime = task_overtime
-        if task_overtime is None or task_overtime < 0:
-            self._task_overtime = 0
-        self._overtime_deamon_sleep_time = overtime_deamon_sleep_time
-        self._stop_flag = False
+        _worker_id = worker_id
+        _last_work_time = time.monotonic()  # 上一次工作的时间
+        # 循环进行线程处理
+        try:
+            if self._initializer is not None or self._cpu_affinity:
+                try:
+                    ParallelTaskPool.init_worker(
+                        initializer=self._initializer, initargs=self._initargs,
+                        cpus=ParallelTaskPool._get_affinity_cpus(self._cpu_affinity, worker_no)
+                    )
+                except:
+                    # 初始化失败，停止任务池（取消所有待处理任务）
+                    self._worker_init_error = (sys.exc_info(), traceback.format_exc())
+                    self.stop_task_pool(wait_finish=False)
+                    return
 
-        # 初始化队列
-        if parallel_type == EnumParallelType.Threading:
-            # 线程，用普通队列就好
-            if max_task_queue_size == 0:
-                self._wait_task_queue = queue.Queue()
-            else:
-                self._wait_task_queue = queue.Queue(maxsize=max_task_queue_size)
-        else:
-            # 不支持的类型，抛出异常
-            raise UnsupportError('unsuport parallel_type: EnumParallelType.%s' % str(EnumParallelType.value))
+            while True:
+                if self._stop_flag:
+                    # 判断是否结束线程池，结束线程
+                    break
+                if self._pause_flag:
+                    # 判断是否暂停线程池，等待恢复后再抓取任务处理
+                    self._resume_event.wait(self._get_idle_wait_time())
+                    continue
+                if (self._parallel_type == EnumParallelType.RemoteProcessing
+                        and not self._connect_remote_node(_worker_id)):
+                    # 远程节点不可用，不抓取任务处理，等待节点恢复
+                    self._stop_event.wait(self._heartbeat_interval)
+                    continue
 
-        # 启动超时任务执行监控进程
-        _overtime_deamon = threading.Thread(target=self._overtime_deamon_fun)
-        _overtime_deamon.setDaemon(True)  # 线程结束自动结束
-        _overtime_deamon.start()  # 启动线程
+                # 从队列中获取任务
+                _task_obj = self._get_task_from_queue(worker_id=_worker_id)
+                if _task_obj is None:
+                    # 获取不到任务，检查是否满足释放线程的时间条件（远程节点的分发线程不释放）
+                    if (self._parallel_type == EnumParallelType.Threading
+                            and time.monotonic() - _last_work_time > self._free_task_keep_time):
+                        # 超过释放时间，在锁内再次确认队列为空后才将自己移出清单，与put_task的创建判断互斥，
+                        # 避免刚放入的任务因仍将本线程计为空闲线程而没有线程处理
+                        self._task_status_lock.acquire()
+                        try:
+                            if self._wait_task_queue.qsize() == 0:
+                                try:
+                                    self._free_workers.remove(_worker_id)
+                                except ValueError:
+                                    pass
+                                self._generate_workers.pop(_worker_id, None)
+                                break
+                        finally:
+                            self._task_status_lock.release()
+                    # 进入下一个循环
+                    continue
 
-    def put_task(self, target=None, name=None, args=(), kwargs=None, callback=None, exception_callback=None, wait_finish=False, task_overtime=0):
+                # 执行函数
+                _is_requeue = False
+                try:
+                    self._free_workers.remove(_worker_id)  # 标记线程在工作
+                    _res = self._call_task(_worker_id, _task_obj)
+                    # 处理callback
+                    self._call_callback(_task_obj, _res)
+                except RemoteNodeLostError:
+                    # 远程节点失联，任务重新放回队列由其他节点执行
+                    _is_requeue = True
+                    self._requeue_task(_task_obj)
+                except:
+                    if _worker_id not in self._generate_workers.keys():
+                        # 任务已超时被强制结束，超时异常已由监护线程通知，直接结束线程
+                        break
+                    # 执行出现异常，处理exception_callback
+                    self._call_exception_callback(_task_obj, sys.exc_info(), traceback.format_exc())
+                finally:
+                    # 处理完成，从队列中删除状态记录，代表已完成
+                    if not _is_requeue:
+                        self._del_task_status(_task_obj.task_id)
+                    _last_work_time = time.monotonic()  # 登记上一次工作的时间
+                    if _worker_id in self._generate_workers.keys():
+                        self._free_workers.append(_worker_id)  # 完成处理，标记为空闲状态
+        finally:
+            # 关闭线程，将自己从队列中删除（超时被强制删除的情况已不在队列中）
+            try:
+                self._free_workers.remove(_worker_id)
+            except ValueError:
+                pass
+            self._generate_workers.pop(_worker_id, None)
+            if self._parallel_type == EnumParallelType.RemoteProcessing:
+                self._close_remote_connection(_worker_id)
+
+    def _call_task(self, worker_id, task_obj):
+        """
+        @fun 执行任务函数
+        @funName _call_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 线程模式直接执行，远程模式将任务发送到工作线程对应的远程节点执行
+        @funExcepiton:
+            RemoteNodeLostError 远程节点失联时抛出该异常，任务应重新放回队列
+
+        @funParam {uuid} worker_id 工作线程id
+        @funParam {StructParallelTask} task_obj 任务对象
+
+        @funReturn {object} 任务函数的返回值
+
+        """
+        if self._parallel_type != EnumParallelType.RemoteProcessing:
+            return task_obj.target(*task_obj.args, **task_obj.kwargs)
+
+        # 先完成序列化，任务无法序列化属于任务自身的异常
+        _data = pickle.dumps(('task', task_obj.target, task_obj.args, task_obj.kwargs))
+        _node = self._remote_worker_nodes[worker_id]
+        _net_info = self._remote_connections.get(worker_id, None)
+        try:
+            if _net_info is None:
+                raise RemoteNodeLostError('remote node is not connected: %s' % str(_node))
+            ParallelRemoteWorker.send_frame(_net_info.socket, _data)
+            while True:
+                try:
+                    _msg = pickle.loads(ParallelRemoteWorker.recv_frame(_net_info.socket, allow_timeout=True))
+                    break
+                except socket.timeout:
+                    # 等待结果过程中检查节点心跳
+                    if not self._is_remote_node_alive(_node):
+                        raise RemoteNodeLostError('remote node heartbeat lost: %s' % str(_node))
+        except (OSError, EOFError):
+            self._close_remote_connection(worker_id)
+            raise RemoteNodeLostError('remote node connection lost: %s' % str(_node))
+
+        # 处理执行结果，格式为('result', is_success, res/(error, trace_str))
+        if _msg[1]:
+            return _msg[2]
+        _error = _msg[2][0]
+        _error.remote_trace_str = _msg[2][1]
+        raise _error
+
+    def _requeue_task(self, task_obj):
+        """
+        @fun 将已取出的任务重新放回待处理队列
+        @funName _requeue_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 清除任务的开始执行信息后放回待处理队列头部，不受max_task_queue_size限制，
+            避免待处理队列已满时工作线程阻塞导致没有线程处理队列中的任务；放回时唤醒等待中的工作线程
+
+        @funParam {StructParallelTask} task_obj 任务对象
+
+        """
+        self._task_status_lock.acquire()
+        try:
+            if task_obj.task_id in self._task_status.keys():
+                if task_obj.start_time is not None:
+                    self._running_task_count -= 1
+                    self._task_status_cond.notify_all()
+                task_obj.start_time = None
+                task_obj.worker_id = None
+        finally:
+            self._task_status_lock.release()
+        self._wait_task_queue.put_front(task_obj)
+
+    def _is_remote_node_alive(self, remote_node):
+        """
+        @fun 根据心跳判断远程节点是否存活
+        @funName _is_remote_node_alive
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {(string, int)} remote_node 远程节点(ip, port)
+
+        @funReturn {bool} 最近一次心跳在心跳超时时间内返回True
+
+        """
+        return time.monotonic() - self._remote_node_heartbeat[remote_node] <= self._heartbeat_overtime
+
+    def _connect_remote_node(self, worker_id):
+        """
+        @fun 检查并建立工作线程与远程节点的连接
+        @funName _connect_remote_node
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 节点心跳超时的情况下不建立连接
+
+        @funParam {uuid} worker_id 工作线程id
+
+        @funReturn {bool} 连接是否可用
+
+        """
+        _node = self._remote_worker_nodes[worker_id]
+        if not self._is_remote_node_alive(_node):
+            self._close_remote_connection(worker_id)
+            return False
+        if self._remote_connections.get(worker_id, None) is not None:
+            return True
+
+        _connect_result = TcpIpService.connect_server(self._get_remote_connect_para(_node))
+        if _connect_result.code != 0:
+            return False
+        self._remote_connections[worker_id] = _connect_result.net_info
+        return True
+
+    def _close_remote_connection(self, worker_id):
+        """
+        @fun 关闭工作线程与远程节点的连接
+        @funName _close_remote_connection
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {uuid} worker_id 工作线程id
+
+        """
+        _net_info = self._remote_connections.pop(worker_id, None)
+        if _net_info is not None:
+            TcpIpService.close_connect(_net_info)
+
+    def _get_remote_connect_para(self, remote_node):
+        """
+        @fun 获取连接远程节点的参数
+        @funName _get_remote_connect_para
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 接收超时时间为心跳间隔，便于等待结果期间检查节点心跳
+
+        @funParam {(string, int)} remote_node 远程节点(ip, port)
+
+        @funReturn {object} TcpIpService的连接参数
+
+        """
+        _connect_para = TcpIpService.default_tcpip_opts()
+        _connect_para.host_name = remote_node[0]
+        _connect_para.port = remote_node[1]
+        _connect_para.recv_timeout = self._heartbeat_interval * 1000
+        return _connect_para
+
+    def _remote_heartbeat_fun(self, remote_node):
+        """
+        @fun 远程节点心跳检查线程函数
+        @funName _remote_heartbeat_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 通过独立的连接定时向远程节点发送ping，收到pong则更新节点的心跳时间
+
+        @funParam {(string, int)} remote_node 远程节点(ip, port)
+
+        """
+        _net_info = None
+        _ping_data = pickle.dumps(('ping',))
+        while not self._stop_flag:
+            try:
+                if _net_info is None:
+                    _connect_result = TcpIpService.connect_server(self._get_remote_connect_para(remote_node))
+                    if _connect_result.code == 0:
+                        _net_info = _connect_result.net_info
+                        TcpIpService.set_timeout(_net_info, recv_timeout=self._heartbeat_overtime * 1000)
+                if _net_info is not None:
+                    ParallelRemoteWorker.send_frame(_net_info.socket, _ping_data)
+                    if pickle.loads(ParallelRemoteWorker.recv_frame(_net_info.socket, allow_timeout=True))[0] == 'pong':
+                        self._remote_node_heartbeat[remote_node] = time.monotonic()
+            except:
+                # 连接出现问题，关闭连接下次重连
+                if _net_info is not None:
+                    TcpIpService.close_connect(_net_info)
+                    _net_info = None
+            self._stop_event.wait(self._heartbeat_interval)
+
+        if _net_info is not None:
+            TcpIpService.close_connect(_net_info)
+
+    def _overtime_deamon_fun(self):
+        """
+        @fun 监测是否存在任务超时的处理线程
+        @funName _overtime_deamon_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        """
+        while not self._stop_flag:
+            try:
+                self._task_status_lock.acquire()
+                try:
+                    _task_id_list = list(self._task_status.keys())  # 通过复制一份清单处理，避免长期锁对象
+                finally:
+                    self._task_status_lock.release()
+
+                for _task_id in _task_id_list:
+                    # 锁住状态清单获取信息
+                    self._task_status_lock.acquire()
+                    try:
+                        if _task_id not in self._task_status.keys():
+                            # 已经处理完成或被清除掉，继续处理下一个
+                            continue
+                        _task_obj = self._task_status[_task_id]
+                        _start_time = _task_obj.start_time
+                        _work_id = _task_obj.worker_id
+                    finally:
+                        self._task_status_lock.release()
+
+                    if _start_time is None or self._parallel_type != EnumParallelType.Threading:
+                        # 还未开始执行，或远程模式（无法强制中止远程节点上的任务）
+                        continue
+
+                    # 判断是否超时，任务超时时间和任务池超时时间取较小的值
+                    _task_overtime = _task_obj.task_overtime
+                    if _task_overtime == 0:
+                        _task_overtime = self._task_overtime
+                    elif 0 < self._task_overtime < _task_overtime:
+                        _task_overtime = self._task_overtime
+                    if _task_overtime > 0 and (time.monotonic_ns() - _start_time) > _task_overtime * 1000000000:
+                        # 该任务超时了，强制删除工作线程，并启动一条新的任务线程
+                        self._kill_worker(worker_id=_work_id, task_id=_task_id)
+                        self._del_task_status(_task_id)
+                        self._generate_worker()
+
+                        # 任务向外反馈超时异常
+                        try:
+                            raise OvertimeError('task overtime: %s' % str(_task_overtime))
+                        except OvertimeError:
+                            self._call_exception_callback(_task_obj, sys.exc_info(), traceback.format_exc(),
+                                                          block=False)
+            except:
+                pass
+            # 继续等待下一次处理，休眠一段时间（任务池停止时立即唤醒）
+            self._stop_event.wait(self._overtime_deamon_sleep_time)
+
+    #############################
+    # 公共函数
+    #############################
+
+    @staticmethod
+    def stop_thread(thread_ident, exctype):
+        """
+        @fun 结束指定线程
+        @funName stop_thread
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+        @funExcepiton:
+            异常类名 异常说明
+
+        @funParam {int} thread_ident 线程的线程标识ident，例如t.ident
+        @funParam {class} exctype 异常的类名，例如SystemExit
+
+        """
+        try:
+            ParallelTaskPool._async_thread_raise(thread_ident, exctype)
+        except:
+            pass
+
+    @staticmethod
+    def init_worker(initializer=None, initargs=(), cpus=None):
+        """
+        @fun 初始化当前工作线程（进程）
+        @funName init_worker
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 将当前线程绑定到指定CPU（仅Linux支持，其他平台忽略），并执行初始化函数，
+            初始化函数的返回值作为工作线程的状态数据，任务中可以通过get_worker_state获取
+
+        @funParam {func} initializer 初始化函数，None代表不执行
+        @funParam {tuple} initargs 初始化函数的参数
+        @funParam {set} cpus 要绑定的CPU编号集合，None代表不绑定
+
+        """
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            # Linux下pid为0代表当前线程
+            os.sched_setaffinity(0, cpus)
+        ParallelTaskPool._worker_local.state = None if initializer is None else initializer(*initargs)
+
+    @staticmethod
+    def get_worker_state():
+        """
+        @fun 获取当前工作线程（进程）的状态数据
+        @funName get_worker_state
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 在任务函数中调用，获取执行该任务的工作线程初始化函数的返回值
+
+        @funReturn {object} 初始化函数的返回值，未初始化返回None
+
+        """
+        return getattr(ParallelTaskPool._worker_local, 'state', None)
+
+    @staticmethod
+    def _get_affinity_cpus(cpu_affinity, worker_no):
+        """
+        @fun 获取工作线程要绑定的CPU
+        @funName _get_affinity_cpus
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 工作线程按序号循环使用cpu_affinity中的CPU集合
+
+        @funParam {list} cpu_affinity 工作线程绑定的CPU清单，例如[{0}, {1}, {2, 3}]
+        @funParam {int} worker_no 工作线程序号
+
+        @funReturn {set} CPU编号集合，不绑定返回None
+
+        """
+        if not cpu_affinity:
+            return None
+        return set(cpu_affinity[worker_no % len(cpu_affinity)])
+
+    def __init__(self, parallel_type=EnumParallelType.Threading, pool_size=5, max_task_queue_size=0,
+                 free_task_keep_time=5, task_sleep_time=0.5, task_overtime=0, overtime_deamon_sleep_time=5,
+                 remote_workers=None, heartbeat_interval=1, heartbeat_overtime=5,
+                 reject_policy=EnumTaskRejectPolicy.Block, reject_block_timeout=None,
+                 initializer=None, initargs=(), cpu_affinity=None):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+        @funExcepiton:
+            UnsupportError 当parallel_type类型不支持的时候抛出该异常
+
+        @funParam {EnumParallelType} parallel_type 任务池的任务类别
+        @funParam {int} pool_size 任务池大小（即允许的并发数），必须为>0的整数
+        @funParam {int} max_task_queue_size 任务缓存队列的最大数量（等待处理的任务数），0代表无限制
+        @funParam {float} free_task_keep_time 空闲任务保持时长（即长期空闲的任务将被删除），单位为秒
+        @funParam {float} task_sleep_time 空闲工作线程每次等待新任务的最长时间（即检查停止、空闲释放的间隔）:
+            有新任务时工作线程立即被唤醒，单位为秒，0代表按free_task_keep_time等待
+        @funParam {float} task_overtime 任务执行的超时时间，如果发现超时则强制结束线程处理，并抛出异常:
+            单位为秒，0代表不监测超时
+        @funParam {float} overtime_deamon_sleep_time 任务执行超时监护进程每次检查休眠时间，单位为秒
+        @funParam {list} remote_workers 远程模式的远程节点清单[(ip, port), ...]，节点通过ParallelRemoteWorker启动:
+            每个节点对应一个分发线程（同一节点可以重复列出以提高并发），此时pool_size参数无效；
+            任务函数、参数及返回值都通过pickle传递，任务函数须在节点上可导入；远程模式不支持task_overtime
+        @funParam {float} heartbeat_interval 远程节点心跳检查的间隔时间，单位为秒
+        @funParam {float} heartbeat_overtime 远程节点心跳超时时间，超过该时间没有心跳的节点视为失联，
+            节点上正在执行的任务将重新放回队列，单位为秒
+        @funParam {EnumTaskRejectPolicy} reject_policy 任务队列已满（设置了max_task_queue_size）时的拒绝策略
+        @funParam {float} reject_block_timeout Block策略等待队列空间的超时时间，单位为秒，None代表一直等待
+        @funParam {func} initializer 每个工作线程启动时执行的初始化函数（例如加载模型、建立数据库连接）:
+            返回值作为工作线程的状态数据，任务中通过ParallelTaskPool.get_worker_state()获取；
+            初始化函数抛出异常时任务池将被停止，异常信息通过worker_init_error获取
+        @funParam {tuple} initargs 初始化函数的参数
+        @funParam {list} cpu_affinity 工作线程绑定的CPU清单，例如[{0}, {1}, {2, 3}]，工作线程按创建顺序循环使用:
+            通过os.sched_setaffinity实现，仅Linux支持，其他平台忽略
+
+        @funReturn {返回值类型} 返回值说明
+
+        @funExample {代码格式} 示例名:
+            函数使用参考示例
+            https://www.cnblogs.com/hjc4025/p/6950157.html
+
+        """
+        self._parallel_type = parallel_type
+        self._pool_size = pool_size
+        self._max_task_queue_size = max_task_queue_size
+        self._reject_policy = reject_policy
+        self._reject_block_timeout = reject_block_timeout
+        self._rejected_task_count = 0
+        self._free_task_keep_time = free_task_keep_time
+        self._task_sleep_time = task_sleep_time
+        self._task_overtime = task_overtime
+        if task_overtime is None or task_overtime < 0:
+            self._task_overtime = 0
+        self._overtime_deamon_sleep_time = overtime_deamon_sleep_time
+        self._wait_stop_flag = False
+        self._stop_flag = False
+        self._pause_flag = False
+        self._free_workers = list()
+        self._generate_workers = dict()
+        self._task_status = dict()
+        self._task_status_lock = threading.RLock()
+        self._task_id_seq = itertools.count(1)
+        self._worker_no_seq = itertools.count()
+        self._initializer = initializer
+        self._initargs = initargs
+        self._cpu_affinity = cpu_affinity
+        self._worker_init_error = None
+        self._task_status_cond = threading.Condition(self._task_status_lock)
+        self._running_task_count = 0
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_overtime = heartbeat_overtime
+        self._remote_worker_nodes = dict()  # 远程模式工作线程对应的节点，key为worker_id，value为(ip, port)
+        self._remote_connections = dict()  # 远程模式工作线程的连接，key为worker_id，value为TcpIpNetInfo
+        self._remote_node_heartbeat = dict()  # 远程节点最近一次心跳的时间（time.monotonic），key为(ip, port)
+
+        # 初始化队列
+        if parallel_type in (EnumParallelType.Threading, EnumParallelType.RemoteProcessing):
+            # 线程，用普通队列就好
+            if max_task_queue_size == 0 and parallel_type == EnumParallelType.Threading:
+                # 无长度限制时使用C实现的SimpleQueue，放入及获取的开销更小
+                self._wait_task_queue = queue.SimpleQueue()
+            else:
+                # 远程模式需支持将节点失联的任务放回队列头部
+                self._wait_task_queue = ParallelTaskQueue(maxsize=max_task_queue_size)
+        else:
+            # 不支持的类型，抛出异常
+            raise UnsupportError('unsuport parallel_type: EnumParallelType.%s' % str(parallel_type.value))
+
+        # 启动超时任务执行监控进程
+        _overtime_deamon = threading.Thread(target=self._overtime_deamon_fun)
+        _overtime_deamon.setDaemon(True)  # 线程结束自动结束
+        _overtime_deamon.start()  # 启动线程
+
+        if parallel_type == EnumParallelType.RemoteProcessing:
+            # 远程模式，每个节点启动一个分发线程，每个不同的节点启动一个心跳检查线程
+            _remote_workers = list() if remote_workers is None else [tuple(_node) for _node in remote_workers]
+            self._pool_size = len(_remote_workers)
+            for _node in _remote_workers:
+                if _node not in self._remote_node_heartbeat.keys():
+                    self._remote_node_heartbeat[_node] = time.monotonic()  # 启动时给予一个心跳周期的宽限
+                    _heartbeat_thread = threading.Thread(target=self._remote_heartbeat_fun, args=(_node,))
+                    _heartbeat_thread.setDaemon(True)
+                    _heartbeat_thread.start()
+                self._generate_worker(remote_node=_node)
+
+    @property
+    def worker_init_error(self):
+        """
+        @property {get} 工作线程初始化失败的异常信息(error, trace_str)，error为sys.exc_info()三元组，未失败为None
+        @propertyName worker_init_error
+
+        """
+        return self._worker_init_error
+
+    @property
+    def rejected_task_count(self):
+        """
+        @property {get} 因任务队列已满被拒绝的任务数（包括被丢弃的任务和由调用方执行的任务）
+        @propertyName rejected_task_count
+
+        """
+        return self._rejected_task_count
+
+    def put_task(self, target=None, name=None, args=(), kwargs=None, callback=None, exception_callback=None, wait_finish=False, task_overtime=0,
+                 result_channel=None):
+        """
+        @fun 将任务放入队列执行
+        @funName put_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+        @funExcepiton:
+            TaskPoolStopedError 当任务未完成但遇到了停止标志时抛出该异常
+            TaskRejectedError 当任务队列已满且按拒绝策略拒绝任务时抛出该异常
+            ResultChannelClosedError 当结果通道已关闭时抛出该异常
+
+        @funParam {func} target 目标函数
+        @funParam {string} name 线程名
+        @funParam {tuple} args 函数运行参数(顺序格式)
+        @funParam {dict} kwargs 函数运行参数(kv格式)
+        @funParam {func} callback 结果回调函数，函数定义为fun(res, args, kwargs, name)，无需返回值
+            res为并发任务的返回值，无返回值则为None
+            args、kwargs为函数的入参
+            name为任务名
+        @funParam {func} exception_callback 异常回调函数，函数定义为fun(error, trace_str, args, kwargs, name)，无需返回值
+            args、kwargs为函数的入参
+            name为任务名
+            error为Exception类，发生异常时的sys.exc_info()三元组对象(type, value, traceback):
+            trace_str 错误追踪堆栈日志，异常时的traceback.format_exc()
+        @funParam {bool} wait_finish 是否等待目标函数执行完成才返回
+        @funParam {float} task_overtime 任务执行的超时时间，如果发现超时则强制结束线程处理，并抛出异常:
+            单位为秒，0代表不监测超时
+        @funParam {ParallelResultChannel} result_channel 任务结果输出通道，任务完成（成功或异常）后将结果放入通道
+
+        @funReturn {int} 任务ID
+
+        """
+        if self._wait_stop_flag or self._stop_flag:
+            # 任务池已被停止，抛出异常
+            raise TaskPoolStopedError('task pool has stoped!')
+
+        # 将任务放到队列
+        _id = next(self._task_id_seq)  # itertools.count的next在GIL保护下是原子操作
+        if kwargs is None:
+            kwargs = dict()
+        _task_overtime = task_overtime
+        if task_overtime is None or task_overtime < 0:
+            _task_overtime = 0
+        _task_job = StructParallelTask(_id, target, args, kwargs, name, callback, exception_callback,
+                                       wait_finish, _task_overtime, result_channel=result_channel)
+        # 放入待处理清单
+        if result_channel is None:
+            self._put_task_to_queue(task_obj=_task_job)
+        else:
+            result_channel.attach_task()
+            try:
+                self._put_task_to_queue(task_obj=_task_job)
+            except:
+                # 任务被拒绝，不会有结果输出
+                result_channel.detach_task()
+                raise
+        self._task_status_lock.acquire()
+        try:
+            # 与空闲工作线程的退出判断互斥，避免任务放入后没有线程处理
+            if (len(self._generate_workers) < self._pool_size
+                    and len(self._free_workers) < self._wait_task_queue.qsize()):
+                # 空闲线程不足以处理等待中的任务，创建新线程
+                self._generate_worker()
+        finally:
+            self._task_status_lock.release()
+        if wait_finish:
+            # 需要等待任务完成，任务完成或任务池停止时会通知条件
+            self._task_status_cond.acquire()
+            try:
+                while _id in self._task_status.keys():
+                    if self._stop_flag:
+                        # 未完成但遇到线程池关闭的情况，抛出异常
+                        raise TaskPoolStopedError('task pool has stoped!')
+                    self._task_status_cond.wait()
+            finally:
+                self._task_status_cond.release()
+        return _id
+
+    def stop_task_pool(self, wait_finish=True, overtime=0):
+        """
+        @fun 停止线程池
+        @funName stop_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 先停止接收新任务，等待待处理及正在处理的任务完成（任务完成时通过条件通知，无需轮询），
+            然后停止任务池并取消剩余未执行的任务（通过exception_callback通知TaskPoolStopedError）；
+            超时后仍在执行的任务不会被中止，其回调函数仍会被执行；等待任务完成时如果任务池处于暂停状态，
+            会先恢复任务池处理，待停止的任务池不能再暂停
+
+        @funParam {bool} wait_finish 是否等待所有待处理任务执行完成才返回，为False时直接取消所有未执行的任务
+        @funParam {float} overtime 等待任务完成的超时时间，单位为秒，0代表一直等待
+
+        @funReturn {bool} 所有任务是否都在停止前执行完成
+
+        """
+        self._wait_stop_flag = True  # 标记任务池待停止，不再接收新的任务
+        _is_finished = True
+        if wait_finish:
+            if self._pause_flag:
+                # 暂停状态下待处理任务不会被执行，恢复处理后再等待
+                self.resume_task_pool()
+            _deadline = None if overtime is None or overtime <= 0 else time.monotonic() + overtime
+            self._task_status_cond.acquire()
+            try:
+                while len(self._task_status) > 0:
+                    if _deadline is None:
+                        self._task_status_cond.wait()
+                        continue
+                    _wait_time = _deadline - time.monotonic()
+                    if _wait_time <= 0:
+                        # 超时，剩余任务将被取消
+                        _is_finished = False
+                        break
+                    self._task_status_cond.wait(_wait_time)
+            finally:
+                self._task_status_cond.release()
+        else:
+            _is_finished = (len(self._task_status) == 0)
+
+        # 正式停止任务池，唤醒所有等待中的线程
+        self._task_status_cond.acquire()
+        try:
+            self._stop_flag = True
+            self._task_status_cond.notify_all()
+        finally:
+            self._task_status_cond.release()
+        self._stop_event.set()
+        self._resume_event.set()
+        self._cancel_wait_tasks()
+        return _is_finished
+
+    def pause_task_pool(self, wait_finish=True):
+        """
+        @fun 暂停线程池处理
+        @funName pause_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 暂停后工作线程不再开始执行新任务，通过resume_task_pool恢复；
+            任务池待停止（已调用stop_task_pool）时不做处理，避免等待任务完成的停止操作无法结束
+        @funExcepiton:
+            异常类名 异常说明
+
+        @funParam {bool} wait_finish 是否等待当前正在处理的任务执行完成才返回
+
+        """
+        if self._wait_stop_flag:
+            return
+        self._pause_flag = True
+        self._resume_event.clear()
+        if wait_finish:
+            self._task_status_cond.acquire()
+            try:
+                while self._running_task_count > 0 and not self._stop_flag:
+                    # 正在执行的任务完成时会通知条件
+                    self._task_status_cond.wait()
+            finally:
+                self._task_status_cond.release()
+
+    def resume_task_pool(self):
+        """
+        @fun 恢复已暂停的线程池处理
+        @funName resume_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        """
+        self._pause_flag = False
+        self._resume_event.set()
+
+
+class ParallelResultChannel(object):
+    """
+    @class 任务结果输出通道
+    @className ParallelResultChannel
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 按任务完成的顺序输出关联任务的结果（StructParallelResult），执行异常也作为结果输出；
+        通道设置了最大长度时，通道满后工作线程将阻塞等待，消费慢时会反压到任务池（任务队列满后按拒绝策略处理）；
+        任务被取消、丢弃或超时的结果不受最大长度限制，不会阻塞停止任务池等操作；
+        关闭通道后，关联任务的结果全部取完则迭代结束
+
+    @classExample {Python} 示例名:
+        _channel = ParallelResultChannel(maxsize=100)
+        for _i in range(1000):
+            _pool.put_task(target=my_fun, args=(_i,), result_channel=_channel)
+        _channel.close()
+        for _result in _channel:
+            if _result.is_success:
+                print(_result.result)
+
+        # 异步方式
+        async for _result in _channel:
+            ...
+
+    """
+
+    _async_wait_time = 0.5  # 异步迭代时线程池中每次阻塞获取结果的最长时间，单位为秒
+
+    def __init__(self, maxsize=0):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {int} maxsize 通道缓存结果的最大数量，0代表无限制
+
+        """
+        self._maxsize = maxsize
+        self._results = collections.deque()
+        self._cond = threading.Condition()
+        self._pending_count = 0  # 已关联但还未输出结果的任务数
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self.get()
+        except ResultChannelClosedError:
+            raise StopIteration
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # 在线程池中阻塞获取，不阻塞事件循环；每次最长等待_async_wait_time，迭代被取消时线程池的线程可以及时释放
+        _loop = asyncio.get_running_loop()
+        while True:
+            try:
+                _result = await _loop.run_in_executor(None, self._get_or_none, self._async_wait_time)
+                break
+            except queue.Empty:
+                continue
+        if _result is None:
+            raise StopAsyncIteration
+        return _result
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def pending_count(self):
+        """
+        @property {get} 已关联但还未输出结果的任务数
+        @propertyName pending_count
+
+        """
+        return self._pending_count
+
+    @property
+    def closed(self):
+        """
+        @property {get} 通道是否已关闭
+        @propertyName closed
+
+        """
+        return self._closed
+
+    def attach_task(self):
+        """
+        @fun 登记一个关联到通道的任务
+        @funName attach_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 由ParallelTaskPool.put_task调用
+        @funExcepiton:
+            ResultChannelClosedError 通道已关闭时抛出该异常
+
+        """
+        self._cond.acquire()
+        try:
+            if self._closed:
+                raise ResultChannelClosedError('result channel has closed!')
+            self._pending_count += 1
+        finally:
+            self._cond.release()
+
+    def detach_task(self):
+        """
+        @fun 取消一个关联到通道的任务（任务不会有结果输出）
+        @funName detach_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        """
+        self._cond.acquire()
+        try:
+            self._pending_count -= 1
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+
+    def put_result(self, result, block=True):
+        """
+        @fun 将任务结果放入通道
+        @funName put_result
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 通道已满时阻塞等待
+
+        @funParam {StructParallelResult} result 任务结果
+        @funParam {bool} block 通道已满时是否阻塞等待，为False时不受最大长度限制直接放入
+
+        """
+        self._cond.acquire()
+        try:
+            while block and 0 < self._maxsize <= len(self._results):
+                self._cond.wait()
+            self._results.append(result)
+            self._pending_count -= 1
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+
+    def get(self, block=True, timeout=None):
+        """
+        @fun 按完成顺序获取一个任务结果
+        @funName get
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+        @funExcepiton:
+            queue.Empty 不阻塞或等待超时仍没有结果时抛出该异常
+            ResultChannelClosedError 通道已关闭且所有结果都已取出时抛出该异常
+
+        @funParam {bool} block 是否阻塞等待结果
+        @funParam {float} timeout 阻塞等待的超时时间，单位为秒，None代表一直等待
+
+        @funReturn {StructParallelResult} 任务结果
+
+        """
+        _deadline = None if timeout is None else time.monotonic() + timeout
+        self._cond.acquire()
+        try:
+            while len(self._results) == 0:
+                if self._closed and self._pending_count <= 0:
+                    raise ResultChannelClosedError('result channel has closed!')
+                if not block:
+                    raise queue.Empty
+                if _deadline is None:
+                    self._cond.wait()
+                else:
+                    _wait_time = _deadline - time.monotonic()
+                    if _wait_time <= 0:
+                        raise queue.Empty
+                    self._cond.wait(_wait_time)
+            _result = self._results.popleft()
+            self._cond.notify_all()
+            return _result
+        finally:
+            self._cond.release()
+
+    def close(self):
+        """
+        @fun 关闭通道
+        @funName close
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 关闭后不能再关联新任务，已关联任务的结果仍会输出，全部取出后迭代结束
+
+        """
+        self._cond.acquire()
+        try:
+            self._closed = True
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+
+    def _get_or_none(self, timeout=None):
+        """
+        @fun 获取一个任务结果，通道关闭且结果全部取出时返回None
+        @funName _get_or_none
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 用于异步迭代，StopIteration不能通过Future传递
+        @funExcepiton:
+            queue.Empty 等待超时仍没有结果时抛出该异常
+
+        @funParam {float} timeout 阻塞等待的超时时间，单位为秒，None代表一直等待
+
+        @funReturn {StructParallelResult} 任务结果
+
+        """
+        try:
+            return self.get(timeout=timeout)
+        except ResultChannelClosedError:
+            return None
+
+
+class ParallelRemoteWorker(object):
+    """
+    @class 远程任务执行节点
+    @className ParallelRemoteWorker
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 基于TcpIpService的任务执行服务，供RemoteProcessing模式的ParallelTaskPool分发任务:
+        1、报文格式为4字节网络字节序的长度 + pickle序列化的数据
+        2、请求('ping',)返回('pong',)，用于心跳检查
+        3、请求('task', target, args, kwargs)返回('result', is_success, res/(error, trace_str))
+        注意：pickle反序列化可以执行任意代码，节点只能部署在可信网络中
+
+    @classExample {Python} 参考示例:
+        # 在节点机器上启动执行服务（阻塞）
+        ParallelRemoteWorker.run_worker_server(host_name='0.0.0.0', port=8090)
+
+        # 在分发端创建远程任务池
+        _pool = ParallelTaskPool(parallel_type=EnumParallelType.RemoteProcessing,
+                                 remote_workers=[('192.168.1.10', 8090), ('192.168.1.11', 8090)])
+        _pool.put_task(target=my_fun, args=(1, 2), callback=my_callback)
+
+    """
+
+    #############################
+    # 静态函数
+    #############################
+
+    @staticmethod
+    def send_frame(sock, data):
+        """
+        @fun 发送一个报文
+        @funName send_frame
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 报文前加上4字节的长度
+
+        @funParam {socket} sock 网络套接字
+        @funParam {bytes} data 报文数据
+
+        """
+        sock.sendall(struct.pack('!I', len(data)) + data)
+
+    @staticmethod
+    def recv_frame(sock, allow_timeout=False):
+        """
+        @fun 接收一个报文
+        @funName recv_frame
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 先获取4字节的长度，再获取指定长度的报文数据
+        @funExcepiton:
+            socket.timeout allow_timeout为True且报文还未开始接收就超时时抛出该异常
+            EOFError 连接已被对端关闭时抛出该异常
+
+        @funParam {socket} sock 网络套接字
+        @funParam {bool} allow_timeout 是否允许在报文开始接收前超时返回，报文已部分接收的情况会继续等待接收完整
+
+        @funReturn {bytes} 报文数据
+
+        """
+        _head = ParallelRemoteWorker._recv_bytes(sock, 4, allow_timeout=allow_timeout)
+        return ParallelRemoteWorker._recv_bytes(sock, struct.unpack('!I', _head)[0])
+
+    @staticmethod
+    def _recv_bytes(sock, size, allow_timeout=False):
+        """
+        @fun 从网络套接字接收指定长度的数据
+        @funName _recv_bytes
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        """
+        _buffer = bytearray()
+        while len(_buffer) < size:
+            try:
+                _data = sock.recv(size - len(_buffer))
+            except socket.timeout:
+                if allow_timeout and len(_buffer) == 0:
+                    raise
+                continue
+            if len(_data) == 0:
+                raise EOFError('connection closed by peer')
+            _buffer.extend(_data)
+        return bytes(_buffer)
+
+    @staticmethod
+    def run_worker_server(host_name='', port=8090, logger=None):
+        """
+        @fun 启动节点执行服务并阻塞等待
+        @funName run_worker_server
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 可直接作为独立进程的执行函数，服务停止后返回
+
+        @funParam {string} host_name 监听的主机名或IP地址
+        @funParam {int} port 监听端口
+        @funParam {object} logger 日志对象
+
+        """
+        _worker = ParallelRemoteWorker(host_name=host_name, port=port, logger=logger)
+        _worker.start()
+        while _worker.server_run_status != EnumNetServerRunStatus.Stop:
+            time.sleep(1)
+
+    #############################
+    # 构造函数
+    #############################
+
+    def __init__(self, host_name='', port=8090, logger=None, recv_timeout=500):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {string} host_name 监听的主机名或IP地址
+        @funParam {int} port 监听端口
+        @funParam {object} logger 日志对象
+        @funParam {int} recv_timeout 连接等待请求的超时时间（超时后检查服务状态），单位为毫秒
+
+        """
+        self._server_opts = TcpIpService.default_tcpip_opts()
+        self._server_opts.host_name = host_name
+        self._server_opts.port = port
+        self._server_opts.recv_timeout = recv_timeout
+        self._server_opts.accept_timeout = recv_timeout
+        self._server = TcpIpService(logger=logger, server_connect_deal_fun=self._server_connect_deal_fun,
+                                    self_tag='ParallelRemoteWorker')
+
+    #############################
+    # 属性
+    #############################
+
+    @property
+    def server_run_status(self):
+        """
+        @property {get} 服务运行状态(EnumNetServerRunStatus)
+        @propertyName server_run_status
+
+        """
+        return self._server.server_run_status
+
+    #############################
+    # 内部函数
+    #############################
+
+    def _server_connect_deal_fun(self, thread_id, server_opts, net_info, self_tag):
+        """
+        @fun 连接处理函数
+        @funName _server_connect_deal_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 循环获取请求并返回处理结果，直到连接关闭或服务停止
+
+        """
+        try:
+            while self._server.server_run_status == EnumNetServerRunStatus.Running:
+                try:
+                    _msg = pickle.loads(ParallelRemoteWorker.recv_frame(net_info.socket, allow_timeout=True))
+                except socket.timeout:
+                    continue
+                except (OSError, EOFError):
+                    break
+
+                if _msg[0] == 'ping':
+                    _resp = pickle.dumps(('pong',))
+                else:
+                    _resp = ParallelRemoteWorker._run_task(_msg[1], _msg[2], _msg[3])
+                ParallelRemoteWorker.send_frame(net_info.socket, _resp)
+        finally:
+            TcpIpService.close_connect(net_info)
+
+    @staticmethod
+    def _run_task(target, args, kwargs):
+        """
+        @fun 执行任务并返回序列化后的结果报文
+        @funName _run_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 异常对象或返回值无法序列化时，以异常的形式返回
+
+        @funReturn {bytes} 序列化后的结果报文
+
+        """
+        try:
+            return pickle.dumps(('result', True, target(*args, **kwargs)))
+        except:
+            _error = sys.exc_info()[1]
+            _trace_str = traceback.format_exc()
+        try:
+            return pickle.dumps(('result', False, (_error, _trace_str)))
+        except:
+            return pickle.dumps(('result', False, (RuntimeError(repr(_error)), _trace_str)))
+
+    #############################
+    # 公共函数
+    #############################
+
+    def start(self):
+        """
+        @fun 启动节点执行服务
+        @funName start
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 服务在独立线程中运行，函数直接返回
+
+        @funReturn {generic.CResult} 启动结果，result.code：0-成功
+
+        """
+        return self._server.start_server(self._server_opts)
+
+    def stop(self, is_wait=True):
+        """
+        @fun 停止节点执行服务
+        @funName stop
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {bool} is_wait 是否等待正在执行的任务完成
+
+        @funReturn {generic.CResult} 停止结果，result.code：0-成功
+
+        """
+        return self._server.stop_server(is_wait=is_wait)
+
+
+class ParallelTaskDAG(object):
+    """
+    @class 有依赖关系的任务图（DAG）执行器
+    @className ParallelTaskDAG
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 登记任务及任务间的依赖关系，通过ParallelTaskPool并行执行已满足依赖条件的任务:
+        1、上游任务的执行结果可通过upstream_para_name指定的参数传递给下游任务
+        2、任务执行失败时，所有下游任务不再执行（状态为UpstreamFailed），stop_on_failure为True时同时取消其他未执行任务
+        3、执行完成后可以获取关键路径（按实际执行耗时计算的最长依赖链）及其耗时
+
+    @classExample {Python} 参考示例:
+        _dag = ParallelTaskDAG(task_pool=ParallelTaskPool(pool_size=5))
+        _dag.add_task('extract', extract_fun)
+        _dag.add_task('transform', transform_fun, depends=['extract'])
+        _dag.add_task('load', load_fun, depends=['transform'])
+        _results = _dag.run()
+        # transform_fun的定义需要接收上游结果参数：def transform_fun(upstream_results=None)
+
+    """
+
+    #############################
+    # 构造函数
+    #############################
+
+    def __init__(self, task_pool=None, upstream_para_name='upstream_results', stop_on_failure=False):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {ParallelTaskPool} task_pool 执行任务的任务池，None代表执行时自动创建一个线程任务池，执行完成后关闭
+        @funParam {string} upstream_para_name 向下游任务传递上游结果的参数名，传入的值为字典，key为上游任务ID，
+            value为上游任务的返回值；None代表不传递上游结果
+        @funParam {bool} stop_on_failure 出现失败任务时是否取消所有未执行的任务
+
+        """
+        self._task_pool = task_pool
+        self._upstream_para_name = upstream_para_name
+        self._stop_on_failure = stop_on_failure
+        # 任务清单，key为任务ID，value为[target, args, kwargs, depends, task_overtime]，保持登记的顺序
+        self._tasks = dict()
+        self._downstreams = dict()  # 下游任务清单，key为任务ID，value为下游任务ID列表
+        self._task_status = dict()  # 任务状态，key为任务ID，value为EnumDAGTaskStatus
+        self._wait_depends = dict()  # 还未完成的上游任务数量，key为任务ID
+        self._task_times = dict()  # 任务执行时间，key为任务ID，value为[开始时间, 结束时间]（time.perf_counter）
+        self._results = dict()  # 成功任务的执行结果，key为任务ID
+        self._errors = dict()  # 失败任务的异常信息，key为任务ID，value为(error, trace_str)
+        self._finished_count = 0  # 已结束（任何最终状态）的任务数量
+        # 已满足依赖条件、等待run放入任务池的任务ID清单；回调函数在任务池的工作线程中执行，如果在回调函数中
+        # 放入任务，队列已满（Block策略）时工作线程会被阻塞，导致没有线程处理队列中的任务
+        self._ready_list = list()
+        self._condition = threading.Condition(threading.RLock())
+
+    #############################
+    # 属性
+    #############################
+
+    @property
+    def results(self):
+        """
+        @property {get} 执行成功的任务结果字典，key为任务ID，value为任务返回值
+        @propertyName results
+
+        """
+        return self._results
+
+    @property
+    def errors(self):
+        """
+        @property {get} 执行失败的任务异常字典，key为任务ID，value为(error, trace_str)
+        @propertyName errors
+
+        """
+        return self._errors
+
+    @property
+    def is_success(self):
+        """
+        @property {get} 是否所有任务都执行成功
+        @propertyName is_success
+
+        """
+        return len(self._results) == len(self._tasks)
+
+    #############################
+    # 内部函数
+    #############################
+
+    def _run_task(self, task_id):
         """
-        @fun 将任务放入队列执行
-        @funName put_task
+        @fun 在任务池中执行的任务封装函数
+        @funName _run_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 登记任务执行时间，并组织上游结果参数执行任务
+
+        @funParam {string} task_id 任务ID
+
+        @funReturn {object} 任务的返回值
+
+        """
+        _target, _args, _kwargs, _depends, _overtime = self._tasks[task_id]
+        if self._upstream_para_name is not None and len(_depends) > 0:
+            _kwargs = dict(_kwargs)
+            _kwargs[self._upstream_para_name] = dict([(_id, self._results[_id]) for _id in _depends])
+        self._task_times[task_id] = [time.perf_counter(), None]
+        try:
+            return _target(*_args, **_kwargs)
+        finally:
+            self._task_times[task_id][1] = time.perf_counter()
+
+    def _submit_task(self, task_id):
+        """
+        @fun 将任务放入任务池执行
+        @funName _submit_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 调用前需已将任务状态置为Running，且不能持有self._condition锁（放入任务池可能阻塞等待，
+            或按CallerRuns策略直接在当前线程执行任务）
+
+        @funParam {string} task_id 任务ID
+
+        """
+        try:
+            self._task_pool.put_task(
+                target=self._run_task, name=task_id, args=(task_id,),
+                callback=self._task_success_callback, exception_callback=self._task_exception_callback,
+                task_overtime=self._tasks[task_id][4]
+            )
+        except:
+            # 放入任务池失败，当作任务执行失败处理
+            _error = sys.exc_info()
+            _trace_str = traceback.format_exc()
+            self._condition.acquire()
+            try:
+                self._task_failed(task_id, _error, _trace_str)
+            finally:
+                self._condition.release()
+
+    def _pop_ready_tasks(self):
+        """
+        @fun 取出已满足依赖条件的任务
+        @funName _pop_ready_tasks
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 将取出的任务状态置为Running，已被取消的任务不再返回；调用前需已获得self._condition锁
+
+        @funReturn {list} 需放入任务池的任务ID清单
+
+        """
+        _task_list = list()
+        for _task_id in self._ready_list:
+            if self._task_status[_task_id] == EnumDAGTaskStatus.Waiting:
+                self._task_status[_task_id] = EnumDAGTaskStatus.Running
+                _task_list.append(_task_id)
+        del self._ready_list[:]
+        return _task_list
+
+    def _set_task_finished(self, task_id, status):
+        """
+        @fun 登记任务的最终状态
+        @funName _set_task_finished
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 调用前需已获得self._condition锁
+
+        @funParam {string} task_id 任务ID
+        @funParam {EnumDAGTaskStatus} status 最终状态
+
+        """
+        self._task_status[task_id] = status
+        self._finished_count += 1
+        self._condition.notify_all()
+
+    def _task_success_callback(self, res, args, kwargs, name):
+        """
+        @fun 任务执行成功的回调函数
+        @funName _task_success_callback
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 登记结果，并登记满足依赖条件的下游任务，由run放入任务池
+
+        """
+        self._condition.acquire()
+        try:
+            self._results[name] = res
+            for _down_id in self._downstreams[name]:
+                self._wait_depends[_down_id] -= 1
+                if self._wait_depends[_down_id] == 0 and self._task_status[_down_id] == EnumDAGTaskStatus.Waiting:
+                    self._ready_list.append(_down_id)
+            self._set_task_finished(name, EnumDAGTaskStatus.Success)
+        finally:
+            self._condition.release()
+
+    def _task_exception_callback(self, error, trace_str, args, kwargs, name):
+        """
+        @fun 任务执行异常的回调函数
+        @funName _task_exception_callback
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        """
+        self._condition.acquire()
+        try:
+            self._task_failed(name, error, trace_str)
+        finally:
+            self._condition.release()
+
+    def _task_failed(self, task_id, error, trace_str):
+        """
+        @fun 处理任务失败
+        @funName _task_failed
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 将所有下游任务置为UpstreamFailed，调用前需已获得self._condition锁
+
+        """
+        self._errors[task_id] = (error, trace_str)
+        self._set_task_finished(task_id, EnumDAGTaskStatus.Failed)
+        _down_list = list(self._downstreams[task_id])
+        while len(_down_list) > 0:
+            _down_id = _down_list.pop()
+            if self._task_status[_down_id] == EnumDAGTaskStatus.Waiting:
+                self._set_task_finished(_down_id, EnumDAGTaskStatus.UpstreamFailed)
+                _down_list.extend(self._downstreams[_down_id])
+        if self._stop_on_failure:
+            self.cancel()
+
+    def _check_dag(self):
+        """
+        @fun 检查依赖关系是否合法，并返回拓扑排序后的任务ID清单
+        @funName _check_dag
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
         @funExcepiton:
-            TaskPoolStopedError 当任务未完成但遇到了停止标志时抛出该异常
+            KeyError 依赖的任务不存在时抛出该异常
+            ParaValueError 依赖关系存在循环时抛出该异常
+
+        @funReturn {list} 拓扑排序后的任务ID清单
+
+        """
+        _wait_count = dict()
+        for _task_id in self._tasks.keys():
+            for _dep_id in self._tasks[_task_id][3]:
+                if _dep_id not in self._tasks.keys():
+                    raise KeyError(u'依赖的任务不存在: %s -> %s' % (str(_task_id), str(_dep_id)))
+            _wait_count[_task_id] = len(self._tasks[_task_id][3])
+
+        _order = [_id for _id in self._tasks.keys() if _wait_count[_id] == 0]
+        _index = 0
+        while _index < len(_order):
+            for _down_id in self._downstreams[_order[_index]]:
+                _wait_count[_down_id] -= 1
+                if _wait_count[_down_id] == 0:
+                    _order.append(_down_id)
+            _index += 1
+        if len(_order) != len(self._tasks):
+            raise ParaValueError(u'任务依赖关系存在循环')
+        return _order
+
+    #############################
+    # 公共函数
+    #############################
+
+    def add_task(self, task_id, target, args=(), kwargs=None, depends=None, task_overtime=0):
+        """
+        @fun 添加任务
+        @funName add_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 依赖的任务可以后添加，执行时再检查依赖关系
+        @funExcepiton:
+            KeyError 任务ID已存在时抛出该异常
 
+        @funParam {string} task_id 任务ID（也是任务池中的任务名）
         @funParam {func} target 目标函数
-        @funParam {string} name 线程名
         @funParam {tuple} args 函数运行参数(顺序格式)
         @funParam {dict} kwargs 函数运行参数(kv格式)
-        @funParam {func} callback 结果回调函数，函数定义为fun(res, args, kwargs, name)，无需返回值
-            res为并发任务的返回值，无返回值则为None
-            args、kwargs为函数的入参
-            name为任务名
-        @funParam {func} exception_callback 异常回调函数，函数定义为fun(error, trace_str, args, kwargs, name)，无需返回值
-            args、kwargs为函数的入参
-            name为任务名
-            error为Exception类，发生异常时的sys.exc_info()三元组对象(type, value, traceback):
-            trace_str 错误追踪堆栈日志，异常时的traceback.format_exc()
-        @funParam {bool} wait_finish 是否等待目标函数执行完成才返回
-        @funParam {float} task_overtime 任务执行的超时时间，如果发现超时则强制结束线程处理，并抛出异常:
-            单位为秒，0代表不监测超时
+        @funParam {list} depends 依赖的上游任务ID清单
+        @funParam {float} task_overtime 任务执行的超时时间，单位为秒，0代表不监测超时
 
         """
-        if self._wait_stop_flag or self._stop_flag:
-            # 任务池已被停止，抛出异常
-            raise TaskPoolStopedError('task pool has stoped!')
+        if task_id in self._tasks.keys():
+            raise KeyError(u'任务ID已存在: %s' % str(task_id))
+        _depends = list() if depends is None else list(depends)
+        self._tasks[task_id] = [target, args, dict() if kwargs is None else kwargs, _depends, task_overtime]
+        self._downstreams.setdefault(task_id, list())
+        for _dep_id in _depends:
+            self._downstreams.setdefault(_dep_id, list()).append(task_id)
+
+    def run(self, overtime=0):
+        """
+        @fun 执行所有任务
+        @funName run
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 同步执行，待所有任务结束（成功、失败或取消）后返回
+        @funExcepiton:
+            KeyError 依赖的任务不存在时抛出该异常
+            ParaValueError 依赖关系存在循环时抛出该异常
+            OvertimeError 超过overtime仍未执行完成时抛出该异常（未执行的任务将被取消）
 
-        if len(self._free_workers) == 0 and len(self._generate_workers) < self._pool_size:
-            # 创建新线程
-            self._generate_workers()
+        @funParam {float} overtime 等待执行完成的超时时间，单位为秒，0代表一直等待
 
-        # 将任务放到队列
-        _id = uuid.uuid1()
-        _task_overtime = task_overtime
-        if task_overtime is None or task_overtime < 0:
-            _task_overtime = 0
-        _task_job = [_id, target, args, kwargs, name, callback, exception_callback, wait_finish, _task_overtime]
-        # 放入待处理清单
-        self._put_task_to_queue(task_obj=_task_job)
-        if wait_finish:
-            # 需要等待线程结束
-            while True:
-                if _id in self._task_status.keys():
-                    # 未完成
-                    if self._stop_flag:
-                        # 未完成但遇到线程池关闭的情况，抛出异常
-                        raise TaskPoolStopedError('task pool has stoped!')
-                    else:
-                        time.sleep(0.1)
-                        continue
+        @funReturn {dict} 执行成功的任务结果字典，key为任务ID，value为任务返回值
+
+        """
+        self._check_dag()
+        _auto_pool = self._task_pool is None
+        if _auto_pool:
+            self._task_pool = ParallelTaskPool(parallel_type=EnumParallelType.Threading, task_sleep_time=0.01)
+
+        self._condition.acquire()
+        try:
+            # 初始化执行状态
+            self._results.clear()
+            self._errors.clear()
+            self._task_times.clear()
+            self._finished_count = 0
+            del self._ready_list[:]
+            for _task_id in self._tasks.keys():
+                self._task_status[_task_id] = EnumDAGTaskStatus.Waiting
+                self._wait_depends[_task_id] = len(self._tasks[_task_id][3])
+                if self._wait_depends[_task_id] == 0:
+                    # 没有依赖的任务直接启动
+                    self._ready_list.append(_task_id)
+
+            # 启动满足依赖条件的任务，并等待执行完成
+            _deadline = None if overtime is None or overtime <= 0 else time.monotonic() + overtime
+            while self._finished_count < len(self._tasks):
+                if len(self._ready_list) > 0:
+                    # 放入任务池时释放锁，让工作线程的回调函数可以登记结果
+                    _task_list = self._pop_ready_tasks()
+                    self._condition.release()
+                    try:
+                        for _task_id in _task_list:
+                            self._submit_task(_task_id)
+                    finally:
+                        self._condition.acquire()
+                    continue
+                if _deadline is None:
+                    self._condition.wait()
                 else:
-                    # 已完成
-                    break
+                    _wait_time = _deadline - time.monotonic()
+                    if _wait_time <= 0:
+                        self.cancel()
+                        raise OvertimeError(u'DAG执行超时')
+                    self._condition.wait(_wait_time)
+            return self._results
+        finally:
+            self._condition.release()
+            if _auto_pool:
+                self._task_pool.stop_task_pool(wait_finish=False)
+                self._task_pool = None
 
-    def stop_task_pool(self, wait_finish=True):
+    def cancel(self):
         """
-        @fun 停止线程池
-        @funName stop_task_pool
+        @fun 取消未执行的任务
+        @funName cancel
         @funGroup 所属分组
         @funVersion 版本
-        @funDescription 功能描述
-        @funExcepiton:
-            异常类名 异常说明
-
-        @funParam {bool} wait_finish 是否等待所有待处理任务执行完成才返回
+        @funDescription 所有等待中的任务置为Cancelled，正在执行的任务会继续执行完成
 
         """
-        if wait_finish:
-            self._wait_stop_flag = True  # 标记任务池待停止，不再接收新的任务
-            # 等待所有待处理任务完成
-            while True:
-                if not self._stop_flag and len(self._wait_task_queue) == 0:
-                    # 已经无待处理任务，可以将停止标记设置为True，正式停止线程
-                    self._stop_flag = True
-                    continue
-                if len(self._generate_workers) == 0:
-                    # 线程已经全部退出
-                    return
-                time.sleep(0.5)
-        else:
-            # 不等待所有处理结束，等级标记即可(可能会有实际执行完但状态不对的情况)
-            self._wait_stop_flag = True
-            self._stop_flag = True
+        self._condition.acquire()
+        try:
+            for _task_id in self._tasks.keys():
+                if self._task_status.get(_task_id, None) == EnumDAGTaskStatus.Waiting:
+                    self._set_task_finished(_task_id, EnumDAGTaskStatus.Cancelled)
+        finally:
+            self._condition.release()
 
-    def pause_task_pool(self, wait_finish=True):
+    def get_task_status(self, task_id):
         """
-        @fun 暂停线程池处理
-        @funName pause_task_pool
+        @fun 获取任务的执行状态
+        @funName get_task_status
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 功能描述
         @funExcepiton:
-            异常类名 异常说明
+            KeyError 任务ID不存在时抛出该异常
 
-        @funParam {bool} wait_finish 是否等待当前正在处理的任务执行完成才返回
+        @funParam {string} task_id 任务ID
+
+        @funReturn {EnumDAGTaskStatus} 任务的执行状态，未执行过返回Waiting
 
         """
-        self._pause_flag = True
-        if wait_finish:
-            while len(self._generate_workers) != len(self._free_workers):
-                # 只要空闲线程的数量和创建线程的数量不一样，就说明有任务正在执行
+        if task_id not in self._tasks.keys():
+            raise KeyError(u'任务ID不存在: %s' % str(task_id))
+        return self._task_status.get(task_id, EnumDAGTaskStatus.Waiting)
 
+    def get_critical_path(self):
+        """
+        @fun 获取关键路径
+        @funName get_critical_path
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 按任务实际执行耗时计算耗时最长的依赖链，未执行的任务耗时按0计算
 
+        @funReturn {tuple} (path, duration):
+            path : list 关键路径上的任务ID清单（按执行顺序）
+            duration : float 关键路径的耗时合计，单位为秒
 
+        """
+        _order = self._check_dag()
+        _path_time = dict()  # 以任务为结尾的最长路径耗时
+        _path_prev = dict()  # 最长路径上的上一个任务
+        for _task_id in _order:
+            _times = self._task_times.get(_task_id, None)
+            _duration = 0.0
+            if _times is not None and _times[1] is not None:
+                _duration = _times[1] - _times[0]
+            _prev = None
+            _prev_time = 0.0
+            for _dep_id in self._tasks[_task_id][3]:
+                if _prev is None or _path_time[_dep_id] > _prev_time:
+                    _prev = _dep_id
+                    _prev_time = _path_time[_dep_id]
+            _path_time[_task_id] = _prev_time + _duration
+            _path_prev[_task_id] = _prev
+
+        if len(_order) == 0:
+            return list(), 0.0
+        _end_id = max(_order, key=lambda _id: _path_time[_id])
+        _path = list()
+        _task_id = _end_id
+        while _task_id is not None:
+            _path.insert(0, _task_id)
+            _task_id = _path_prev[_task_id]
+        return _path, _path_time[_end_id]
 
 
 class Parallel(object):
@@ -695,6 +2272,74 @@ class Parallel(object):
     # 静态类
     #############################
 
+    @staticmethod
+    def init_simple_task_pool(parallel_type=EnumParallelType.Threading, pool_size=None,
+                              initializer=None, initargs=(), cpu_affinity=None):
+        """
+        @fun 初始化简单任务共享使用的线程池/进程池
+        @funName init_simple_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 简单任务（simple_task_decorator/create_simple_task）的多线程和多进程模式共用同一个池，
+            不主动初始化的情况下在第一次使用时按默认大小创建；如果池已存在，会先关闭原来的池再重新创建
+        @funExcepiton:
+            ReferenceError 当EnumParallelType不支持时抛出异常
+
+        @funParam {EnumParallelType} parallel_type 并发任务类型，只支持Threading和MultiProcessing
+        @funParam {int} pool_size 池大小，None代表使用默认大小（线程池为min(32, cpu_count + 4)，进程池为cpu_count）
+        @funParam {func} initializer 每个工作线程/进程启动时执行的初始化函数，返回值作为工作线程/进程的状态数据:
+            任务中通过ParallelTaskPool.get_worker_state()获取；多进程模式下初始化函数及参数须可pickle
+        @funParam {tuple} initargs 初始化函数的参数
+        @funParam {list} cpu_affinity 工作线程/进程绑定的CPU清单，例如[{0}, {1}]，按启动顺序循环使用，仅Linux支持
+
+        @funReturn {concurrent.futures.Executor} 创建的池对象
+
+        """
+        if parallel_type not in (EnumParallelType.Threading, EnumParallelType.MultiProcessing):
+            raise ReferenceError
+
+        Parallel._simple_task_pools_lock.acquire()
+        try:
+            if parallel_type in Parallel._simple_task_pools.keys():
+                # 已存在，关闭原来的池
+                Parallel._simple_task_pools.pop(parallel_type).shutdown(wait=False)
+
+            _init_para = dict()
+            if initializer is not None or cpu_affinity:
+                # 通过共享计数器给工作线程/进程分配序号，用于匹配cpu_affinity
+                _init_para['initializer'] = Parallel._simple_worker_initializer
+                _init_para['initargs'] = (initializer, initargs, cpu_affinity, multiprocessing.Value('i', 0))
+            if parallel_type == EnumParallelType.Threading:
+                _pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='SimpleTask', **_init_para)
+            else:
+                _pool = ProcessPoolExecutor(max_workers=pool_size, **_init_para)
+            Parallel._simple_task_pools[parallel_type] = _pool
+            return _pool
+        finally:
+            Parallel._simple_task_pools_lock.release()
+
+    @staticmethod
+    def shutdown_simple_task_pool(wait=True):
+        """
+        @fun 关闭简单任务共享使用的线程池/进程池
+        @funName shutdown_simple_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 关闭后再次使用简单任务时会重新创建池
+
+        @funParam {bool} wait 是否等待已提交的任务执行完成才返回
+
+        """
+        Parallel._simple_task_pools_lock.acquire()
+        try:
+            _pools = list(Parallel._simple_task_pools.values())
+            Parallel._simple_task_pools.clear()
+        finally:
+            Parallel._simple_task_pools_lock.release()
+
+        for _pool in _pools:
+            _pool.shutdown(wait=wait)
+
     @staticmethod
     def simple_task_decorator(parallel_type=EnumParallelType.Threading, is_asyn=False, name='', callback=None):
         """
@@ -706,11 +2351,17 @@ class Parallel(object):
         @funExcepiton:
             ReferenceError 当EnumParallelType不支持时抛出异常
 
-        @funParam {EnumParallelType} parallel_type 并发任务类型
+        @funParam {EnumParallelType} parallel_type 并发任务类型:
+            Coroutine - 协程模式
+            Threading - 放入共享线程池执行，适合IO密集型的函数
+            MultiProcessing - 放入共享进程池执行，适合CPU密集型的函数，注意被修饰函数必须定义在模块顶层，
+                且参数和返回值都必须支持pickle
         @funParam {bool} is_asyn 是否异步模式，True-异步模式，函数立即返回；False-同步模式，函数阻塞等待执行完成再返回
-        @funParam {string} name 线程名
+        @funParam {string} name 线程名，多线程和多进程模式下任务执行期间工作线程使用该名称，执行完成后恢复原名称
         @funParam {func} callback 结果回调函数，函数定义为fun(res)，无需返回值，res为并发任务的返回值，无返回值则为None
 
+        @funReturn {object} 多线程和多进程模式下，同步模式返回函数执行结果，异步模式返回concurrent.futures.Future对象
+
         @funExample {python} 示例参考:
             @Parallel.simple_task_decorator(parallel_type=EnumParallelType.Threading, is_asyn=False)
             def parallel_task_fun(para1=xx, para2=xx, ...):
@@ -723,6 +2374,7 @@ class Parallel(object):
 
         """
         def task(func):  # 修饰符函数封装
+            @functools.wraps(func)
             def task_args(*args, **kwargs):  # 参数处理
                 if parallel_type == EnumParallelType.Coroutine:
                     # 协程模式，马上执行
@@ -735,17 +2387,20 @@ class Parallel(object):
                         # 同步模式，等待函数执行完才返回
                         _task_obj.join()
                 elif parallel_type == EnumParallelType.Threading:
-                    # 线程模式
-                    _task_obj = threading.Thread(
-                        target=func,
-                        args=(func, args, kwargs, callback),
-                        name=name
+                    # 线程模式，放入共享线程池，回调函数在工作线程中执行
+                    _future = Parallel._submit_simple_task(
+                        parallel_type, name, Parallel._callback_fun_caller, (func, args, kwargs, callback)
                     )
-                    _task_obj.setDaemon(True)  # 程序关闭时自动结束，不考虑状态问题，具体状态处理由应用逻辑考虑
-                    _task_obj.start()
-                    if not is_asyn:
-                        # 同步模式，等待线程执行完成
-                        _task_obj.join()
+                    return Parallel._simple_task_result(_future, is_asyn)
+                elif parallel_type == EnumParallelType.MultiProcessing:
+                    # 进程模式，被修饰后模块中的函数名指向的是修饰后的函数，无法直接pickle原函数，
+                    # 因此传递函数的模块名和名称，由子进程找到修饰前的函数执行
+                    _future = Parallel._submit_simple_task(
+                        parallel_type, name, Parallel._decorated_fun_caller,
+                        (func.__module__, func.__qualname__, args, kwargs)
+                    )
+                    Parallel._add_future_callback(_future, callback)
+                    return Parallel._simple_task_result(_future, is_asyn)
                 else:
                     # 异常情况
                     raise ReferenceError
@@ -764,15 +2419,18 @@ class Parallel(object):
         @funExcepiton:
             ReferenceError 当EnumParallelType不支持时抛出异常
 
-        @funParam {func} target 目标函数
-        @funParam {string} name 线程名
+        @funParam {func} target 目标函数，多进程模式下函数及参数必须支持pickle
+        @funParam {string} name 线程名，多线程和多进程模式下任务执行期间工作线程使用该名称，执行完成后恢复原名称
         @funParam {tuple} args 函数运行参数(顺序格式)
         @funParam {dict} kwargs 函数运行参数(kv格式)
         @funParam {EnumParallelType} parallel_type 并发任务类型
         @funParam {bool} is_asyn 是否异步模式，True-异步模式，函数立即返回；False-同步模式，函数阻塞等待执行完成再返回
-            该参数仅在is_run_immediately为True的情况下生效
+
+        @funReturn {object} 多线程和多进程模式下，同步模式返回函数执行结果，异步模式返回concurrent.futures.Future对象
 
         """
+        if kwargs is None:
+            kwargs = dict()
         if parallel_type == EnumParallelType.Coroutine:
             # 协程,马上执行
             _task_obj = gevent.spawn(target, *args, **kwargs)
@@ -783,16 +2441,10 @@ class Parallel(object):
             else:
                 # 同步模式，等待函数执行完才返回
                 _task_obj.join()
-        elif parallel_type == EnumParallelType.Threading:
-            # 线程模式
-            _task_obj = threading.Thread(
-                target=target,
-                args=args,
-                kwargs=kwargs,
-                name=name
-            )
-            _task_obj.setDaemon(True)  # 程序关闭时自动结束，不考虑状态问题，具体状态处理由应用逻辑考虑
-            _task_obj.start()
+        elif parallel_type in (EnumParallelType.Threading, EnumParallelType.MultiProcessing):
+            # 线程或进程模式，放入共享的池中执行
+            _future = Parallel._submit_simple_task(parallel_type, name, target, args, kwargs)
+            return Parallel._simple_task_result(_future, is_asyn)
         else:
             # 异常情况
             raise ReferenceError
@@ -804,6 +2456,9 @@ class Parallel(object):
     _wait_task_list = list()  # 等待执行的任务清单
     _task_pool_size = 0  # 线程池大小，<= 0代表不使用线程池
     _pool = None  # 线程池对象
+    # 简单任务共享的池，key为EnumParallelType（Threading/MultiProcessing），value为对应的池对象，在第一次使用时创建
+    _simple_task_pools = dict()
+    _simple_task_pools_lock = threading.RLock()
 
     #############################
     # 私有函数
@@ -839,9 +2494,178 @@ class Parallel(object):
         if callback is not None:
             _res = target(*args, **kwargs)
             callback(_res)
+            return _res
         else:
             # 直接执行
-            target(*args, **kwargs)
+            return target(*args, **kwargs)
+
+    @staticmethod
+    def _submit_simple_task(parallel_type, name, target, args=(), kwargs=None):
+        """
+        @fun 将简单任务提交到共享的池中执行
+        @funName _submit_simple_task
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 指定了name的情况下，通过_named_fun_caller在任务执行期间修改工作线程名
+
+        @funParam {EnumParallelType} parallel_type 并发任务类型，Threading或MultiProcessing
+        @funParam {string} name 线程名，None或''代表不修改
+        @funParam {func} target 目标函数
+        @funParam {tuple} args 函数运行参数(顺序格式)
+        @funParam {dict} kwargs 函数运行参数(kv格式)
+
+        @funReturn {concurrent.futures.Future} 任务的Future对象
+
+        """
+        if kwargs is None:
+            kwargs = dict()
+        _pool = Parallel._get_simple_task_pool(parallel_type)
+        if name:
+            return _pool.submit(Parallel._named_fun_caller, name, target, args, kwargs)
+        return _pool.submit(target, *args, **kwargs)
+
+    @staticmethod
+    def _named_fun_caller(name, target, args=(), kwargs=None):
+        """
+        @fun 以指定的线程名执行函数
+        @funName _named_fun_caller
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 共享池的工作线程是复用的，执行完成后恢复原线程名
+
+        @funParam {string} name 线程名
+        @funParam {func} target 目标函数
+        @funParam {tuple} args 函数运行参数(顺序格式)
+        @funParam {dict} kwargs 函数运行参数(kv格式)
+
+        @funReturn {object} 目标函数的返回值
+
+        """
+        _thread = threading.current_thread()
+        _old_name = _thread.name
+        _thread.name = name
+        try:
+            return target(*args, **(kwargs or dict()))
+        finally:
+            _thread.name = _old_name
+
+    @staticmethod
+    def _decorated_fun_caller(module_name, qualname, args=(), kwargs=None):
+        """
+        @fun 在子进程中执行被修饰符修饰的原函数
+        @funName _decorated_fun_caller
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 根据模块名和函数名找到修饰后的函数，再通过__wrapped__取得修饰前的原函数执行，
+            避免在子进程中再次进入修饰符的并发处理
+
+        @funParam {string} module_name 函数所在模块名
+        @funParam {string} qualname 函数的限定名
+        @funParam {tuple} args 函数运行参数(顺序格式)
+        @funParam {dict} kwargs 函数运行参数(kv格式)
+
+        @funReturn {object} 原函数的返回值
+
+        """
+        _fun = importlib.import_module(module_name)
+        for _name in qualname.split('.'):
+            _fun = getattr(_fun, _name)
+        return _fun.__wrapped__(*args, **kwargs)
+
+    @staticmethod
+    def _get_simple_task_pool(parallel_type):
+        """
+        @fun 获取简单任务共享使用的池，如果不存在则按默认大小创建
+        @funName _get_simple_task_pool
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {EnumParallelType} parallel_type 并发任务类型
+
+        @funReturn {concurrent.futures.Executor} 池对象
+
+        """
+        _pool = Parallel._simple_task_pools.get(parallel_type, None)
+        if _pool is None:
+            Parallel._simple_task_pools_lock.acquire()
+            try:
+                # 获得锁后再判断一次，避免重复创建
+                _pool = Parallel._simple_task_pools.get(parallel_type, None)
+                if _pool is None:
+                    _pool = Parallel.init_simple_task_pool(parallel_type=parallel_type)
+            finally:
+                Parallel._simple_task_pools_lock.release()
+        return _pool
+
+    @staticmethod
+    def _simple_worker_initializer(initializer, initargs, cpu_affinity, worker_seq):
+        """
+        @fun 简单任务池工作线程/进程的初始化函数
+        @funName _simple_worker_initializer
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 分配工作线程/进程序号后执行ParallelTaskPool.init_worker
+
+        @funParam {func} initializer 初始化函数
+        @funParam {tuple} initargs 初始化函数的参数
+        @funParam {list} cpu_affinity 工作线程/进程绑定的CPU清单
+        @funParam {multiprocessing.Value} worker_seq 工作线程/进程序号的共享计数器
+
+        """
+        _lock = worker_seq.get_lock()
+        _lock.acquire()
+        try:
+            _worker_no = worker_seq.value
+            worker_seq.value += 1
+        finally:
+            _lock.release()
+        ParallelTaskPool.init_worker(
+            initializer=initializer, initargs=initargs,
+            cpus=ParallelTaskPool._get_affinity_cpus(cpu_affinity, _worker_no)
+        )
+
+    @staticmethod
+    def _add_future_callback(future, callback=None):
+        """
+        @fun 在主进程中执行任务的结果回调函数
+        @funName _add_future_callback
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 任务执行出现异常时不调用回调函数
+
+        @funParam {concurrent.futures.Future} future 任务对象
+        @funParam {func} callback 结果回调函数，函数定义为fun(res)
+
+        """
+        if callback is None:
+            return
+
+        def _done_fun(done_future):
+            if not done_future.cancelled() and done_future.exception() is None:
+                callback(done_future.result())
+
+        future.add_done_callback(_done_fun)
+
+    @staticmethod
+    def _simple_task_result(future, is_asyn=False):
+        """
+        @fun 根据同步异步模式返回简单任务的结果
+        @funName _simple_task_result
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {concurrent.futures.Future} future 任务对象
+        @funParam {bool} is_asyn 是否异步模式
+
+        @funReturn {object} 异步模式返回future对象，同步模式等待并返回函数执行结果（函数的异常会直接抛出）
+
+        """
+        if is_asyn:
+            return future
+        else:
+            return future.result()
 
     #############################
     # 公共函数
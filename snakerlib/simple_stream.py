@@ -7,7 +7,18 @@ import sys
 import time
 import traceback
 import threading
+import asyncio
+import functools
+import collections
+import heapq
+import json
+import os
+import tempfile
+import mmap
+import queue
+import socket
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from abc import ABC, abstractmethod  # 利用abc模块实现抽象类
 from .generic import NullObj
 
@@ -32,6 +43,19 @@ class EnumStreamClosedStatus(Enum):
     ExceptionExit = 'ExceptionExit'  # 出现异常关闭
 
 
+class EnumStreamDealStatus(Enum):
+    """
+    @enum 流处理暂时返回的原因枚举值
+    @enumName EnumStreamDealStatus
+    @enumDescription 流处理（_stream_deal_run）返回的原因，用于线程方式或调度器方式决定后续处理
+
+    """
+    Yield = 'Yield'  # 已处理指定次数，让出执行
+    Wait = 'Wait'  # 没有获取到数据，需等待新数据（keep_wait_data）
+    Pause = 'Pause'  # 流处于暂停状态
+    End = 'End'  # 流处理结束，需关闭流
+
+
 class BaseStream(ABC):
     """
     @class 基础流数据处理定义基类
@@ -52,11 +76,29 @@ class BaseStream(ABC):
     _logger = None  # 日志处理类
     _dealer_exception_fun = None  # 流处理异常时执行的通知函数
     _stream_closed_fun = None  # 流处理结束的通知函数
-    _dealer_handles = dict()  # 处理流数据的处理函数句柄字典，key为函数句柄，value统一为None
+    _dealer_handles = dict()  # 处理流数据的处理函数句柄字典，key为函数句柄，value为是否按块处理(is_batch)
     _stream_list = dict()  # 正在处理的流对象列表，key为stream_tag，value为stream_obj
     _stream_list_tag = dict()  # 正在处理的流对象对应的处理标记，key为stream_tag，value为(_stop_tag, _pause_tag):
     _stream_list_lock = threading.RLock()  # 流处理对象列表更新锁
+    # 流处理标记变化（停止、暂停、恢复、流关闭）的通知条件，基于_stream_list_lock
+    _stream_list_cond = threading.Condition(_stream_list_lock)
     _force_stop_tag = False  # 强制关闭所有流处理的标记
+    _throttle_time = 0  # 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+    _batch_size = 0  # 按块获取流对象的块大小，0代表逐个获取
+    # _next是否自行阻塞等待数据（等待超时抛出StopIteration），为True时keep_wait_data无需再休眠轮询
+    _blocking_next = False
+    _fan_out_queue_size = 0  # 处理函数并行分发的队列大小，0代表顺序调用处理函数
+    _checkpoint_file = None  # 保存各流处理当前位置的检查点文件，None代表不保存
+    _checkpoint_interval = 0  # 保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+    _checkpoint_lock = None  # 检查点文件的读写锁，同一检查点文件的所有流对象共用
+    # 各检查点文件的读写锁，key为检查点文件的绝对路径，value为锁对象
+    _checkpoint_locks = dict()
+    _checkpoint_locks_lock = threading.Lock()
+    _stream_scheduler = dict()  # 由调度器处理的流，key为stream_tag，value为StreamScheduler
+    # 通过生成器（iter_stream/aiter_stream）获取的流标签，这类流只在调用方推进或关闭生成器时才会关闭
+    _stream_generator_tags = set()
+    _stats_sample_rate = 0  # 处理统计的采样间隔，0代表不统计
+    _stream_stats = dict()  # 正在处理的流的统计信息，key为stream_tag，value为统计对象
 
     #############################
     # 属性
@@ -87,7 +129,8 @@ class BaseStream(ABC):
     #############################
 
     def __init__(self, back_forward=False, keep_wait_data=False, stop_by_excepiton=False,
-                 logger=None, dealer_exception_fun=None, stream_closed_fun=None):
+                 logger=None, dealer_exception_fun=None, stream_closed_fun=None, throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, checkpoint_file=None, checkpoint_interval=0, stats_sample_rate=0):
         """
         @fun 构造函数
         @funName __init__
@@ -112,6 +155,26 @@ class BaseStream(ABC):
             stream_obj : object 流对象
             position : object 正在处理的流对象的位置
             closed_status : EnumStreamClosedStatus 关闭状态
+            stats : dict 统计信息（仅stats_sample_rate大于0时传入），格式见stats
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取流对象的块大小（通过_next_batch获取），0代表逐个获取:
+            按块处理的处理函数（add_dealer时指定is_batch=True）传入的是整块数据及块的开始位置，
+            逐个处理的处理函数仍逐个传入对象及位置（位置为块开始位置+序号，因此要求位置为整数）
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表在流处理线程中顺序调用各处理函数:
+            大于0时每个处理函数使用独立的处理线程及该大小的队列，各处理函数内按流顺序处理，互不阻塞；
+            某个处理函数的队列满时流处理等待（反压），处理函数清单在流启动时确定
+        @funParam {string} checkpoint_file 检查点文件路径，None代表不保存检查点:
+            start_stream的流处理过程中按stream_tag保存流的当前位置（JSON格式，先写临时文件再改名，保证文件完整），
+            start_stream指定resume=True时从检查点位置继续处理；流正常结束时删除该stream_tag的检查点，
+            处理函数异常中止时保存异常对象的位置，其他中止方式保存下一个待处理的位置；
+            并行分发模式下保存各处理函数中处理最慢（或出现异常）的位置，异常位置之前已分发的对象仍会处理完成；
+            位置需支持JSON序列化；同一进程内多个流对象可共用同一个检查点文件
+        @funParam {float} checkpoint_interval 流处理过程中保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计:
+            大于0时统计start_stream处理的流对象数量、每秒处理数量、异常数量，并按流位置每隔stats_sample_rate个流对象
+            （按块获取时为stats_sample_rate块）记录一次各处理函数的执行时间（用于估算累计时间及p99时间，
+            采样间隔越大统计的性能影响越小）；流对象数量在采样时按流位置的变化计算，不增加逐个对象的处理开销；
+            流处理中可通过stats(stream_tag)获取，流结束时通过stream_closed_fun的stats参数传入
 
 
         """
@@ -121,6 +184,14 @@ class BaseStream(ABC):
         self._logger = logger
         self._dealer_exception_fun = dealer_exception_fun
         self._stream_closed_fun = stream_closed_fun
+        self._throttle_time = throttle_time
+        self._batch_size = batch_size
+        self._fan_out_queue_size = fan_out_queue_size
+        self._checkpoint_file = checkpoint_file
+        self._checkpoint_interval = checkpoint_interval
+        if checkpoint_file is not None:
+            self._checkpoint_lock = BaseStream._get_checkpoint_lock(checkpoint_file)
+        self._stats_sample_rate = stats_sample_rate
 
     #############################
     # 内部函数
@@ -133,7 +204,7 @@ class BaseStream(ABC):
         @funGroup 所属分组
         @funVersion 版本
         @funDescription 按顺序进行流对象的获取和处理:
-            每获取一个对象，调用注册的处理函数
+            每获取一个对象，调用注册的处理函数；暂停及等待数据时在当前线程中等待
         @funExcepiton:
             KeyError 当传入错误的stream_tag，抛出该异常
 
@@ -141,7 +212,56 @@ class BaseStream(ABC):
         @funParam {string} stream_tag 流处理标签
 
         """
-        _closed_status = EnumStreamClosedStatus.RunOver
+        _context = self._stream_deal_begin(stream_tag)
+        try:
+            while True:
+                _status = self._stream_deal_run(_context)
+                if _status == EnumStreamDealStatus.Pause:
+                    # 当前流的暂停标记，等待恢复、停止的通知
+                    self._stream_list_cond.acquire()
+                    try:
+                        while (self._stream_list_tag[stream_tag][1] and not self._stream_list_tag[stream_tag][0]
+                               and not self._force_stop_tag):
+                            self._stream_list_cond.wait()
+                    finally:
+                        self._stream_list_cond.release()
+                elif _status == EnumStreamDealStatus.Wait:
+                    # 没有获取到数据，但继续循环尝试获取
+                    self._wait_data(stream_tag)
+                elif _status == EnumStreamDealStatus.End:
+                    return
+        finally:
+            self._stream_deal_end(_context)
+
+    def _stream_deal_begin(self, stream_tag):
+        """
+        @fun 开始流处理
+        @funName _stream_deal_begin
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 生成流处理的上下文，并行分发模式下启动各处理函数的处理线程
+        @funExcepiton:
+            KeyError 当传入错误的stream_tag，抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+
+        @funReturn {object} 流处理上下文，具有以下属性:
+            stream_tag : string 流处理标签
+            stream_obj : object 流对象
+            pos : object 当前处理的流对象位置
+            closed_status : EnumStreamClosedStatus 关闭状态
+            fan_out_list : list 并行分发的处理函数清单，每项为(队列, 线程, 进度)，None代表顺序调用处理函数；
+                进度为单元素列表，值为(顺序键, 继续处理的位置)，见_fan_out_deal_fun
+            fan_out_exit : threading.Event 并行分发的处理函数出现异常需中止流处理的标记
+            fan_out_seq : int 下一个分发的流对象的顺序号
+            fan_out_fail_seq : int 并行分发的处理函数出现异常需中止时最早的流对象顺序号，None代表未出现
+            fan_out_lock : threading.Lock 更新fan_out_fail_seq的锁
+            checkpoint_time : float 下一次保存检查点的时间，None代表不定时保存
+            stats : object 统计对象，None代表不统计
+            sample_pos : int 下一次采样的流位置，不统计时为sys.maxsize（不会采样）
+            stats_pos : int 上一次更新统计数量时的流位置，统计的流对象数量按位置变化计算
+
+        """
         self._stream_list_lock.acquire()
         try:
             if stream_tag not in self._stream_list.keys():
@@ -152,95 +272,724 @@ class BaseStream(ABC):
         finally:
             self._stream_list_lock.release()
 
+        _context = NullObj()
+        _context.stream_tag = stream_tag
+        _context.stream_obj = _stream_obj
+        _context.pos = self._current_position(_stream_obj)
+        _context.closed_status = EnumStreamClosedStatus.RunOver
+        _context.fan_out_list = None
+        _context.fan_out_exit = threading.Event()
+        _context.fan_out_seq = 0
+        _context.fan_out_fail_seq = None
+        _context.fan_out_lock = threading.Lock()
+        _context.checkpoint_time = None
+        if self._checkpoint_file is not None and self._checkpoint_interval > 0:
+            _context.checkpoint_time = time.monotonic() + self._checkpoint_interval
+        _context.stats = None
+        _context.sample_pos = sys.maxsize
+        _context.stats_pos = _context.pos
+        if self._stats_sample_rate > 0:
+            _context.stats = self._create_stats(stream_tag)
+            # 获取stats_sample_rate次流对象后进行第一次采样
+            _context.sample_pos = _context.pos + (self._stats_sample_rate - 1) * self._get_sample_step()
+
+        if self._fan_out_queue_size > 0:
+            # 并行分发模式，每个处理函数启动独立的队列及处理线程
+            _context.fan_out_list = list()
+            try:
+                for _handle, _is_batch in list(self._dealer_handles.items()):
+                    _dealer_queue = queue.Queue(maxsize=self._fan_out_queue_size)
+                    _progress = [((0, 0), _context.pos)]
+                    _dealer_thread = threading.Thread(
+                        target=self._fan_out_deal_fun,
+                        args=(_context, _handle, _is_batch, _dealer_queue, _progress),
+                        name='Thread-Fan-Out-Dealer'
+                    )
+                    _dealer_thread.setDaemon(True)
+                    _dealer_thread.start()
+                    _context.fan_out_list.append((_dealer_queue, _dealer_thread, _progress))
+            except:
+                self._stream_deal_end(_context)
+                raise
+        return _context
+
+    def _stream_deal_run(self, context, max_count=0):
+        """
+        @fun 执行流处理
+        @funName _stream_deal_run
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 按顺序获取流对象并调用处理函数，直到需要暂停、等待数据、结束或处理了max_count次
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+        @funParam {int} max_count 本次最多获取流对象的次数，0代表不限制
+
+        @funReturn {EnumStreamDealStatus} 返回的原因
+
+        """
+        _stream_tag = context.stream_tag
+        _stream_obj = context.stream_obj
+        _fan_out_list = context.fan_out_list
+        _count = 0
+        # 按流位置判断是否采样，每个流对象只有一次比较的开销；不统计时采样位置为sys.maxsize，不会采样
+        _sample_pos = context.sample_pos
+        _sample_step = self._get_sample_step() * self._stats_sample_rate
+        _timing = False  # 本次获取的流对象是否采样（记录处理函数的执行时间）
+        _fetch_count = 0  # 按块获取时未计入统计的获取次数
         try:
-            _pos = self._current_position(_stream_obj)
             while True:
                 try:
                     # 判断是否暂停或退出
                     if self._force_stop_tag:
                         # 强制退出
-                        _closed_status = EnumStreamClosedStatus.ForceStop
-                        return
-                    if self._stream_list_tag[stream_tag][0]:
+                        context.closed_status = EnumStreamClosedStatus.ForceStop
+                        return EnumStreamDealStatus.End
+                    if self._stream_list_tag[_stream_tag][0]:
                         # 当前流的停止标记
-                        _closed_status = EnumStreamClosedStatus.CallStop
-                        return
-                    if self._stream_list_tag[stream_tag][1]:
+                        context.closed_status = EnumStreamClosedStatus.CallStop
+                        return EnumStreamDealStatus.End
+                    if self._stream_list_tag[_stream_tag][1]:
                         # 当前流的暂停标记
-                        time.sleep(0.01)
-                        continue
+                        return EnumStreamDealStatus.Pause
+                    if max_count > 0:
+                        if _count >= max_count:
+                            return EnumStreamDealStatus.Yield
+                        _count += 1
 
                     # 循环进行流处理
-                    _pos = self._current_position(_stream_obj)
-                    _get_obj = self._next(_stream_obj)
-                    for _handle in self._dealer_handles:
-                        # 根据配置循环进行流处理
-                        try:
-                            _handle(_get_obj, _pos)
-                        except:
-                            # 先输出日志
-                            _error_obj = sys.exc_info()
-                            _trace_str = traceback.format_exc()
-                            if self._logger is not None:
-                                _log_str = 'stream deal exception(%s):\n%s' % (
-                                    str(_handle),
-                                    _trace_str
-                                )
-                            # 通知函数
-                            if self._dealer_exception_fun is not None:
+                    context.pos = _pos = self._current_position(_stream_obj)
+                    if self._batch_size > 0:
+                        _get_obj = self._next_batch(_stream_obj, self._batch_size)
+                        _fetch_count += 1
+                    else:
+                        _get_obj = self._next(_stream_obj)
+                    if _pos >= _sample_pos:
+                        # 采样时同步更新统计的流对象数量，使流处理过程中可获取到统计信息
+                        _timing = True
+                        _sample_pos = _pos + _sample_step
+                        self._add_stats_count(context, _fetch_count)
+                        _fetch_count = 0
+                    if _fan_out_list is not None:
+                        # 并行分发，队列满时在此等待（反压）
+                        if context.fan_out_exit.is_set():
+                            context.closed_status = EnumStreamClosedStatus.ExceptionExit
+                            return EnumStreamDealStatus.End
+                        _fan_out_item = (_get_obj, _pos, context.fan_out_seq, self._current_position(_stream_obj),
+                                         _timing)
+                        _timing = False
+                        context.fan_out_seq += 1
+                        for _dealer_queue, _dealer_thread, _progress in _fan_out_list:
+                            _dealer_queue.put(_fan_out_item)
+                    elif _timing:
+                        # 采样，记录各处理函数的执行时间
+                        _timing = False
+                        if self._call_dealers_timing(context, _get_obj, _pos):
+                            context.closed_status = EnumStreamClosedStatus.ExceptionExit
+                            return EnumStreamDealStatus.End
+                    else:
+                        for _handle, _is_batch in self._dealer_handles.items():
+                            # 根据配置循环进行流处理
+                            if _is_batch or self._batch_size <= 0:
                                 try:
-                                    self._dealer_exception_fun(stream_tag=stream_tag, stream_obj=_stream_obj,
-                                                               deal_obj=_get_obj, position=_pos, dealer_handle=_handle,
-                                                               error_obj=_error_obj, trace_str=_trace_str)
+                                    _handle(_get_obj, _pos)
                                 except:
-                                    if self._logger is not None:
-                                        _log_str = 'call dealer_exception_fun exception(%s):\n%s' % (
-                                            str(_handle),
-                                            traceback.format_exc()
-                                        )
-                                        self._logger.error(_log_str)
-                            # 判断是否要退出
-                            if self._stop_by_excepiton:
-                                _closed_status = EnumStreamClosedStatus.ExceptionExit
-                                return
+                                    if self._deal_exception(_stream_tag, _stream_obj, _get_obj, _pos, _handle):
+                                        context.closed_status = EnumStreamClosedStatus.ExceptionExit
+                                        return EnumStreamDealStatus.End
+                            else:
+                                # 逐个处理的处理函数，将块拆分为逐个对象处理
+                                for _index, _item in enumerate(_get_obj):
+                                    try:
+                                        _handle(_item, _pos + _index)
+                                    except:
+                                        if self._deal_exception(_stream_tag, _stream_obj, _item, _pos + _index,
+                                                                _handle):
+                                            context.closed_status = EnumStreamClosedStatus.ExceptionExit
+                                            return EnumStreamDealStatus.End
+
+                    # 定时保存检查点
+                    if context.checkpoint_time is not None and time.monotonic() >= context.checkpoint_time:
+                        if _fan_out_list is not None:
+                            # 并行分发时保存各处理函数中处理最慢的位置
+                            self._save_checkpoint(_stream_tag, self._fan_out_position(context))
+                        else:
+                            self._save_checkpoint(_stream_tag, self._current_position(_stream_obj))
+                        context.checkpoint_time = time.monotonic() + self._checkpoint_interval
 
                     # 准备执行下一个
-                    time.sleep(0.01)
+                    if self._throttle_time > 0:
+                        time.sleep(self._throttle_time)
                 except StopIteration:
                     if self._keep_wait_data:
-                        # 没有获取到数据，但继续循环尝试获取
-                        time.sleep(0.01)
-                        continue
+                        # 没有获取到数据，等待新数据
+                        return EnumStreamDealStatus.Wait
                     else:
                         # 已经到结尾了，结束流处理
-                        return
+                        return EnumStreamDealStatus.End
+                except EOFError:
+                    # 数据源已关闭，无论是否keep_wait_data都结束流处理
+                    return EnumStreamDealStatus.End
         finally:
-            # 关闭流处理
+            context.sample_pos = _sample_pos
+            if context.stats is not None:
+                # 更新统计的流对象数量
+                self._add_stats_count(context, _fetch_count)
+
+    def _stream_deal_end(self, context):
+        """
+        @fun 结束流处理
+        @funName _stream_deal_end
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 等待并行分发的处理线程完成，保存检查点，关闭流并清除登记
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+
+        """
+        _stream_tag = context.stream_tag
+        _stream_obj = context.stream_obj
+        if context.fan_out_list is not None:
+            # 通知并行分发的处理线程结束，并等待已分发的对象处理完成
+            for _dealer_queue, _dealer_thread, _progress in context.fan_out_list:
+                _dealer_queue.put(None)
+            for _dealer_queue, _dealer_thread, _progress in context.fan_out_list:
+                _dealer_thread.join()
+            if context.fan_out_exit.is_set():
+                context.closed_status = EnumStreamClosedStatus.ExceptionExit
+
+        if self._checkpoint_file is not None:
+            # 保存流结束时的检查点
+            if context.closed_status == EnumStreamClosedStatus.RunOver:
+                self._save_checkpoint(_stream_tag, None)
+            elif context.fan_out_list is not None:
+                # 并行分发时保存各处理函数中处理最慢（或出现异常）的位置
+                self._save_checkpoint(_stream_tag, self._fan_out_position(context))
+            elif context.closed_status == EnumStreamClosedStatus.ExceptionExit:
+                self._save_checkpoint(_stream_tag, context.pos)
+            else:
+                self._save_checkpoint(_stream_tag, self._current_position(_stream_obj))
+
+        # 关闭流处理
+        self._release_stream(_stream_tag, _stream_obj, context.pos, context.closed_status)
+
+    def _open_stream(self, stream_tag, is_pause=False, seek_position=None, move_next_step=None,
+                     move_forward_step=None, is_generator=False, **kwargs):
+        """
+        @fun 打开流对象并登记到流处理列表
+        @funName _open_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 打开流对象并移动到指定位置，移动位置失败时关闭流并清除登记
+        @funExcepiton:
+            KeyError stream_tag已经存在时，抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {bool} is_pause 登记的暂停标记
+        @funParam {int} seek_position 打开后先移动到指定的位置
+        @funParam {int} move_next_step 打开后先向后移动指定步数
+        @funParam {int} move_forward_step 打开后先向前移动指定步数
+        @funParam {bool} is_generator 是否通过生成器获取，stop_stream不等待这类流关闭
+        @funParam {dict} kwargs 打开流的动态key-value方式参数
+
+        @funReturn {object} _init_stream生成的流对象
+
+        """
+        self._stream_list_lock.acquire()
+        try:
+            if stream_tag in self._stream_list.keys():
+                # 流处理标识不能重复
+                raise KeyError(u'处理标识已存在')
+
+            # 打开流对象
+            _stream_obj = self._init_stream(**kwargs)
+            self._stream_list[stream_tag] = _stream_obj
+            self._stream_list_tag[stream_tag] = (False, is_pause)
+            if is_generator:
+                self._stream_generator_tags.add(stream_tag)
+        finally:
+            self._stream_list_lock.release()
+
+        # 处理流位置
+        try:
+            if seek_position is not None:
+                self._seek(stream_obj=_stream_obj, position=seek_position)
+            elif move_next_step is not None:
+                self._move_next(stream_obj=_stream_obj, step=move_next_step)
+            elif move_forward_step is not None:
+                self._move_forward(stream_obj=_stream_obj, step=move_forward_step)
+        except Exception:
+            # 移动位置失败，关闭流（例如打开的文件）并清除流处理标识后再抛出异常
+            self._stream_list_lock.acquire()
+            try:
+                self._close_stream(_stream_obj)
+                self._stream_list.pop(stream_tag, None)
+                self._stream_list_tag.pop(stream_tag, None)
+                self._stream_generator_tags.discard(stream_tag)
+            finally:
+                self._stream_list_lock.release()
+            raise
+
+        return _stream_obj
+
+    def _release_stream(self, stream_tag, stream_obj, position, closed_status):
+        """
+        @fun 结束流处理
+        @funName _release_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 调用流结束通知函数，关闭流对象，从流处理列表清除（包括统计信息）并通知等待流关闭的线程
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {object} stream_obj 流对象
+        @funParam {object} position 流结束时的位置
+        @funParam {EnumStreamClosedStatus} closed_status 关闭状态
+
+        """
+        try:
+            if self._stream_closed_fun is not None:
+                if stream_tag in self._stream_stats.keys():
+                    # 有统计信息时通过stats参数传入
+                    self._stream_closed_fun(stream_tag=stream_tag, stream_obj=stream_obj,
+                                            position=position, closed_status=closed_status,
+                                            stats=self.stats(stream_tag))
+                else:
+                    self._stream_closed_fun(stream_tag=stream_tag, stream_obj=stream_obj,
+                                            position=position, closed_status=closed_status)
+        except:
+            if self._logger is not None:
+                _log_str = 'call stream_closed_fun exception:\n%s' % traceback.format_exc()
+                self._logger.error(_log_str)
+        try:
+            self._close_stream(stream_obj=stream_obj)
+        except:
+            if self._logger is not None:
+                _log_str = 'call close_stream exception:\n%s' % traceback.format_exc()
+                self._logger.error(_log_str)
+
+        # 清空流列表，并通知等待流关闭的线程
+        self._stream_list_cond.acquire()
+        try:
+            del self._stream_list[stream_tag]
+            del self._stream_list_tag[stream_tag]
+            self._stream_generator_tags.discard(stream_tag)
+            self._stream_scheduler.pop(stream_tag, None)
+            self._stream_stats.pop(stream_tag, None)
+            self._stream_list_cond.notify_all()
+        finally:
+            self._stream_list_cond.release()
+
+    def _wait_data(self, stream_tag):
+        """
+        @fun keep_wait_data模式下没有获取到数据时的等待
+        @funName _wait_data
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription _next自行阻塞等待数据的流直接返回，否则最多等待10毫秒（停止时可立即被唤醒）
+
+        @funParam {string} stream_tag 流处理标签
+
+        """
+        if self._blocking_next:
+            return
+        self._stream_list_cond.acquire()
+        try:
+            if not self._stream_list_tag[stream_tag][0]:
+                self._stream_list_cond.wait(0.01)
+        finally:
+            self._stream_list_cond.release()
+
+    @staticmethod
+    def _get_checkpoint_lock(checkpoint_file):
+        """
+        @fun 获取检查点文件的读写锁
+        @funName _get_checkpoint_lock
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 同一检查点文件（按绝对路径）的所有流对象共用一个锁，避免读改写过程中互相覆盖更新；
+            只保证同一进程内的互斥，多个进程不能共用同一个检查点文件
+
+        @funParam {string} checkpoint_file 检查点文件路径
+
+        @funReturn {threading.RLock} 读写锁
+
+        """
+        _path = os.path.abspath(checkpoint_file)
+        BaseStream._checkpoint_locks_lock.acquire()
+        try:
+            if _path not in BaseStream._checkpoint_locks.keys():
+                BaseStream._checkpoint_locks[_path] = threading.RLock()
+            return BaseStream._checkpoint_locks[_path]
+        finally:
+            BaseStream._checkpoint_locks_lock.release()
+
+    def _load_checkpoint(self, stream_tag):
+        """
+        @fun 获取检查点位置
+        @funName _load_checkpoint
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 从检查点文件获取指定stream_tag的位置
+        @funExcepiton:
+            AttributeError 未设置checkpoint_file时抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+
+        @funReturn {object} 检查点位置，没有检查点时返回None
+
+        """
+        if self._checkpoint_file is None:
+            raise AttributeError(u'未设置检查点文件')
+        self._checkpoint_lock.acquire()
+        try:
+            if not os.path.exists(self._checkpoint_file):
+                return None
+            with open(self._checkpoint_file, 'r', encoding='utf-8') as _file:
+                return json.load(_file).get(stream_tag, None)
+        finally:
+            self._checkpoint_lock.release()
+
+    def _save_checkpoint(self, stream_tag, position):
+        """
+        @fun 保存检查点位置
+        @funName _save_checkpoint
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 更新检查点文件中指定stream_tag的位置，先写入临时文件（每次使用唯一的文件名）再改名覆盖，
+            保证检查点文件完整；保存失败只输出日志，不影响流处理
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {object} position 流位置，None代表删除该stream_tag的检查点
+
+        """
+        self._checkpoint_lock.acquire()
+        try:
+            _checkpoints = dict()
+            if os.path.exists(self._checkpoint_file):
+                with open(self._checkpoint_file, 'r', encoding='utf-8') as _file:
+                    _checkpoints = json.load(_file)
+            if position is None:
+                _checkpoints.pop(stream_tag, None)
+            else:
+                _checkpoints[stream_tag] = position
+            _fd, _temp_file = tempfile.mkstemp(
+                suffix='.tmp', prefix='%s.' % os.path.basename(self._checkpoint_file),
+                dir=os.path.dirname(os.path.abspath(self._checkpoint_file))
+            )
             try:
-                if self._stream_closed_fun is not None:
-                    self._stream_closed_fun(stream_tag=stream_tag, stream_obj=_stream_obj,
-                                            position=_pos, closed_status=_closed_status)
+                with os.fdopen(_fd, 'w', encoding='utf-8') as _file:
+                    json.dump(_checkpoints, _file)
+                    _file.flush()
+                    os.fsync(_file.fileno())
+                os.replace(_temp_file, self._checkpoint_file)
             except:
-                if self._logger is not None:
-                    _log_str = 'call stream_closed_fun exception:\n%s' % traceback.format_exc()
-                    self._logger.error(_log_str)
+                if os.path.exists(_temp_file):
+                    os.remove(_temp_file)
+                raise
+        except:
+            if self._logger is not None:
+                _log_str = 'save checkpoint exception:\n%s' % traceback.format_exc()
+                self._logger.error(_log_str)
+        finally:
+            self._checkpoint_lock.release()
+
+    def _notify_scheduler(self, stream_tag):
+        """
+        @fun 通知调度器流的处理标记已变化
+        @funName _notify_scheduler
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流由调度器处理且处于暂停挂起状态时，由调度器重新安排执行（判断恢复或停止）；
+            需在持有_stream_list_lock时调用
+
+        @funParam {string} stream_tag 流处理标签
+
+        """
+        _scheduler = self._stream_scheduler.get(stream_tag, None)
+        if _scheduler is not None:
+            _scheduler._wake(stream_tag)
+
+    @staticmethod
+    def _fan_out_position(context):
+        """
+        @fun 获取并行分发模式下可继续处理的位置
+        @funName _fan_out_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 取各处理函数进度中顺序键最小的位置，即处理最慢或出现异常的处理函数需继续处理的位置
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+
+        @funReturn {object} 流位置
+
+        """
+        return min([_progress[0] for _dealer_queue, _dealer_thread, _progress in context.fan_out_list],
+                   key=lambda _item: _item[0])[1]
+
+    def _fan_out_deal_fun(self, context, dealer_handle, is_batch, dealer_queue, progress):
+        """
+        @fun 并行分发模式下单个处理函数的处理线程
+        @funName _fan_out_deal_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 按顺序从处理函数的队列获取流对象并执行处理，获取到None时结束；
+            出现异常需中止流处理时设置fan_out_exit，之后的流对象只从队列取出不再处理（异常位置之前的流对象仍正常处理），
+            避免流处理线程在队列上阻塞；
+            progress[0]记录(顺序键, 继续处理的位置)：完成第seq个流对象后为((seq + 1, 0), 下一个流对象的位置)，
+            出现异常需中止时为((seq, 1), 出现异常的位置)，顺序键越小代表处理越慢
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+        @funParam {fun} dealer_handle 处理函数
+        @funParam {bool} is_batch 处理函数是否按块处理
+        @funParam {queue.Queue} dealer_queue 处理函数的队列，对象为(流对象, 位置, 顺序号, 下一个流对象的位置, 是否采样)；
+            是否采样由流处理线程每次获取流对象时统一判断，采样时记录处理函数的执行时间
+        @funParam {list} progress 处理进度，单元素列表
+
+        """
+        _stream_tag = context.stream_tag
+        _stream_obj = context.stream_obj
+        while True:
+            _item = dealer_queue.get()
+            if _item is None:
+                return
+
+            _get_obj, _pos, _seq, _next_pos, _timing = _item
+            if context.fan_out_exit.is_set() and _seq >= context.fan_out_fail_seq:
+                continue
+
+            _fail_pos = None
+            if _timing:
+                _start_ns = time.perf_counter_ns()
+            if is_batch or self._batch_size <= 0:
+                try:
+                    dealer_handle(_get_obj, _pos)
+                except:
+                    if self._deal_exception(_stream_tag, _stream_obj, _get_obj, _pos, dealer_handle):
+                        _fail_pos = _pos
+            else:
+                # 逐个处理的处理函数，将块拆分为逐个对象处理
+                for _index, _obj in enumerate(_get_obj):
+                    try:
+                        dealer_handle(_obj, _pos + _index)
+                    except:
+                        if self._deal_exception(_stream_tag, _stream_obj, _obj, _pos + _index, dealer_handle):
+                            _fail_pos = _pos + _index
+                            break
+            if _timing:
+                self._add_dealer_time(context.stats, dealer_handle, time.perf_counter_ns() - _start_ns)
+            if _fail_pos is None:
+                progress[0] = ((_seq + 1, 0), _next_pos)
+            else:
+                # 先记录出现异常的位置再设置中止标记，保证流处理结束时可获取到该位置
+                progress[0] = ((_seq, 1), _fail_pos)
+                context.fan_out_lock.acquire()
+                try:
+                    if context.fan_out_fail_seq is None or _seq < context.fan_out_fail_seq:
+                        context.fan_out_fail_seq = _seq
+                    context.fan_out_exit.set()
+                finally:
+                    context.fan_out_lock.release()
+
+    def _create_stats(self, stream_tag):
+        """
+        @fun 创建流处理的统计对象
+        @funName _create_stats
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 创建统计对象并登记到统计列表，供stats获取
+
+        @funParam {string} stream_tag 流处理标签
+
+        @funReturn {object} 统计对象，属性如下：
+            start_time : float 开始处理的时间（time.monotonic）
+            fetch_count : int 获取流对象的次数（按块获取时每块算一次）
+            item_count : int 已获取的流对象数量
+            dealers : dict 各处理函数的统计对象，key为处理函数，value见_get_dealer_stats
+            lock : threading.Lock 读写执行时间样本的锁
+
+        """
+        _stats = NullObj()
+        _stats.start_time = time.monotonic()
+        _stats.fetch_count = 0
+        _stats.item_count = 0
+        _stats.dealers = dict()
+        _stats.lock = threading.Lock()
+        for _handle in list(self._dealer_handles.keys()):
+            self._get_dealer_stats(_stats, _handle)
+        self._stream_list_lock.acquire()
+        try:
+            self._stream_stats[stream_tag] = _stats
+        finally:
+            self._stream_list_lock.release()
+        return _stats
+
+    @staticmethod
+    def _get_dealer_stats(stats, dealer_handle):
+        """
+        @fun 获取处理函数的统计对象
+        @funName _get_dealer_stats
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 不存在时创建（流处理过程中可能新增处理函数）
+
+        @funParam {object} stats 统计对象
+        @funParam {fun} dealer_handle 处理函数
+
+        @funReturn {object} 处理函数的统计对象，属性如下：
+            sample_count : int 记录执行时间的采样次数
+            total_ns : int 采样的执行时间合计，单位为纳秒
+            samples : collections.deque 最近的执行时间样本（最多1024个），用于计算p99
+            exception_count : int 出现异常的次数
+
+        """
+        _dealer_stats = stats.dealers.get(dealer_handle, None)
+        if _dealer_stats is None:
+            _dealer_stats = NullObj()
+            _dealer_stats.sample_count = 0
+            _dealer_stats.total_ns = 0
+            _dealer_stats.samples = collections.deque(maxlen=1024)
+            _dealer_stats.exception_count = 0
+            _dealer_stats = stats.dealers.setdefault(dealer_handle, _dealer_stats)
+        return _dealer_stats
+
+    def _get_sample_step(self):
+        """
+        @fun 获取每次获取流对象的位置步长
+        @funName _get_sample_step
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 按块获取时为块大小，逐个获取时为1，用于按流位置计算采样位置
+
+        @funReturn {int} 位置步长
+
+        """
+        return self._batch_size if self._batch_size > 0 else 1
+
+    def _add_stats_count(self, context, fetch_count):
+        """
+        @fun 更新统计的流对象数量
+        @funName _add_stats_count
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 只由流处理线程调用（采样及退出处理循环时）；流对象数量按上一次更新后的流位置变化计算，
+            无需逐个对象计数；处理过程中向前移动流位置时不减少已统计的数量
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+        @funParam {int} fetch_count 按块获取时新增的获取流对象次数（逐个获取时与流对象数量相同，忽略该参数）
+
+        """
+        _pos = self._current_position(context.stream_obj)
+        _item_count = max(0, _pos - context.stats_pos)
+        context.stats_pos = _pos
+        context.stats.fetch_count += (fetch_count if self._batch_size > 0 else _item_count)
+        context.stats.item_count += _item_count
+
+    def _call_dealers_timing(self, context, get_obj, pos):
+        """
+        @fun 调用各处理函数并记录执行时间
+        @funName _call_dealers_timing
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 采样时由流处理线程调用，处理逻辑与_stream_deal_run中的顺序调用一致
+
+        @funParam {object} context _stream_deal_begin生成的流处理上下文
+        @funParam {object} get_obj 获取到的流对象（按块获取时为块）
+        @funParam {int} pos 流对象的位置
+
+        @funReturn {bool} 是否需中止流处理（处理函数出现异常且需中止）
+
+        """
+        for _handle, _is_batch in self._dealer_handles.items():
+            _start_ns = time.perf_counter_ns()
+            if _is_batch or self._batch_size <= 0:
+                try:
+                    _handle(get_obj, pos)
+                except:
+                    if self._deal_exception(context.stream_tag, context.stream_obj, get_obj, pos, _handle):
+                        return True
+            else:
+                # 逐个处理的处理函数，将块拆分为逐个对象处理
+                for _index, _item in enumerate(get_obj):
+                    try:
+                        _handle(_item, pos + _index)
+                    except:
+                        if self._deal_exception(context.stream_tag, context.stream_obj, _item, pos + _index,
+                                                _handle):
+                            return True
+            self._add_dealer_time(context.stats, _handle, time.perf_counter_ns() - _start_ns)
+        return False
+
+    def _add_dealer_time(self, stats, dealer_handle, used_ns):
+        """
+        @fun 记录处理函数的一次执行时间样本
+        @funName _add_dealer_time
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 功能描述
+
+        @funParam {object} stats 统计对象
+        @funParam {fun} dealer_handle 处理函数
+        @funParam {int} used_ns 处理一次获取的流对象的执行时间，单位为纳秒
+
+        """
+        _dealer_stats = self._get_dealer_stats(stats, dealer_handle)
+        stats.lock.acquire()
+        try:
+            _dealer_stats.sample_count += 1
+            _dealer_stats.total_ns += used_ns
+            _dealer_stats.samples.append(used_ns)
+        finally:
+            stats.lock.release()
+
+    def _deal_exception(self, stream_tag, stream_obj, deal_obj, position, dealer_handle):
+        """
+        @fun 处理函数出现异常时的处理
+        @funName _deal_exception
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 在except中调用，执行dealer_exception_fun通知
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {object} stream_obj 流对象
+        @funParam {object} deal_obj 正在处理的流对象（按块处理时为整块数据）
+        @funParam {object} position 正在处理的流对象的位置
+        @funParam {fun} dealer_handle 出现异常的处理函数
+
+        @funReturn {bool} 是否要中止流处理
+
+        """
+        # 统计异常数量
+        _stats = self._stream_stats.get(stream_tag, None)
+        if _stats is not None:
+            self._get_dealer_stats(_stats, dealer_handle).exception_count += 1
+
+        # 先输出日志
+        _error_obj = sys.exc_info()
+        _trace_str = traceback.format_exc()
+        if self._logger is not None:
+            _log_str = 'stream deal exception(%s):\n%s' % (
+                str(dealer_handle),
+                _trace_str
+            )
+        # 通知函数
+        if self._dealer_exception_fun is not None:
             try:
-                self._close_stream(stream_obj=_stream_obj)
+                self._dealer_exception_fun(stream_tag=stream_tag, stream_obj=stream_obj,
+                                           deal_obj=deal_obj, position=position, dealer_handle=dealer_handle,
+                                           error_obj=_error_obj, trace_str=_trace_str)
             except:
                 if self._logger is not None:
-                    _log_str = 'call close_stream exception:\n%s' % traceback.format_exc()
+                    _log_str = 'call dealer_exception_fun exception(%s):\n%s' % (
+                        str(dealer_handle),
+                        traceback.format_exc()
+                    )
                     self._logger.error(_log_str)
-
-            # 情况流列表
-            self._stream_list_lock.acquire()
-            del self._stream_list[stream_tag]
-            del self._stream_list_tag[stream_tag]
-            self._stream_list_lock.release()
+        # 判断是否要退出
+        return self._stop_by_excepiton
 
     @classmethod
     def _stream_deal_fun_decorator(cls, tid=0, stream_obj=None, stop_by_excepiton=False, logger=None,
                                    dealer_exception_fun=None, stream_closed_fun=None, stream_tag='stream_dealer',
-                                   dealer_fun=None, **kwargs_dealer_fun):
+                                   dealer_fun=None, throttle_time=0, batch_size=0, **kwargs_dealer_fun):
         """
         @fun 函数修饰符方式流处理的处理函数
         @funName _stream_deal_fun_decorator
@@ -270,29 +1019,26 @@ class BaseStream(ABC):
             deal_obj : object 要处理所取出的流数据
             position : object 正在处理的流对象的位置
             kwargs ：dict 原函数对象执行传入的动态key-value参数
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取流对象的块大小，0代表逐个获取；按块获取时dealer_fun传入整块数据及块的开始位置
         @funParam {dict} kwargs_dealer_fun 原函数对象执行传入的动态key-value参数
 
         """
         try:
             _closed_status = EnumStreamClosedStatus.RunOver
             _pos = cls._current_position(stream_obj)
-            # 组织动态函数，目的是传入对应的参数
-            _exec_fun_str = 'dealer_fun(_get_obj, _pos'
-            for _key in kwargs_dealer_fun.keys():
-                _exec_fun_str = '%s, %s=%s' % (
-                    _exec_fun_str,
-                    _key,
-                    'kwargs_dealer_fun[\'' + _key + '\']'
-                )
-            _exec_fun_str = _exec_fun_str + ')'
+            # 预先绑定原函数的动态参数，每个流对象直接调用，无需逐个组织参数
+            _dealer = functools.partial(dealer_fun, **kwargs_dealer_fun) if kwargs_dealer_fun else dealer_fun
             while True:
                 try:
                     # 循环进行流处理
                     _pos = cls._current_position(stream_obj)
-                    _get_obj = cls._next(stream_obj=stream_obj)
+                    if batch_size > 0:
+                        _get_obj = cls._next_batch(stream_obj, batch_size)
+                    else:
+                        _get_obj = cls._next(stream_obj=stream_obj)
                     try:
-                        # dealer_fun(_get_obj, _pos, kwargs_dealer_fun)
-                        exec(_exec_fun_str)
+                        _dealer(_get_obj, _pos)
                     except:
                         # 先输出日志
                         _error_obj = sys.exc_info()
@@ -321,8 +1067,9 @@ class BaseStream(ABC):
                             return
 
                     # 准备执行下一个
-                    time.sleep(0.01)
-                except StopIteration:
+                    if throttle_time > 0:
+                        time.sleep(throttle_time)
+                except (StopIteration, EOFError):
                     # 已经到结尾了，结束流处理
                     return
         finally:
@@ -345,7 +1092,7 @@ class BaseStream(ABC):
     #############################
     # 公共处理函数
     #############################
-    def add_dealer(self, *args):
+    def add_dealer(self, *args, is_batch=False):
         """
         @fun 添加流数据处理函数句柄
         @funName add_dealer
@@ -354,10 +1101,12 @@ class BaseStream(ABC):
         @funDescription 添加流数据处理函数句柄
 
         @funParam {*args} args 要添加的处理函数句柄清单，可以随意增加多个
+        @funParam {bool} is_batch 是否按块处理的处理函数，按块获取（batch_size>0）时传入整块数据及块的开始位置:
+            逐个获取时传入的是单个对象
 
         """
         for _item in args:
-            self._dealer_handles[_item] = None
+            self._dealer_handles[_item] = is_batch
 
     def del_dealer(self, *args):
         """
@@ -416,7 +1165,8 @@ class BaseStream(ABC):
         @funVersion 版本
         @funDescription 从流中获取下一个对象，并将流指针指向下一个位置
         @funExcepiton:
-            StopIteration 如果到了流结尾，抛出该异常
+            StopIteration 如果到了流结尾（或_blocking_next为True时等待数据超时），抛出该异常
+            EOFError 数据源已关闭（例如socket连接断开），抛出该异常，keep_wait_data为True时也结束流处理
 
         @funParam {object} stream_obj _init_stream生成的流对象
 
@@ -425,6 +1175,32 @@ class BaseStream(ABC):
         """
         pass
 
+    @classmethod
+    def _next_batch(cls, stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 默认实现为循环调用_next组成列表，实现类可以重载为直接切片等更高效的方式
+        @funExcepiton:
+            StopIteration 如果到了流结尾（没有获取到任何对象），抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大对象数，到流结尾时返回的块可能小于该数量
+
+        @funReturn {list} 获取到的对象块（可枚举对象）
+
+        """
+        _block = list()
+        try:
+            while len(_block) < size:
+                _block.append(cls._next(stream_obj))
+        except StopIteration:
+            if len(_block) == 0:
+                raise
+        return _block
+
     @staticmethod
     @abstractmethod
     def _close_stream(stream_obj):
@@ -518,7 +1294,8 @@ class BaseStream(ABC):
     # 对外的通用流处理函数
     #############################
     def start_stream(self, stream_tag='default', is_sync=True, is_pause=False,
-                     seek_position=None, move_next_step=None, move_forward_step=None, **kwargs):
+                     seek_position=None, move_next_step=None, move_forward_step=None, resume=False, scheduler=None,
+                     **kwargs):
         """
         @fun 函数中文名
         @funName start_stream
@@ -534,33 +1311,29 @@ class BaseStream(ABC):
         @funParam {int} seek_position 执行流处理前先移动到指定的位置（与move_next_step、move_forward_step不能共存）
         @funParam {int} move_next_step 执行流处理前先向后移动指定步数（seek_position、move_forward_step不能共存）
         @funParam {int} move_forward_step 执行流处理前先向前移动指定步数（与move_next_step、seek_position不能共存）
+        @funParam {bool} resume 是否从检查点文件中该stream_tag的位置继续处理（需设置checkpoint_file），
+            有检查点时忽略seek_position、move_next_step、move_forward_step参数
+        @funParam {StreamScheduler} scheduler 异步处理时使用的调度器，None代表启动独立的线程处理（仅在is_sync为False时有效）
         @funParam {dict} kwargs 启动流处理的动态key-value方式参数
 
         """
-        self._stream_list_lock.acquire()
-        try:
-            if stream_tag in self._stream_list.keys():
-                # 流处理标识不能重复
-                raise KeyError(u'处理标识已存在')
+        if resume:
+            _checkpoint_position = self._load_checkpoint(stream_tag)
+            if _checkpoint_position is not None:
+                seek_position = _checkpoint_position
+                move_next_step = None
+                move_forward_step = None
 
-            # 打开流对象
-            _stream_obj = self._init_stream(**kwargs)
-            self._stream_list[stream_tag] = _stream_obj
-            self._stream_list_tag[stream_tag] = (False, is_pause)
-        finally:
-            self._stream_list_lock.release()
-
-        # 处理流位置
-        if seek_position is not None:
-            self._seek(stream_obj=_stream_obj, position=seek_position)
-        elif move_next_step is not None:
-            self._move_next(stream_obj=_stream_obj, step=move_next_step)
-        elif move_forward_step is not None:
-            self._move_forward(stream_obj=_stream_obj, step=move_forward_step)
+        # 打开流对象并处理流位置
+        self._open_stream(stream_tag, is_pause=is_pause, seek_position=seek_position,
+                          move_next_step=move_next_step, move_forward_step=move_forward_step, **kwargs)
 
         if is_sync:
             # 同步模式，直接处理流
             self._stream_deal_fun(stream_tag=stream_tag)
+        elif scheduler is not None:
+            # 异步模式，由调度器的线程池轮流处理
+            scheduler.add_stream(self, stream_tag)
         else:
             # 异步模式，通过线程方式处理
             _dealer_thread = threading.Thread(
@@ -571,6 +1344,136 @@ class BaseStream(ABC):
             _dealer_thread.setDaemon(True)
             _dealer_thread.start()
 
+    def iter_stream(self, stream_tag='default', seek_position=None, move_next_step=None, move_forward_step=None,
+                    **kwargs):
+        """
+        @fun 以生成器方式获取流对象
+        @funName iter_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 在调用方线程中按顺序获取流对象，返回(流对象, 位置)的生成器，不调用注册的处理函数，也不启动线程:
+            流在第一次获取对象时打开，并按stream_tag登记，因此获取过程中可调用seek、move_next、move_forward、
+            stop_stream移动位置或结束获取；流只在推进生成器时才会关闭，因此stop_stream对生成器获取的流不等待关闭，
+            而是设置停止标记后直接返回，生成器在下一次获取时结束；生成器结束或调用close时关闭流并调用stream_closed_fun；
+            batch_size大于0时获取的是(块, 块的开始位置)；暂停标记对生成器无效
+        @funExcepiton:
+            KeyError stream_tag已经存在时，抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {int} seek_position 获取前先移动到指定的位置（与move_next_step、move_forward_step不能共存）
+        @funParam {int} move_next_step 获取前先向后移动指定步数（seek_position、move_forward_step不能共存）
+        @funParam {int} move_forward_step 获取前先向前移动指定步数（与move_next_step、seek_position不能共存）
+        @funParam {dict} kwargs 打开流的动态key-value方式参数
+
+        @funReturn {generator} (流对象, 位置)的生成器
+
+        """
+        _stream_obj = self._open_stream(stream_tag, seek_position=seek_position, move_next_step=move_next_step,
+                                        move_forward_step=move_forward_step, is_generator=True, **kwargs)
+        _closed_status = EnumStreamClosedStatus.RunOver
+        _pos = self._current_position(_stream_obj)
+        try:
+            while True:
+                # 判断是否退出
+                if self._force_stop_tag:
+                    _closed_status = EnumStreamClosedStatus.ForceStop
+                    return
+                if self._stream_list_tag[stream_tag][0]:
+                    _closed_status = EnumStreamClosedStatus.CallStop
+                    return
+
+                _pos = self._current_position(_stream_obj)
+                try:
+                    if self._batch_size > 0:
+                        _get_obj = self._next_batch(_stream_obj, self._batch_size)
+                    else:
+                        _get_obj = self._next(_stream_obj)
+                except StopIteration:
+                    if self._keep_wait_data:
+                        self._wait_data(stream_tag)
+                        continue
+                    return
+                except EOFError:
+                    return
+                yield _get_obj, _pos
+        except GeneratorExit:
+            # 调用方关闭生成器
+            _closed_status = EnumStreamClosedStatus.CallStop
+            raise
+        finally:
+            self._release_stream(stream_tag, _stream_obj, _pos, _closed_status)
+
+    async def aiter_stream(self, stream_tag='default', seek_position=None, move_next_step=None,
+                           move_forward_step=None, **kwargs):
+        """
+        @fun 以异步生成器方式获取流对象
+        @funName aiter_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 与iter_stream一致（包括stop_stream不等待流关闭），用于async for:
+            非阻塞的流直接在事件循环中获取；_next自行阻塞等待数据的流（例如QueueStream、SocketStream）
+            通过事件循环的默认执行器获取，避免阻塞事件循环；keep_wait_data的等待使用asyncio.sleep
+        @funExcepiton:
+            KeyError stream_tag已经存在时，抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {int} seek_position 获取前先移动到指定的位置（与move_next_step、move_forward_step不能共存）
+        @funParam {int} move_next_step 获取前先向后移动指定步数（seek_position、move_forward_step不能共存）
+        @funParam {int} move_forward_step 获取前先向前移动指定步数（与move_next_step、seek_position不能共存）
+        @funParam {dict} kwargs 打开流的动态key-value方式参数
+
+        @funReturn {async_generator} (流对象, 位置)的异步生成器
+
+        """
+        _stream_obj = self._open_stream(stream_tag, seek_position=seek_position, move_next_step=move_next_step,
+                                        move_forward_step=move_forward_step, is_generator=True, **kwargs)
+        _closed_status = EnumStreamClosedStatus.RunOver
+        _pos = self._current_position(_stream_obj)
+        _loop = asyncio.get_running_loop()
+        if self._batch_size > 0:
+            _get_fun = functools.partial(self._next_batch, _stream_obj, self._batch_size)
+        else:
+            _get_fun = functools.partial(self._next, _stream_obj)
+
+        def _next_fun():
+            # StopIteration不能通过Future传递，转换为(是否获取到数据, 流对象)返回
+            try:
+                return True, _get_fun()
+            except StopIteration:
+                return False, None
+
+        try:
+            while True:
+                # 判断是否退出
+                if self._force_stop_tag:
+                    _closed_status = EnumStreamClosedStatus.ForceStop
+                    return
+                if self._stream_list_tag[stream_tag][0]:
+                    _closed_status = EnumStreamClosedStatus.CallStop
+                    return
+
+                _pos = self._current_position(_stream_obj)
+                try:
+                    if self._blocking_next:
+                        _has_data, _get_obj = await _loop.run_in_executor(None, _next_fun)
+                    else:
+                        _has_data, _get_obj = _next_fun()
+                except EOFError:
+                    return
+                if not _has_data:
+                    if self._keep_wait_data:
+                        if not self._blocking_next:
+                            await asyncio.sleep(0.01)
+                        continue
+                    return
+                yield _get_obj, _pos
+        except GeneratorExit:
+            # 调用方关闭生成器
+            _closed_status = EnumStreamClosedStatus.CallStop
+            raise
+        finally:
+            self._release_stream(stream_tag, _stream_obj, _pos, _closed_status)
+
     def stop_stream(self, stream_tag='default', is_wait=True):
         """
         @fun 关闭指定标签的流处理
@@ -583,10 +1486,11 @@ class BaseStream(ABC):
             KeyError 当传入的流标识不存在时抛出该异常
 
         @funParam {string} stream_tag 需要关闭的流处理标签
-        @funParam {bool} is_wait 是否等待流关闭后再返回
+        @funParam {bool} is_wait 是否等待流关闭后再返回；通过iter_stream/aiter_stream获取的流只在调用方推进生成器时
+            才会关闭，在获取过程中等待会导致死锁，因此对这类流不等待，生成器在下一次获取时结束
 
         """
-        self._stream_list_lock.acquire()
+        self._stream_list_cond.acquire()
         try:
             if not self._keep_wait_data:
                 # 自动关闭流，参数无效
@@ -596,17 +1500,17 @@ class BaseStream(ABC):
                 # 流标识不存在
                 raise KeyError(u'处理标识不存在')
 
-            # 设置停止标签
+            # 设置停止标签，并通知暂停中的流
             self._stream_list_tag[stream_tag] = (True, self._stream_list_tag[stream_tag][1])
-        finally:
-            self._stream_list_lock.release()
+            self._stream_list_cond.notify_all()
+            self._notify_scheduler(stream_tag)
 
-        # 是否等待关闭后才返回
-        if is_wait:
-            while True:
-                if stream_tag not in self._stream_list.keys():
-                    break
-                time.sleep(0.01)
+            # 是否等待关闭后才返回，流关闭时会通知条件
+            if is_wait and stream_tag not in self._stream_generator_tags:
+                while stream_tag in self._stream_list.keys():
+                    self._stream_list_cond.wait()
+        finally:
+            self._stream_list_cond.release()
 
     def pause_stream(self, stream_tag='default'):
         """
@@ -651,8 +1555,10 @@ class BaseStream(ABC):
                 # 流标识不存在
                 raise KeyError(u'处理标识不存在')
 
-            # 设置暂停标签
+            # 设置暂停标签，并通知暂停中的流
             self._stream_list_tag[stream_tag] = (self._stream_list_tag[stream_tag][0], False)
+            self._stream_list_cond.notify_all()
+            self._notify_scheduler(stream_tag)
         finally:
             self._stream_list_lock.release()
 
@@ -664,16 +1570,21 @@ class BaseStream(ABC):
         @funVersion 版本
         @funDescription 强制关闭当前所有正在处理的流
 
-        @funParam {bool} is_wait 是否等待所有流关闭后再返回
+        @funParam {bool} is_wait 是否等待所有流关闭后再返回，不等待通过iter_stream/aiter_stream获取的流（参考stop_stream）
 
         """
-        self._force_stop_tag = True
-        if is_wait:
-            # 检查是否都已停止
-            while True:
-                if len(self._stream_list_tag.keys()) == 0:
-                    break
-                time.sleep(0.01)
+        self._stream_list_cond.acquire()
+        try:
+            self._force_stop_tag = True
+            self._stream_list_cond.notify_all()
+            for _stream_tag in list(self._stream_scheduler.keys()):
+                self._notify_scheduler(_stream_tag)
+            if is_wait:
+                # 检查是否都已停止，流关闭时会通知条件
+                while len(set(self._stream_list_tag.keys()) - self._stream_generator_tags) > 0:
+                    self._stream_list_cond.wait()
+        finally:
+            self._stream_list_cond.release()
 
     def seek(self, position, stream_tag='default'):
         """
@@ -769,10 +1680,80 @@ class BaseStream(ABC):
         # 执行移动
         self._move_forward(stream_obj=_stream_obj, step=step)
 
+    def stats(self, stream_tag='default'):
+        """
+        @fun 获取流处理的统计信息
+        @funName stats
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 需在构造函数设置stats_sample_rate大于0，且通过start_stream处理；
+            处理函数的执行时间为采样数据，累计时间按平均执行时间乘以获取流对象次数估算
+        @funExcepiton:
+            KeyError 当传入的流标识不存在或未统计时抛出该异常
+
+        @funParam {string} stream_tag 需要处理的流处理标签
+
+        @funReturn {dict} 统计信息，格式如下：
+            stream_tag : string 流处理标签
+            sample_rate : int 采样间隔
+            item_count : int 已处理的流对象数量
+            elapsed_seconds : float 已处理时长，单位为秒
+            items_per_second : float 每秒处理的流对象数量
+            exception_count : int 处理函数出现异常的次数合计
+            dealers : list 各处理函数的统计信息，每项为dict：
+                dealer : fun 处理函数
+                name : string 处理函数名
+                sample_count : int 记录执行时间的采样次数
+                total_seconds : float 估算的累计执行时间，单位为秒
+                avg_us : float 平均执行时间（每次获取的流对象），单位为微秒
+                p99_us : float 最近1024个样本的p99执行时间，单位为微秒
+                exception_count : int 出现异常的次数
+
+        """
+        _stats = self._stream_stats.get(stream_tag, None)
+        if _stats is None:
+            raise KeyError(u'处理标识不存在或未统计')
+
+        _elapsed = time.monotonic() - _stats.start_time
+        _dealers = list()
+        _exception_count = 0
+        for _handle, _dealer_stats in list(_stats.dealers.items()):
+            _stats.lock.acquire()
+            try:
+                _sample_count = _dealer_stats.sample_count
+                _total_ns = _dealer_stats.total_ns
+                _samples = sorted(_dealer_stats.samples)
+            finally:
+                _stats.lock.release()
+            _avg_ns = _total_ns / _sample_count if _sample_count > 0 else 0
+            _p99_ns = 0
+            if len(_samples) > 0:
+                # 最近排名法计算百分位数
+                _p99_ns = _samples[max(0, min(len(_samples) - 1, int(len(_samples) * 0.99 + 0.5) - 1))]
+            _exception_count += _dealer_stats.exception_count
+            _dealers.append({
+                'dealer': _handle,
+                'name': getattr(_handle, '__name__', str(_handle)),
+                'sample_count': _sample_count,
+                'total_seconds': _avg_ns * _stats.fetch_count / 1000000000.0,
+                'avg_us': _avg_ns / 1000.0,
+                'p99_us': _p99_ns / 1000.0,
+                'exception_count': _dealer_stats.exception_count
+            })
+        return {
+            'stream_tag': stream_tag,
+            'sample_rate': self._stats_sample_rate,
+            'item_count': _stats.item_count,
+            'elapsed_seconds': _elapsed,
+            'items_per_second': _stats.item_count / _elapsed if _elapsed > 0 else 0,
+            'exception_count': _exception_count,
+            'dealers': _dealers
+        }
+
     @classmethod
     def stream_decorator(cls, stop_by_excepiton=False, logger=None, dealer_exception_fun=None, stream_closed_fun=None,
                          stream_tag='stream_dealer', is_sync=True, seek_position=None,
-                         move_next_step=None, move_forward_step=None):
+                         move_next_step=None, move_forward_step=None, throttle_time=0, batch_size=0):
         """
         @fun 流处理修饰函数
         @funName stream_decorator
@@ -800,6 +1781,8 @@ class BaseStream(ABC):
         @funParam {object} seek_position 执行流处理前先移动到指定的位置（与move_next_step、move_forward_step不能共存）
         @funParam {int} move_next_step 执行流处理前先向后移动指定步数（seek_position、move_forward_step不能共存）
         @funParam {int} move_forward_step 执行流处理前先向前移动指定步数（与move_next_step、seek_position不能共存）
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取流对象的块大小，0代表逐个获取；按块获取时修饰的函数传入整块数据及块的开始位置
 
         @funExample {python} 参考示例:
             @BaseStream.stream_dealer(stop_by_excepiton=True)
@@ -829,13 +1812,14 @@ class BaseStream(ABC):
                     cls._stream_deal_fun_decorator(tid=0, stream_obj=_stream_obj, stop_by_excepiton=stop_by_excepiton,
                                                    logger=logger, dealer_exception_fun=dealer_exception_fun,
                                                    stream_closed_fun=stream_closed_fun, stream_tag=stream_tag,
-                                                   dealer_fun=func, **kwargs_dealer)
+                                                   dealer_fun=func, throttle_time=throttle_time, batch_size=batch_size,
+                                                   **kwargs_dealer)
                 else:
                     # 异步模式，通过线程方式处理
                     _dealer_thread = threading.Thread(
                         target=cls._stream_deal_fun_decorator,
                         args=(1, _stream_obj, stop_by_excepiton, logger, dealer_exception_fun,
-                              stream_closed_fun, stream_tag, func),
+                              stream_closed_fun, stream_tag, func, throttle_time, batch_size),
                         kwargs=kwargs_dealer,
                         name='Thread-Decorator-Deal-Fun'
                     )
@@ -875,7 +1859,9 @@ class StringStream(BaseStream):
     #############################
     # 重载构造函数
     #############################
-    def __init__(self, stop_by_excepiton=False, logger=None, dealer_exception_fun=None, stream_closed_fun=None):
+    def __init__(self, stop_by_excepiton=False, logger=None, dealer_exception_fun=None, stream_closed_fun=None,
+                 throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, checkpoint_file=None, checkpoint_interval=0, stats_sample_rate=0):
         """
         @fun 重载构造函数
         @funName __init__
@@ -898,11 +1884,19 @@ class StringStream(BaseStream):
             stream_obj : object 流对象
             position : object 正在处理的流对象的位置
             closed_status : EnumStreamClosedStatus 关闭状态
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小（字符数），0代表逐个字符获取
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {string} checkpoint_file 检查点文件路径，None代表不保存检查点，参考BaseStream
+        @funParam {float} checkpoint_interval 保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
 
         """
         BaseStream.__init__(self, back_forward=True, keep_wait_data=False, stop_by_excepiton=stop_by_excepiton,
                             logger=logger, dealer_exception_fun=dealer_exception_fun,
-                            stream_closed_fun=stream_closed_fun)
+                            stream_closed_fun=stream_closed_fun, throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, checkpoint_file=checkpoint_file,
+                            checkpoint_interval=checkpoint_interval, stats_sample_rate=stats_sample_rate)
 
     #############################
     # 需继承类实现的内部处理函数
@@ -952,6 +1946,32 @@ class StringStream(BaseStream):
         stream_obj.pos = stream_obj.pos + 1
         return stream_obj.obj[stream_obj.pos - 1: stream_obj.pos]
 
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 直接返回字符串切片
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大字符数
+
+        @funReturn {string} 获取到的字符串块
+
+        """
+        _start = stream_obj.pos
+        if _start >= len(stream_obj.obj):
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = min(_start + size, len(stream_obj.obj))
+        return stream_obj.obj[_start: stream_obj.pos]
+
     @staticmethod
     def _close_stream(stream_obj):
         """
@@ -979,11 +1999,12 @@ class StringStream(BaseStream):
             EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
 
         @funParam {object} stream_obj _init_stream生成的流对象
-        @funParam {int} position 要移动到的位置（注意位置从0开始）
+        @funParam {int} position 要移动到的位置（注意位置从0开始），等于数据长度代表移动到结尾（例如从读完全部数据时
+            保存的检查点继续），之后获取不到数据，keep_wait_data为True时等待新数据
 
         """
-        if position < 0 or position >= len(stream_obj.obj):
-            # 已经超过结尾
+        if position < 0 or position > len(stream_obj.obj):
+            # 已经超过结尾（等于数据长度代表移动到结尾）
             raise EOFError(u'移动位置不在对象合法范围内')
         # 设置位置
         stream_obj.pos = position
@@ -1051,6 +2072,1714 @@ class StringStream(BaseStream):
         return stream_obj.pos
 
 
+class FileStream(BaseStream):
+    """
+    @class 文件流
+    @className FileStream
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 继承BaseStream，通过带缓存的二进制读取实现文件的流处理:
+        流对象为bytes（逐个获取为长度为1的bytes，按块获取为bytes块），位置为字节偏移（从0开始），
+        无论文件大小，内存占用只与缓存大小有关，移动位置为O(1)的文件seek
+
+    @classExample {Python} 参考示例:
+        _stream = FileStream(batch_size=65536)
+        _stream.add_dealer(dealer_fun, is_batch=True)
+        _stream.start_stream(stream_tag='default', is_sync=True, file_path='/var/log/my.log')
+
+    """
+
+    #############################
+    # 重载构造函数
+    #############################
+    def __init__(self, keep_wait_data=False, stop_by_excepiton=False, logger=None, dealer_exception_fun=None,
+                 stream_closed_fun=None, throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, checkpoint_file=None, checkpoint_interval=0, stats_sample_rate=0):
+        """
+        @fun 重载构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 重载构造函数，去掉无需设置的参数
+
+        @funParam {bool} keep_wait_data 到文件结尾后是否继续等待文件写入新数据（类似tail -f），需调用stop_stream关闭
+        @funParam {bool} stop_by_excepiton 当出现异常时是否中止流处理
+        @funParam {object} logger 出现错误时进行error输出的日志类（需实现error方法），None代表不输出日志
+        @funParam {fun} dealer_exception_fun 流处理异常时执行的通知函数,函数定义参考BaseStream
+        @funParam {fun} stream_closed_fun 流处理结束时执行的通知函数,函数定义参考BaseStream
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小（字节数），0代表逐个字节获取
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {string} checkpoint_file 检查点文件路径，None代表不保存检查点，参考BaseStream
+        @funParam {float} checkpoint_interval 保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
+
+        """
+        BaseStream.__init__(self, back_forward=True, keep_wait_data=keep_wait_data,
+                            stop_by_excepiton=stop_by_excepiton, logger=logger,
+                            dealer_exception_fun=dealer_exception_fun, stream_closed_fun=stream_closed_fun,
+                            throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, checkpoint_file=checkpoint_file,
+                            checkpoint_interval=checkpoint_interval, stats_sample_rate=stats_sample_rate)
+
+    #############################
+    # 需继承类实现的内部处理函数
+    #############################
+    @staticmethod
+    def _init_stream(**kwargs):
+        """
+        @fun 根据传入参数初始化流对象
+        @funName _init_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 以二进制只读方式打开文件
+
+        @funParam {string} file_path 需进行流处理的文件路径
+        @funParam {int} buffer_size 文件读取缓存大小，默认为65536
+
+        @funReturn {object} 返回具有两个属性的object对象:
+            obj : file 打开的文件对象
+            pos : int 流当前位置
+
+        """
+        _stream_obj = NullObj()
+        _stream_obj.obj = open(kwargs['file_path'], 'rb', buffering=kwargs.get('buffer_size', 65536))
+        _stream_obj.pos = 0
+        return _stream_obj
+
+    @staticmethod
+    def _next(stream_obj):
+        """
+        @fun 从流中获取下一个对象，并将流指针指向下一个位置
+        @funName _next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 从流中获取下一个对象，并将流指针指向下一个位置
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {bytes} 获取到的下一个位置的字节
+
+        """
+        _data = stream_obj.obj.read(1)
+        if len(_data) == 0:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + 1
+        return _data
+
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 直接读取指定大小的数据
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大字节数
+
+        @funReturn {bytes} 获取到的数据块
+
+        """
+        _data = stream_obj.obj.read(size)
+        if len(_data) == 0:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + len(_data)
+        return _data
+
+    @staticmethod
+    def _close_stream(stream_obj):
+        """
+        @fun 关闭流对象
+        @funName _close_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 关闭文件
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        """
+        stream_obj.obj.close()
+
+    @staticmethod
+    def _seek(stream_obj, position):
+        """
+        @fun 移动到流的指定位置
+        @funName _seek
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 移动到流的指定位置
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} position 要移动到的位置（注意位置从0开始），等于数据长度代表移动到结尾（例如从读完全部数据时
+            保存的检查点继续），之后获取不到数据，keep_wait_data为True时等待新数据
+
+        """
+        # 文件可能在增长，每次都获取最新大小
+        if position < 0 or position > os.fstat(stream_obj.obj.fileno()).st_size:
+            # 已经超过结尾（等于数据长度代表移动到结尾）
+            raise EOFError(u'移动位置不在对象合法范围内')
+        # 设置位置
+        stream_obj.obj.seek(position)
+        stream_obj.pos = position
+
+    @staticmethod
+    def _move_next(stream_obj, step=1):
+        """
+        @fun 流从当前位置向后移动指定步数
+        @funName _move_next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向后移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        FileStream._seek(stream_obj, stream_obj.pos + step)
+
+    @staticmethod
+    def _move_forward(stream_obj, step=1):
+        """
+        @fun 流从当前位置向前移动指定步数
+        @funName _move_forward
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向前移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        FileStream._seek(stream_obj, stream_obj.pos - step)
+
+    @staticmethod
+    def _current_position(stream_obj):
+        """
+        @fun 获取当前流的位置信息
+        @funName _current_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 获取当前流的位置信息
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 返回流对象的当前位置（字节偏移）
+
+        """
+        return stream_obj.pos
+
+
+class MmapStream(BaseStream):
+    """
+    @class 内存映射文件流
+    @className MmapStream
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 继承BaseStream，通过mmap只读映射实现文件的流处理:
+        流对象为bytes（逐个获取为长度为1的bytes，按块获取为bytes块），位置为字节偏移（从0开始），
+        文件内容由操作系统按页调入，适合需要频繁移动位置的大文件处理；映射大小在打开时确定，不支持keep_wait_data
+
+    @classExample {Python} 参考示例:
+        _stream = MmapStream(batch_size=65536)
+        _stream.add_dealer(dealer_fun, is_batch=True)
+        _stream.start_stream(stream_tag='default', is_sync=True, file_path='/var/log/my.log')
+
+    """
+
+    #############################
+    # 重载构造函数
+    #############################
+    def __init__(self, stop_by_excepiton=False, logger=None, dealer_exception_fun=None, stream_closed_fun=None,
+                 throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, checkpoint_file=None, checkpoint_interval=0, stats_sample_rate=0):
+        """
+        @fun 重载构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 重载构造函数，去掉无需设置的参数
+
+        @funParam {bool} stop_by_excepiton 当出现异常时是否中止流处理
+        @funParam {object} logger 出现错误时进行error输出的日志类（需实现error方法），None代表不输出日志
+        @funParam {fun} dealer_exception_fun 流处理异常时执行的通知函数,函数定义参考BaseStream
+        @funParam {fun} stream_closed_fun 流处理结束时执行的通知函数,函数定义参考BaseStream
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小（字节数），0代表逐个字节获取
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {string} checkpoint_file 检查点文件路径，None代表不保存检查点，参考BaseStream
+        @funParam {float} checkpoint_interval 保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
+
+        """
+        BaseStream.__init__(self, back_forward=True, keep_wait_data=False, stop_by_excepiton=stop_by_excepiton,
+                            logger=logger, dealer_exception_fun=dealer_exception_fun,
+                            stream_closed_fun=stream_closed_fun, throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, checkpoint_file=checkpoint_file,
+                            checkpoint_interval=checkpoint_interval, stats_sample_rate=stats_sample_rate)
+
+    #############################
+    # 需继承类实现的内部处理函数
+    #############################
+    @staticmethod
+    def _init_stream(**kwargs):
+        """
+        @fun 根据传入参数初始化流对象
+        @funName _init_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 以只读方式映射文件，空文件不做映射
+
+        @funParam {string} file_path 需进行流处理的文件路径
+
+        @funReturn {object} 返回具有四个属性的object对象:
+            file : file 打开的文件对象
+            obj : mmap 文件的内存映射对象，空文件为空bytes
+            size : int 文件大小
+            pos : int 流当前位置
+
+        """
+        _stream_obj = NullObj()
+        _stream_obj.file = open(kwargs['file_path'], 'rb')
+        _stream_obj.size = os.fstat(_stream_obj.file.fileno()).st_size
+        if _stream_obj.size > 0:
+            _stream_obj.obj = mmap.mmap(_stream_obj.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # 空文件无法映射
+            _stream_obj.obj = b''
+        _stream_obj.pos = 0
+        return _stream_obj
+
+    @staticmethod
+    def _next(stream_obj):
+        """
+        @fun 从流中获取下一个对象，并将流指针指向下一个位置
+        @funName _next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 从流中获取下一个对象，并将流指针指向下一个位置
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {bytes} 获取到的下一个位置的字节
+
+        """
+        if stream_obj.pos >= stream_obj.size:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + 1
+        return stream_obj.obj[stream_obj.pos - 1: stream_obj.pos]
+
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 直接返回映射内容的切片
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大字节数
+
+        @funReturn {bytes} 获取到的数据块
+
+        """
+        _start = stream_obj.pos
+        if _start >= stream_obj.size:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = min(_start + size, stream_obj.size)
+        return stream_obj.obj[_start: stream_obj.pos]
+
+    @staticmethod
+    def _close_stream(stream_obj):
+        """
+        @fun 关闭流对象
+        @funName _close_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 关闭内存映射及文件
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        """
+        if stream_obj.size > 0:
+            stream_obj.obj.close()
+        stream_obj.file.close()
+
+    @staticmethod
+    def _seek(stream_obj, position):
+        """
+        @fun 移动到流的指定位置
+        @funName _seek
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 移动到流的指定位置
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} position 要移动到的位置（注意位置从0开始），等于数据长度代表移动到结尾（例如从读完全部数据时
+            保存的检查点继续），之后获取不到数据，keep_wait_data为True时等待新数据
+
+        """
+        if position < 0 or position > stream_obj.size:
+            # 已经超过结尾（等于数据长度代表移动到结尾）
+            raise EOFError(u'移动位置不在对象合法范围内')
+        # 设置位置
+        stream_obj.pos = position
+
+    @staticmethod
+    def _move_next(stream_obj, step=1):
+        """
+        @fun 流从当前位置向后移动指定步数
+        @funName _move_next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向后移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        MmapStream._seek(stream_obj, stream_obj.pos + step)
+
+    @staticmethod
+    def _move_forward(stream_obj, step=1):
+        """
+        @fun 流从当前位置向前移动指定步数
+        @funName _move_forward
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向前移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        MmapStream._seek(stream_obj, stream_obj.pos - step)
+
+    @staticmethod
+    def _current_position(stream_obj):
+        """
+        @fun 获取当前流的位置信息
+        @funName _current_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 获取当前流的位置信息
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 返回流对象的当前位置（字节偏移）
+
+        """
+        return stream_obj.pos
+
+
+class BytesStream(BaseStream):
+    """
+    @class 字节流
+    @className BytesStream
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 继承BaseStream，实现bytes、bytearray、memoryview（或其他支持缓冲区协议的对象）的流处理:
+        通过memoryview访问数据，逐个获取时流对象为int（字节值），按块获取时流对象为原数据的memoryview窗口，
+        均不复制数据，适合解析网络报文等二进制数据；memoryview窗口引用原数据，处理函数需要保留时应自行bytes(窗口)
+
+    @classExample {Python} 参考示例:
+        _stream = BytesStream(batch_size=4)
+        _stream.add_dealer(dealer_fun, is_batch=True)
+        _stream.start_stream(stream_tag='default', is_sync=True, bytes_obj=_payload)
+
+    """
+
+    #############################
+    # 重载构造函数
+    #############################
+    def __init__(self, stop_by_excepiton=False, logger=None, dealer_exception_fun=None, stream_closed_fun=None,
+                 throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, checkpoint_file=None, checkpoint_interval=0, stats_sample_rate=0):
+        """
+        @fun 重载构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 重载构造函数，去掉无需设置的参数
+
+        @funParam {bool} stop_by_excepiton 当出现异常时是否中止流处理
+        @funParam {object} logger 出现错误时进行error输出的日志类（需实现error方法），None代表不输出日志
+        @funParam {fun} dealer_exception_fun 流处理异常时执行的通知函数,函数定义参考BaseStream
+        @funParam {fun} stream_closed_fun 流处理结束时执行的通知函数,函数定义参考BaseStream
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小（字节数），0代表逐个字节获取；按块获取时获取的是memoryview
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {string} checkpoint_file 检查点文件路径，None代表不保存检查点，参考BaseStream
+        @funParam {float} checkpoint_interval 保存检查点的间隔时间，单位为秒，0代表只在流结束时保存
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
+
+        """
+        BaseStream.__init__(self, back_forward=True, keep_wait_data=False, stop_by_excepiton=stop_by_excepiton,
+                            logger=logger, dealer_exception_fun=dealer_exception_fun,
+                            stream_closed_fun=stream_closed_fun, throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, checkpoint_file=checkpoint_file,
+                            checkpoint_interval=checkpoint_interval, stats_sample_rate=stats_sample_rate)
+
+    #############################
+    # 需继承类实现的内部处理函数
+    #############################
+    @staticmethod
+    def _init_stream(**kwargs):
+        """
+        @fun 根据传入参数初始化流对象
+        @funName _init_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 建立数据的memoryview，非单字节格式或多维的数据按字节展开
+
+        @funParam {object} bytes_obj 需进行流处理的bytes、bytearray、memoryview对象
+
+        @funReturn {object} 返回具有三个属性的object对象:
+            obj : memoryview 数据的字节视图
+            size : int 数据的字节数
+            pos : int 流当前位置
+
+        """
+        _stream_obj = NullObj()
+        _view = memoryview(kwargs['bytes_obj'])
+        if _view.format != 'B' or _view.ndim != 1:
+            _view = _view.cast('B')
+        _stream_obj.obj = _view
+        _stream_obj.size = len(_view)
+        _stream_obj.pos = 0
+        return _stream_obj
+
+    @staticmethod
+    def _next(stream_obj):
+        """
+        @fun 从流中获取下一个对象，并将流指针指向下一个位置
+        @funName _next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 从流中获取下一个对象，并将流指针指向下一个位置
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 获取到的下一个位置的字节值
+
+        """
+        _pos = stream_obj.pos
+        if _pos >= stream_obj.size:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = _pos + 1
+        return stream_obj.obj[_pos]
+
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 返回原数据的memoryview窗口，不复制数据
+        @funExcepiton:
+            StopIteration 如果到了流结尾，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大字节数
+
+        @funReturn {memoryview} 获取到的数据块
+
+        """
+        _start = stream_obj.pos
+        if _start >= stream_obj.size:
+            # 已经到结尾了
+            raise StopIteration
+
+        # 更新位置
+        stream_obj.pos = min(_start + size, stream_obj.size)
+        return stream_obj.obj[_start: stream_obj.pos]
+
+    @staticmethod
+    def _close_stream(stream_obj):
+        """
+        @fun 关闭流对象
+        @funName _close_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 处理函数可能仍持有窗口，不释放memoryview，只解除引用
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        """
+        stream_obj.obj = None
+
+    @staticmethod
+    def _seek(stream_obj, position):
+        """
+        @fun 移动到流的指定位置
+        @funName _seek
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 移动到流的指定位置
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} position 要移动到的位置（注意位置从0开始），等于数据长度代表移动到结尾（例如从读完全部数据时
+            保存的检查点继续），之后获取不到数据，keep_wait_data为True时等待新数据
+
+        """
+        if position < 0 or position > stream_obj.size:
+            # 已经超过结尾（等于数据长度代表移动到结尾）
+            raise EOFError(u'移动位置不在对象合法范围内')
+        # 设置位置
+        stream_obj.pos = position
+
+    @staticmethod
+    def _move_next(stream_obj, step=1):
+        """
+        @fun 流从当前位置向后移动指定步数
+        @funName _move_next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向后移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        BytesStream._seek(stream_obj, stream_obj.pos + step)
+
+    @staticmethod
+    def _move_forward(stream_obj, step=1):
+        """
+        @fun 流从当前位置向前移动指定步数
+        @funName _move_forward
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流从当前位置向前移动指定步数
+        @funExcepiton:
+            EOFError 当移动的位置超过流本身数据位置，抛出EOFError异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        BytesStream._seek(stream_obj, stream_obj.pos - step)
+
+    @staticmethod
+    def _current_position(stream_obj):
+        """
+        @fun 获取当前流的位置信息
+        @funName _current_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 获取当前流的位置信息
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 返回流对象的当前位置（字节偏移）
+
+        """
+        return stream_obj.pos
+
+
+class QueueStream(BaseStream):
+    """
+    @class 队列流
+    @className QueueStream
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 继承BaseStream，实现队列（queue.Queue或同样支持get(timeout=)的队列）的实时流处理:
+        _next直接在队列上阻塞等待数据（超时时间为wait_time），有数据立即处理，空闲时不占用CPU；
+        wait_time只决定stop_stream等停止标记的最大响应时间；向队列放入QueueStream.END_TAG结束流处理
+
+    @classExample {Python} 参考示例:
+        _queue = queue.Queue()
+        _stream = QueueStream()
+        _stream.add_dealer(dealer_fun)
+        _stream.start_stream(stream_tag='default', is_sync=False, queue_obj=_queue)
+        _queue.put('data')
+        ...
+        _queue.put(QueueStream.END_TAG)
+
+    """
+
+    END_TAG = NullObj()  # 结束流处理的标记对象
+
+    #############################
+    # 内部变量
+    #############################
+    _blocking_next = True  # _next阻塞等待数据源
+
+    #############################
+    # 重载构造函数
+    #############################
+    def __init__(self, keep_wait_data=True, stop_by_excepiton=False, logger=None, dealer_exception_fun=None,
+                 stream_closed_fun=None, throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, stats_sample_rate=0):
+        """
+        @fun 重载构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 重载构造函数，去掉无需设置的参数
+
+        @funParam {bool} keep_wait_data 等待数据超时后是否继续等待（需调用stop_stream关闭），否则超时即结束流处理
+        @funParam {bool} stop_by_excepiton 当出现异常时是否中止流处理
+        @funParam {object} logger 出现错误时进行error输出的日志类（需实现error方法），None代表不输出日志
+        @funParam {fun} dealer_exception_fun 流处理异常时执行的通知函数,函数定义参考BaseStream
+        @funParam {fun} stream_closed_fun 流处理结束时执行的通知函数,函数定义参考BaseStream
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小，0代表逐个获取；按块获取时只返回已到达的数据，不等待凑满一块
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
+
+        """
+        BaseStream.__init__(self, back_forward=False, keep_wait_data=keep_wait_data,
+                            stop_by_excepiton=stop_by_excepiton, logger=logger,
+                            dealer_exception_fun=dealer_exception_fun, stream_closed_fun=stream_closed_fun,
+                            throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, stats_sample_rate=stats_sample_rate)
+
+    #############################
+    # 需继承类实现的内部处理函数
+    #############################
+    @staticmethod
+    def _init_stream(**kwargs):
+        """
+        @fun 根据传入参数初始化流对象
+        @funName _init_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 根据传入参数初始化流对象
+
+        @funParam {object} queue_obj 数据来源队列
+        @funParam {float} wait_time 每次等待数据的超时时间，单位为秒，默认为0.1
+
+        @funReturn {object} 返回具有三个属性的object对象:
+            obj : object 数据来源队列
+            wait_time : float 每次等待数据的超时时间
+            pos : int 流当前位置
+
+        """
+        _stream_obj = NullObj()
+        _stream_obj.obj = kwargs['queue_obj']
+        _stream_obj.wait_time = kwargs.get('wait_time', 0.1)
+        _stream_obj.pos = 0
+        return _stream_obj
+
+    @staticmethod
+    def _next(stream_obj):
+        """
+        @fun 从流中获取下一个对象，并将流指针指向下一个位置
+        @funName _next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 阻塞等待队列数据
+        @funExcepiton:
+            StopIteration 等待数据超时，抛出该异常
+            EOFError 获取到结束标记，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {object} 获取到的队列对象
+
+        """
+        try:
+            _data = stream_obj.obj.get(timeout=stream_obj.wait_time)
+        except queue.Empty:
+            raise StopIteration
+        if _data is QueueStream.END_TAG:
+            raise EOFError(u'数据源已关闭')
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + 1
+        return _data
+
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 阻塞等待第一个对象，其余只获取队列中已有的对象；
+            块中间遇到结束标记时，将结束标记放回队列，先返回已获取的块
+        @funExcepiton:
+            StopIteration 等待数据超时，抛出该异常
+            EOFError 第一个对象为结束标记，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大对象数
+
+        @funReturn {list} 获取到的对象块
+
+        """
+        _block = [QueueStream._next(stream_obj)]
+        while len(_block) < size:
+            try:
+                _data = stream_obj.obj.get_nowait()
+            except queue.Empty:
+                break
+            if _data is QueueStream.END_TAG:
+                stream_obj.obj.put(_data)
+                break
+            _block.append(_data)
+
+        # 更新位置（第一个对象已在_next中更新）
+        stream_obj.pos = stream_obj.pos + len(_block) - 1
+        return _block
+
+    @staticmethod
+    def _close_stream(stream_obj):
+        """
+        @fun 关闭流对象
+        @funName _close_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 队列由调用方管理，无需处理
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        """
+        pass
+
+    @staticmethod
+    def _seek(stream_obj, position):
+        """
+        @fun 移动到流的指定位置
+        @funName _seek
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} position 要移动到的位置
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _move_next(stream_obj, step=1):
+        """
+        @fun 流从当前位置向后移动指定步数
+        @funName _move_next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _move_forward(stream_obj, step=1):
+        """
+        @fun 流从当前位置向前移动指定步数
+        @funName _move_forward
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _current_position(stream_obj):
+        """
+        @fun 获取当前流的位置信息
+        @funName _current_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 获取当前流的位置信息
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 返回流对象的当前位置（已获取的对象数）
+
+        """
+        return stream_obj.pos
+
+
+class SocketStream(BaseStream):
+    """
+    @class Socket流
+    @className SocketStream
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 继承BaseStream，实现已连接socket的实时字节流处理:
+        流对象为bytes（逐个获取为长度为1的bytes，按块获取为bytes块），位置为已接收的字节数；
+        _next直接在socket上阻塞接收数据（超时时间为wait_time），空闲时不占用CPU；
+        对端关闭连接时结束流处理，流结束时关闭socket
+
+    @classExample {Python} 参考示例:
+        _stream = SocketStream(batch_size=65536)
+        _stream.add_dealer(dealer_fun, is_batch=True)
+        _stream.start_stream(stream_tag='default', is_sync=False, socket_obj=_conn)
+
+    """
+
+    #############################
+    # 内部变量
+    #############################
+    _blocking_next = True  # _next阻塞等待数据源
+
+    #############################
+    # 重载构造函数
+    #############################
+    def __init__(self, keep_wait_data=True, stop_by_excepiton=False, logger=None, dealer_exception_fun=None,
+                 stream_closed_fun=None, throttle_time=0, batch_size=0,
+                 fan_out_queue_size=0, stats_sample_rate=0):
+        """
+        @fun 重载构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 重载构造函数，去掉无需设置的参数
+
+        @funParam {bool} keep_wait_data 等待数据超时后是否继续等待（需调用stop_stream关闭），否则超时即结束流处理
+        @funParam {bool} stop_by_excepiton 当出现异常时是否中止流处理
+        @funParam {object} logger 出现错误时进行error输出的日志类（需实现error方法），None代表不输出日志
+        @funParam {fun} dealer_exception_fun 流处理异常时执行的通知函数,函数定义参考BaseStream
+        @funParam {fun} stream_closed_fun 流处理结束时执行的通知函数,函数定义参考BaseStream
+        @funParam {float} throttle_time 每处理一个流对象后的休眠时间（限流），单位为秒，0代表不休眠
+        @funParam {int} batch_size 按块获取的块大小，0代表逐个获取；按块获取时只返回已到达的数据，不等待凑满一块
+        @funParam {int} fan_out_queue_size 处理函数并行分发的队列大小，0代表顺序调用处理函数，参考BaseStream
+        @funParam {int} stats_sample_rate 处理统计的采样间隔，0代表不统计，参考BaseStream
+
+        """
+        BaseStream.__init__(self, back_forward=False, keep_wait_data=keep_wait_data,
+                            stop_by_excepiton=stop_by_excepiton, logger=logger,
+                            dealer_exception_fun=dealer_exception_fun, stream_closed_fun=stream_closed_fun,
+                            throttle_time=throttle_time, batch_size=batch_size,
+                            fan_out_queue_size=fan_out_queue_size, stats_sample_rate=stats_sample_rate)
+
+    #############################
+    # 需继承类实现的内部处理函数
+    #############################
+    @staticmethod
+    def _init_stream(**kwargs):
+        """
+        @fun 根据传入参数初始化流对象
+        @funName _init_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 设置socket的超时时间
+
+        @funParam {socket} socket_obj 已连接的socket对象
+        @funParam {float} wait_time 每次等待数据的超时时间，单位为秒，默认为0.1
+        @funParam {int} recv_size 逐个获取时每次接收的最大字节数，默认为65536
+
+        @funReturn {object} 返回具有四个属性的object对象:
+            obj : socket 数据来源socket
+            recv_size : int 逐个获取时每次接收的最大字节数
+            buffer : bytes 已接收的数据缓存
+            buffer_pos : int 缓存中未处理数据的开始位置
+            pos : int 流当前位置
+
+        """
+        _stream_obj = NullObj()
+        _stream_obj.obj = kwargs['socket_obj']
+        _stream_obj.obj.settimeout(kwargs.get('wait_time', 0.1))
+        _stream_obj.recv_size = kwargs.get('recv_size', 65536)
+        _stream_obj.buffer = b''
+        _stream_obj.buffer_pos = 0
+        _stream_obj.pos = 0
+        return _stream_obj
+
+    @staticmethod
+    def _recv(stream_obj, size):
+        """
+        @fun 从socket接收数据
+        @funName _recv
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 阻塞接收数据
+        @funExcepiton:
+            StopIteration 等待数据超时，抛出该异常
+            EOFError 对端关闭连接，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 接收的最大字节数
+
+        @funReturn {bytes} 接收到的数据
+
+        """
+        try:
+            _data = stream_obj.obj.recv(size)
+        except socket.timeout:
+            raise StopIteration
+        if len(_data) == 0:
+            raise EOFError(u'数据源已关闭')
+        return _data
+
+    @staticmethod
+    def _next(stream_obj):
+        """
+        @fun 从流中获取下一个对象，并将流指针指向下一个位置
+        @funName _next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 缓存为空时阻塞接收数据，从缓存中获取一个字节
+        @funExcepiton:
+            StopIteration 等待数据超时，抛出该异常
+            EOFError 对端关闭连接，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {bytes} 获取到的下一个位置的字节
+
+        """
+        if stream_obj.buffer_pos >= len(stream_obj.buffer):
+            stream_obj.buffer = SocketStream._recv(stream_obj, stream_obj.recv_size)
+            stream_obj.buffer_pos = 0
+        _data = stream_obj.buffer[stream_obj.buffer_pos: stream_obj.buffer_pos + 1]
+        stream_obj.buffer_pos = stream_obj.buffer_pos + 1
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + 1
+        return _data
+
+    @staticmethod
+    def _next_batch(stream_obj, size):
+        """
+        @fun 从流中获取下一块对象，并将流指针指向块后的位置
+        @funName _next_batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 优先返回缓存数据，缓存为空时直接接收最多size个字节
+        @funExcepiton:
+            StopIteration 等待数据超时，抛出该异常
+            EOFError 对端关闭连接，抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} size 块的最大字节数
+
+        @funReturn {bytes} 获取到的数据块
+
+        """
+        if stream_obj.buffer_pos < len(stream_obj.buffer):
+            _data = stream_obj.buffer[stream_obj.buffer_pos: stream_obj.buffer_pos + size]
+            stream_obj.buffer_pos = stream_obj.buffer_pos + len(_data)
+        else:
+            _data = SocketStream._recv(stream_obj, size)
+
+        # 更新位置
+        stream_obj.pos = stream_obj.pos + len(_data)
+        return _data
+
+    @staticmethod
+    def _close_stream(stream_obj):
+        """
+        @fun 关闭流对象
+        @funName _close_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 关闭socket
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        """
+        stream_obj.obj.close()
+
+    @staticmethod
+    def _seek(stream_obj, position):
+        """
+        @fun 移动到流的指定位置
+        @funName _seek
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} position 要移动到的位置
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _move_next(stream_obj, step=1):
+        """
+        @fun 流从当前位置向后移动指定步数
+        @funName _move_next
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _move_forward(stream_obj, step=1):
+        """
+        @fun 流从当前位置向前移动指定步数
+        @funName _move_forward
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 实时数据源不支持移动位置
+        @funExcepiton:
+            AttributeError 调用即抛出该异常
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+        @funParam {int} step 要移动的步数
+
+        """
+        raise AttributeError(u'该流不支持位置自由移动模式')
+
+    @staticmethod
+    def _current_position(stream_obj):
+        """
+        @fun 获取当前流的位置信息
+        @funName _current_position
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 获取当前流的位置信息
+
+        @funParam {object} stream_obj _init_stream生成的流对象
+
+        @funReturn {int} 返回流对象的当前位置（已获取的字节数）
+
+        """
+        return stream_obj.pos
+
+
+class StreamPipeline(object):
+    """
+    @class 流处理管道
+    @className StreamPipeline
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 在流（BaseStream的实现类）上组合map、filter、window、batch、take、tee、parallel_map处理步骤:
+        处理步骤针对流对象本身（不含位置）；run时将所有步骤编译为每个流对象依次调用的函数清单，
+        在iter_stream的单一循环中执行，步骤之间不产生中间列表或生成器；
+        每个步骤对一个输入最多输出一个对象（不输出则后续步骤不执行），流结束时batch、parallel_map输出缓存中的对象
+
+    @classExample {Python} 参考示例:
+        _pipeline = StreamPipeline(FileStream(batch_size=65536)).map(decode_fun).filter(is_error).batch(100)
+        for _errors in _pipeline.run(stream_tag='log', file_path='/var/log/my.log'):
+            ...
+
+    """
+
+    #############################
+    # 内部变量
+    #############################
+    _SKIP = NullObj()  # 步骤不输出对象的标记
+
+    #############################
+    # 构造函数
+    #############################
+    def __init__(self, stream):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 构造函数
+
+        @funParam {BaseStream} stream 数据来源的流对象
+
+        """
+        self._stream = stream
+        self._steps = list()  # 处理步骤清单，每项为(步骤名, 参数元组)
+
+    #############################
+    # 处理步骤定义
+    #############################
+    def map(self, fun):
+        """
+        @fun 转换对象
+        @funName map
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 对每个对象执行fun，输出fun的返回值
+
+        @funParam {fun} fun 转换函数，入参为对象
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        self._steps.append(('map', (fun,)))
+        return self
+
+    def filter(self, fun):
+        """
+        @fun 过滤对象
+        @funName filter
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 只输出fun返回True的对象
+
+        @funParam {fun} fun 过滤函数，入参为对象
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        self._steps.append(('filter', (fun,)))
+        return self
+
+    def window(self, n, step=1):
+        """
+        @fun 滑动窗口
+        @funName window
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 输出最近n个对象组成的元组，每step个对象输出一次，不足n个对象时不输出
+
+        @funParam {int} n 窗口大小
+        @funParam {int} step 窗口每次滑动的对象数
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        if n <= 0 or step <= 0:
+            raise ValueError(u'窗口大小及步长必须大于0')
+        self._steps.append(('window', (n, step)))
+        return self
+
+    def batch(self, n):
+        """
+        @fun 分批
+        @funName batch
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 每n个对象组成一个列表输出，流结束时输出不足n个对象的最后一批
+
+        @funParam {int} n 每批对象数
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        if n <= 0:
+            raise ValueError(u'每批对象数必须大于0')
+        self._steps.append(('batch', (n,)))
+        return self
+
+    def take(self, n):
+        """
+        @fun 获取指定数量的对象
+        @funName take
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 输出前n个对象后结束流处理（关闭流，不再读取数据）
+
+        @funParam {int} n 对象数
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        self._steps.append(('take', (n,)))
+        return self
+
+    def tee(self, fun):
+        """
+        @fun 分支处理
+        @funName tee
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 将对象传给fun（例如另一个队列的put、列表的append），原对象继续传给后续步骤
+
+        @funParam {fun} fun 分支处理函数，入参为对象，返回值忽略
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        self._steps.append(('tee', (fun,)))
+        return self
+
+    def parallel_map(self, fun, pool_size=4, is_process=False, max_pending=0):
+        """
+        @fun 并行转换对象
+        @funName parallel_map
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 通过线程池（或进程池）并行执行fun，按输入顺序输出返回值:
+            最多有max_pending个对象在池中执行，超过时等待最早的对象执行完成后输出；
+            适合fun为IO等待或释放GIL的处理（线程池），或CPU计算密集的处理（进程池，fun及对象需支持pickle）
+
+        @funParam {fun} fun 转换函数，入参为对象
+        @funParam {int} pool_size 池大小
+        @funParam {bool} is_process 是否使用进程池，默认使用线程池
+        @funParam {int} max_pending 最多同时执行的对象数，0代表pool_size的2倍
+
+        @funReturn {StreamPipeline} 管道自身，用于链式调用
+
+        """
+        self._steps.append(('parallel_map', (fun, pool_size, is_process, max_pending)))
+        return self
+
+    #############################
+    # 执行管道
+    #############################
+    def _compile(self, state):
+        """
+        @fun 将处理步骤编译为函数清单
+        @funName _compile
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 每次执行生成新的步骤状态（窗口、批次、计数、执行池），步骤函数不输出对象时返回_SKIP
+
+        @funParam {object} state 执行状态，stop_index属性为take结束流处理的步骤序号（未结束为-1）
+
+        @funReturn {list} 函数清单，每项为(deal_fun, flush_fun, close_fun)，flush_fun返回流结束时需输出的对象清单
+
+        """
+        _skip = self._SKIP
+        _stages = list()
+        for _index, (_name, _args) in enumerate(self._steps):
+            _flush_fun = None
+            _close_fun = None
+            if _name == 'map':
+                _deal_fun = _args[0]
+            elif _name == 'filter':
+                def _deal_fun(obj, fun=_args[0]):
+                    return obj if fun(obj) else _skip
+            elif _name == 'window':
+                def _deal_fun(obj, n=_args[0], step=_args[1], window=collections.deque(maxlen=_args[0]),
+                              count=[0]):
+                    window.append(obj)
+                    count[0] += 1
+                    if count[0] >= n and (count[0] - n) % step == 0:
+                        return tuple(window)
+                    return _skip
+            elif _name == 'batch':
+                _batch = [list()]
+
+                def _deal_fun(obj, n=_args[0], batch=_batch):
+                    batch[0].append(obj)
+                    if len(batch[0]) < n:
+                        return _skip
+                    _out = batch[0]
+                    batch[0] = list()
+                    return _out
+
+                def _flush_fun(batch=_batch):
+                    return [batch[0]] if len(batch[0]) > 0 else []
+            elif _name == 'take':
+                if _args[0] <= 0:
+                    state.stop_index = max(state.stop_index, _index)
+
+                def _deal_fun(obj, n=_args[0], count=[0], index=_index):
+                    count[0] += 1
+                    if count[0] >= n:
+                        # 已获取足够的对象，结束流处理
+                        state.stop_index = max(state.stop_index, index)
+                    return obj
+            elif _name == 'tee':
+                def _deal_fun(obj, fun=_args[0]):
+                    fun(obj)
+                    return obj
+            elif _name == 'parallel_map':
+                _fun, _pool_size, _is_process, _max_pending = _args
+                _pool = (ProcessPoolExecutor if _is_process else ThreadPoolExecutor)(max_workers=_pool_size)
+                _pending = collections.deque()
+
+                def _deal_fun(obj, fun=_fun, pool=_pool, pending=_pending,
+                              max_pending=(_max_pending if _max_pending > 0 else _pool_size * 2)):
+                    pending.append(pool.submit(fun, obj))
+                    if len(pending) < max_pending:
+                        return _skip
+                    return pending.popleft().result()
+
+                def _flush_fun(pending=_pending):
+                    return [pending.popleft().result() for _i in range(len(pending))]
+
+                def _close_fun(pool=_pool, pending=_pending):
+                    for _future in pending:
+                        _future.cancel()
+                    pool.shutdown(wait=True)
+            else:
+                raise ValueError(u'不支持的处理步骤: %s' % _name)
+            _stages.append((_deal_fun, _flush_fun, _close_fun))
+        return _stages
+
+    def run(self, stream_tag='default', **kwargs):
+        """
+        @fun 执行管道
+        @funName run
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 通过流的iter_stream获取对象并依次执行处理步骤，返回最后一个步骤输出对象的生成器；
+            执行中可通过流对象的stop_stream(stream_tag)结束（不等待流关闭，生成器在下一次获取时结束），
+            生成器关闭时关闭流及执行池
+        @funExcepiton:
+            KeyError stream_tag已经存在时，抛出该异常
+
+        @funParam {string} stream_tag 流处理标签
+        @funParam {dict} kwargs 传给iter_stream的参数（打开流的参数及seek_position等）
+
+        @funReturn {generator} 输出对象的生成器
+
+        """
+        _skip = self._SKIP
+        _state = NullObj()
+        _state.stop_index = -1
+        _stages = self._compile(_state)
+        _deal_funs = [_stage[0] for _stage in _stages]
+        _source = self._stream.iter_stream(stream_tag=stream_tag, **kwargs)
+        try:
+            if _state.stop_index < 0:
+                for _obj, _pos in _source:
+                    for _deal_fun in _deal_funs:
+                        _obj = _deal_fun(_obj)
+                        if _obj is _skip:
+                            break
+                    else:
+                        yield _obj
+                    if _state.stop_index >= 0:
+                        break
+
+            # 流结束，从take结束位置之后的步骤开始输出缓存的对象
+            _source.close()
+            _index = _state.stop_index + 1
+            while _index < len(_stages):
+                if _stages[_index][1] is not None:
+                    for _obj in _stages[_index][1]():
+                        for _deal_fun in _deal_funs[_index + 1:]:
+                            _obj = _deal_fun(_obj)
+                            if _obj is _skip:
+                                break
+                        else:
+                            yield _obj
+                        if _state.stop_index >= _index:
+                            break
+                _index = max(_index, _state.stop_index) + 1
+        finally:
+            _source.close()
+            for _stage in _stages:
+                if _stage[2] is not None:
+                    _stage[2]()
+
+
+class StreamScheduler(object):
+    """
+    @class 流处理调度器
+    @className StreamScheduler
+    @classGroup 所属分组
+    @classVersion 1.0.0
+    @classDescription 将大量异步处理的流（start_stream指定scheduler）分配到固定数量的线程中轮流处理:
+        每个线程从就绪队列头部取出一个流，最多获取batch_count次流对象后放回队列尾部（轮询）；
+        暂停的流挂起不占用线程，恢复或停止时重新放入就绪队列；keep_wait_data的流没有数据时，
+        延迟wait_data_time秒再放入就绪队列；_next自行阻塞等待数据的流（例如QueueStream）会占用线程直到等待超时；
+        流的暂停、恢复、停止、移动位置等处理方式与线程方式一致
+
+    @classExample {Python} 参考示例:
+        _scheduler = StreamScheduler(pool_size=4)
+        for _i in range(500):
+            _stream.start_stream(stream_tag='tag%d' % _i, is_sync=False, scheduler=_scheduler, file_path=...)
+        ...
+        _scheduler.shutdown()
+
+    """
+
+    #############################
+    # 构造函数
+    #############################
+    def __init__(self, pool_size=4, batch_count=100, wait_data_time=0.01):
+        """
+        @fun 构造函数
+        @funName __init__
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 启动调度线程
+
+        @funParam {int} pool_size 调度线程数
+        @funParam {int} batch_count 每个流每次最多获取流对象的次数
+        @funParam {float} wait_data_time keep_wait_data的流没有数据时，再次执行的延迟时间，单位为秒
+
+        """
+        self._batch_count = batch_count
+        self._wait_data_time = wait_data_time
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)  # 就绪队列、延迟队列、挂起清单变化的通知条件
+        self._ready_queue = collections.deque()  # 就绪的流处理上下文
+        self._wait_heap = list()  # 延迟执行的流处理上下文，每项为(执行时间, 序号, 上下文)
+        self._wait_seq = 0  # 延迟执行的序号，避免比较上下文
+        self._paused = dict()  # 暂停挂起的流处理上下文，key为stream_tag
+        self._stream_count = 0  # 调度中的流数量
+        self._is_shutdown = False
+        self._threads = list()
+        for _i in range(pool_size):
+            _thread = threading.Thread(target=self._scheduler_fun, name='Thread-Stream-Scheduler')
+            _thread.setDaemon(True)
+            _thread.start()
+            self._threads.append(_thread)
+
+    #############################
+    # 属性
+    #############################
+    @property
+    def stream_count(self):
+        """
+        @property {get} 调度中的流数量
+        @propertyName stream_count
+        @propertyDescription 调度中的流数量
+
+        """
+        return self._stream_count
+
+    #############################
+    # 公共函数
+    #############################
+    def add_stream(self, stream, stream_tag):
+        """
+        @fun 增加需调度的流
+        @funName add_stream
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流需已打开（一般通过start_stream指定scheduler调用）
+        @funExcepiton:
+            KeyError 当传入错误的stream_tag，抛出该异常
+            RuntimeError 调度器已关闭，抛出该异常（流会被关闭）
+
+        @funParam {BaseStream} stream 流处理对象
+        @funParam {string} stream_tag 流处理标签
+
+        """
+        _context = stream._stream_deal_begin(stream_tag)
+        _context.stream = stream
+        stream._stream_list_lock.acquire()
+        try:
+            stream._stream_scheduler[stream_tag] = self
+        finally:
+            stream._stream_list_lock.release()
+
+        self._cond.acquire()
+        try:
+            if not self._is_shutdown:
+                self._stream_count += 1
+                self._ready_queue.append(_context)
+                self._cond.notify()
+                return
+        finally:
+            self._cond.release()
+
+        # 调度器已关闭
+        _context.closed_status = EnumStreamClosedStatus.ForceStop
+        stream._stream_deal_end(_context)
+        raise RuntimeError(u'调度器已关闭')
+
+    def shutdown(self, is_wait=True):
+        """
+        @fun 关闭调度器
+        @funName shutdown
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 不再接受新的流，调度线程在所有流结束后退出（keep_wait_data的流需先调用stop_stream）
+
+        @funParam {bool} is_wait 是否等待所有调度线程退出后再返回
+
+        """
+        self._cond.acquire()
+        try:
+            self._is_shutdown = True
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        if is_wait:
+            for _thread in self._threads:
+                _thread.join()
+
+    #############################
+    # 内部函数
+    #############################
+    def _wake(self, stream_tag):
+        """
+        @fun 唤醒暂停挂起的流
+        @funName _wake
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 流处理标记变化（恢复、停止）时由BaseStream调用，将挂起的流放入就绪队列
+
+        @funParam {string} stream_tag 流处理标签
+
+        """
+        self._cond.acquire()
+        try:
+            _context = self._paused.pop(stream_tag, None)
+            if _context is not None:
+                self._ready_queue.append(_context)
+                self._cond.notify()
+        finally:
+            self._cond.release()
+
+    def _put_context(self, context, delay=0):
+        """
+        @fun 将流处理上下文放回队列
+        @funName _put_context
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 放入就绪队列尾部，或按延迟时间放入延迟队列
+
+        @funParam {object} context 流处理上下文
+        @funParam {float} delay 延迟时间，单位为秒
+
+        """
+        self._cond.acquire()
+        try:
+            if delay > 0:
+                self._wait_seq += 1
+                heapq.heappush(self._wait_heap, (time.monotonic() + delay, self._wait_seq, context))
+            else:
+                self._ready_queue.append(context)
+            self._cond.notify()
+        finally:
+            self._cond.release()
+
+    def _pause_context(self, context):
+        """
+        @fun 挂起暂停的流
+        @funName _pause_context
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 在流处理标记锁中再次判断暂停状态，避免挂起前已恢复导致无法唤醒
+
+        @funParam {object} context 流处理上下文
+
+        """
+        _stream = context.stream
+        _stream._stream_list_lock.acquire()
+        try:
+            _tag = _stream._stream_list_tag[context.stream_tag]
+            if _tag[1] and not _tag[0] and not _stream._force_stop_tag:
+                self._cond.acquire()
+                try:
+                    self._paused[context.stream_tag] = context
+                finally:
+                    self._cond.release()
+                return
+        finally:
+            _stream._stream_list_lock.release()
+
+        # 已恢复或停止
+        self._put_context(context)
+
+    def _get_context(self):
+        """
+        @fun 获取下一个需执行的流处理上下文
+        @funName _get_context
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 将到期的延迟队列对象移入就绪队列，从就绪队列头部获取，没有时等待
+
+        @funReturn {object} 流处理上下文，调度器已关闭且没有调度中的流时返回None
+
+        """
+        self._cond.acquire()
+        try:
+            while True:
+                if self._is_shutdown and self._stream_count == 0:
+                    return None
+                _now = time.monotonic()
+                while len(self._wait_heap) > 0 and self._wait_heap[0][0] <= _now:
+                    self._ready_queue.append(heapq.heappop(self._wait_heap)[2])
+                if len(self._ready_queue) > 0:
+                    return self._ready_queue.popleft()
+                self._cond.wait(self._wait_heap[0][0] - _now if len(self._wait_heap) > 0 else None)
+        finally:
+            self._cond.release()
+
+    def _scheduler_fun(self):
+        """
+        @fun 调度线程函数
+        @funName _scheduler_fun
+        @funGroup 所属分组
+        @funVersion 版本
+        @funDescription 循环获取就绪的流执行一批处理，根据返回原因放回队列、挂起或结束流
+
+        """
+        while True:
+            _context = self._get_context()
+            if _context is None:
+                return
+
+            _stream = _context.stream
+            try:
+                _status = _stream._stream_deal_run(_context, self._batch_count)
+            except:
+                if _stream._logger is not None:
+                    _log_str = 'stream scheduler deal exception:\n%s' % traceback.format_exc()
+                    _stream._logger.error(_log_str)
+                _context.closed_status = EnumStreamClosedStatus.ExceptionExit
+                _status = EnumStreamDealStatus.End
+
+            if _status == EnumStreamDealStatus.Yield:
+                self._put_context(_context)
+            elif _status == EnumStreamDealStatus.Wait:
+                self._put_context(_context, delay=(0 if _stream._blocking_next else self._wait_data_time))
+            elif _status == EnumStreamDealStatus.Pause:
+                self._pause_context(_context)
+            else:
+                try:
+                    _stream._stream_deal_end(_context)
+                except:
+                    if _stream._logger is not None:
+                        _log_str = 'stream scheduler end exception:\n%s' % traceback.format_exc()
+                        _stream._logger.error(_log_str)
+                self._cond.acquire()
+                try:
+                    self._stream_count -= 1
+                    self._cond.notify_all()
+                finally:
+                    self._cond.release()
+
+
 if __name__ == "__main__":
     """
     # 当程序自己独立运行时执行的操作